@@ -0,0 +1,105 @@
+"""
+Created by: Gabriele Pompa (gabriele.pompa@gmail.com)
+
+File: example_homogenize_benchmark.py
+
+Created on Tue Jul 14 2020 - Version: 1.0
+
+Description:
+
+This script benchmarks homogenize() utility function on np.ndarray and
+pd.DatetimeIndex inputs of up to 10^6 elements: arrays of native data-type
+are sorted with np.sort (after an O(n) monotonicity check), without iterating
+over their elements in Python. Timings are compared with the element-wise
+type check and Python sorted() of iterables of generic objects, and are
+reported per n*log2(n) to show the O(n log n) scaling. The overhead of
+.process_pricing_parameters() on large inputs is reported too.
+
+Notice that pd.DatetimeIndex are sorted natively, but their timings are
+dominated by the final (C-level) boxing into an np.ndarray of pd.Timestamp.
+"""
+
+import numpy as np
+import pandas as pd
+import time
+
+from market.market import MarketEnvironment
+from options.options import PlainVanillaOption
+from utils.utils import homogenize, date_string_to_datetime_obj, test_same_type
+
+def python_homogenize(x, sort_func=None, reverse_order=False):
+    """Element-wise type check and Python sorted(), as for Lists of generic objects."""
+    test_same_type(list(x))
+    return np.array(sorted([xi for xi in x], key=sort_func, reverse=reverse_order))
+
+def best_time(f, repeat=3):
+    """Best elapsed time (in seconds) of f() over repeat runs."""
+    elapsed = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        f()
+        elapsed.append(time.perf_counter() - start)
+    return min(elapsed)
+
+def main():
+
+    rng = np.random.default_rng(42)
+
+    #
+    # native Vs Python homogenization on 10^6 elements
+    #
+
+    n = 10**6
+
+    inputs = {"shuffled float64": rng.uniform(50.0, 150.0, n),
+              "sorted float64": np.linspace(50.0, 150.0, n),
+              "shuffled DatetimeIndex": pd.DatetimeIndex(rng.permutation(pd.date_range("2020-01-01", periods=n, freq="min"))),
+              "sorted DatetimeIndex": pd.date_range("2020-01-01", periods=n, freq="min")}
+
+    print("{:>24} {:>12} {:>12} {:>9}".format("input (10^6 elements)", "native [s]", "Python [s]", "speed-up"))
+
+    for name, x in inputs.items():
+
+        sort_func = date_string_to_datetime_obj if isinstance(x, pd.DatetimeIndex) else None
+
+        # same output
+        x_native = homogenize(x, sort_func=sort_func)
+        x_python = python_homogenize(x, sort_func=sort_func)
+        assert np.array_equal(x_native, x_python)
+
+        t_native = best_time(lambda: homogenize(x, sort_func=sort_func))
+        t_python = best_time(lambda: python_homogenize(x, sort_func=sort_func), repeat=1)
+        print("{:>24} {:>12.4f} {:>12.4f} {:>8.0f}x".format(name, t_native, t_python, t_python / t_native))
+
+    #
+    # O(n log n) scaling
+    #
+
+    print("\n{:>10} {:>12} {:>22}".format("n", "native [s]", "[ns] per n*log2(n)"))
+
+    for n in [10**4, 10**5, 10**6]:
+        x = rng.uniform(50.0, 150.0, n)
+        elapsed = best_time(lambda: homogenize(x), repeat=5)
+        print("{:>10} {:>12.5f} {:>22.3f}".format(n, elapsed, elapsed / (n * np.log2(n)) * 1e9))
+
+    #
+    # pricing parameters processing
+    #
+
+    market_env = MarketEnvironment()
+    option = PlainVanillaOption(market_env)
+
+    S_vector = np.linspace(50.0, 150.0, 10**6)
+    elapsed = best_time(lambda: option.process_pricing_parameters(S=S_vector, tau=0.5))
+    print("\n.process_pricing_parameters() on {} underlying values: {:.4f} seconds".format(len(S_vector), elapsed))
+
+    S_vector = rng.uniform(50.0, 150.0, 1000)
+    t_range = pd.date_range(start=market_env.get_t(), end="2020-12-30", periods=1000)
+    elapsed = best_time(lambda: option.process_pricing_parameters(S=S_vector, t=t_range))
+    print(".process_pricing_parameters() on {} underlying values x {} dates: {:.4f} seconds"\
+          .format(len(S_vector), len(t_range), elapsed))
+
+#----------------------------- usage example ---------------------------------#
+if __name__ == "__main__":
+
+    main()
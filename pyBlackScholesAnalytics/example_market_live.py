@@ -0,0 +1,55 @@
+"""
+Created by: Gabriele Pompa (gabriele.pompa@gmail.com)
+
+File: example_market_live.py
+
+Created on Tue Jul 14 2020 - Version: 1.0
+
+Description:
+
+This script shows how options and portfolios can be bound to a shared
+MarketEnvironment (live_market=True). Market updates (e.g. a spot tick) are
+single setter calls on the market environment: bound options re-synchronize
+lazily, without being re-instantiated.
+"""
+
+import numpy as np
+
+from market.market import MarketEnvironment
+from options.options import PlainVanillaOption, DigitalOption
+from portfolio.portfolio import Portfolio
+
+def main():
+
+    # shared market environment
+    market_env = MarketEnvironment()
+    print(market_env)
+
+    # a strip of plain-vanilla calls and a digital put, bound to the market environment
+    ptf = Portfolio(name="Live", mkt_env=market_env)
+    for K in np.arange(80.0, 125.0, 5.0):
+        ptf.add_instrument(PlainVanillaOption(market_env, K=K, live_market=True), 1)
+    ptf.add_instrument(DigitalOption(market_env, option_type="put", K=90.0, live_market=True), -10)
+    ptf.enable_cache()
+    print(ptf)
+
+    print("\nPortfolio value: {}; Delta: {}".format(ptf.price(), ptf.delta()))
+
+    # spot ticks: one setter call each, no object is rebuilt
+    for S in [91.0, 89.5, 90.25]:
+        market_env.set_S(S)
+        print("\nMarket version {} - S_t={}".format(market_env.get_version(), market_env.get_S()))
+        print("Portfolio value: {}; Delta: {}".format(ptf.price(), ptf.delta()))
+
+    # a change of valuation date updates times-to-maturity too
+    market_env.set_t("01-06-2020")
+    option = ptf.get_composition()[0]["instrument"]
+    print("\nNew valuation date: {}; tau={:.4f}y".format(option.get_t().strftime("%d-%m-%Y"), option.get_tau()))
+    print("Portfolio value: {}; P&L: {}".format(ptf.price(), ptf.PnL()))
+
+    print("\nPortfolio cache info: {}".format(ptf.get_cache_info()))
+
+#----------------------------- usage example ---------------------------------#
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,83 @@
+"""
+Created by: Gabriele Pompa (gabriele.pompa@gmail.com)
+
+File: example_option_book.py
+
+Created on Tue Jul 14 2020 - Version: 1.0
+
+Description:
+
+This script shows usage of OptionBook class. A book is first created from an
+existing Portfolio and its value compared with the Portfolio one. Then, a large
+book of randomly generated plain-vanilla and digital legs is priced and risked
+in one vectorized pass, both in total and aggregated by expiration date.
+"""
+
+import numpy as np
+import pandas as pd
+import time
+
+from market.market import MarketEnvironment
+from options.options import PlainVanillaOption, DigitalOption
+from portfolio.portfolio import Portfolio, OptionBook
+
+def main():
+
+    # default market environment
+    market_env = MarketEnvironment(t="01-06-2020")
+    print(market_env)
+
+    #
+    # OptionBook from Portfolio
+    #
+
+    ptf = Portfolio(name="Example")
+    ptf.add_instrument(PlainVanillaOption(market_env, K=110, T="31-12-2020"), 2)
+    ptf.add_instrument(PlainVanillaOption(market_env, option_type="put", K=80, T="30-06-2021"), -5)
+    ptf.add_instrument(DigitalOption(market_env, cash_amount=5.0, K=100, T="31-12-2020"), 3)
+    print(ptf)
+
+    book = OptionBook.from_portfolio(ptf, name="Example")
+    print(book)
+
+    # underlying scenarios
+    S_vector = [60.0, 90.0, 120.0]
+
+    print("\nPortfolio value: {}".format(ptf.price(S=S_vector)))
+    print("OptionBook value: {}".format(book.price(S=S_vector)))
+    print("\nOptionBook risk: {}".format(book.risk(S=S_vector)))
+
+    #
+    # a large OptionBook
+    #
+
+    # number of legs
+    n = 100000
+
+    # random number generator
+    rng = np.random.RandomState(42)
+
+    large_book = OptionBook(market_env, name="Large")
+    large_book.add_legs(option_type=np.where(rng.uniform(size=n) > 0.5, 'call', 'put'),
+                        K=rng.uniform(50.0, 150.0, n),
+                        T=pd.to_datetime("31-12-2020", format="%d-%m-%Y") + pd.to_timedelta(30*rng.randint(0, 12, n), unit='D'),
+                        position=rng.randint(-10, 10, n),
+                        style=np.where(rng.uniform(size=n) > 0.8, 'digital', 'plain_vanilla'),
+                        cash_amount=1.0)
+    print(large_book)
+
+    start = time.time()
+    print("\nLarge book value: {:.2f}".format(large_book.price()))
+    print("Elapsed time: {:.3f} seconds".format(time.time() - start))
+
+    start = time.time()
+    vega_by_expiry = large_book.risk(by='T')["vega"]
+    print("\nLarge book Vega by expiration date:")
+    for T, vega in zip(np.unique(large_book.get_T()), vega_by_expiry):
+        print("{}: {:.2f}".format(T, vega))
+    print("Elapsed time: {:.3f} seconds".format(time.time() - start))
+
+#----------------------------- usage example ---------------------------------#
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,89 @@
+"""
+Created by: Gabriele Pompa (gabriele.pompa@gmail.com)
+
+File: example_option_book_adjoint.py
+
+Created on Tue Jul 14 2020 - Version: 1.0
+
+Description:
+
+This script shows usage of .adjoint_risk() method of OptionBook and Portfolio
+classes. The valuation of a large book is recorded once on a Tape and adjoints
+are back-propagated to the inputs of every leg, so that per-leg, per-strike
+and per-expiry sensitivities cost a small multiple of one pricing pass.
+"""
+
+import numpy as np
+import pandas as pd
+import time
+
+from market.market import MarketEnvironment
+from options.options import PlainVanillaOption, DigitalOption
+from portfolio.portfolio import Portfolio, OptionBook
+
+def main():
+
+    # default market environment
+    market_env = MarketEnvironment(t="01-06-2020")
+    print(market_env)
+
+    #
+    # Portfolio: sensitivities to the inputs of each contract
+    #
+
+    ptf = Portfolio(name="Example")
+    ptf.add_instrument(PlainVanillaOption(market_env, K=110, T="31-12-2020"), 2)
+    ptf.add_instrument(PlainVanillaOption(market_env, option_type="put", K=80, T="30-06-2021"), -5)
+    ptf.add_instrument(DigitalOption(market_env, cash_amount=5.0, K=100, T="31-12-2020"), 3)
+    print(ptf)
+
+    ptf_sensitivities = ptf.adjoint_risk()
+    print("\nPortfolio Vega by contract: {}".format(ptf_sensitivities["vega"]))
+    print("Portfolio Vega (sum): {}; from .risk(): {}".format(ptf_sensitivities["vega"].sum(), ptf.risk()["vega"]))
+
+    #
+    # a large OptionBook
+    #
+
+    # number of legs
+    n = 100000
+
+    # random number generator
+    rng = np.random.RandomState(42)
+
+    book = OptionBook(market_env, name="Large")
+    book.add_legs(option_type=np.where(rng.uniform(size=n) > 0.5, 'call', 'put'),
+                  K=rng.uniform(50.0, 150.0, n),
+                  T=pd.to_datetime("31-12-2020", format="%d-%m-%Y") + pd.to_timedelta(30*rng.randint(0, 12, n), unit='D'),
+                  position=rng.randint(-10, 10, n),
+                  style=np.where(rng.uniform(size=n) > 0.8, 'digital', 'plain_vanilla'),
+                  cash_amount=1.0)
+    print(book)
+
+    start = time.time()
+    book.price()
+    print("\nOne pricing pass: {:.3f} seconds".format(time.time() - start))
+
+    # per-leg sensitivities
+    start = time.time()
+    sensitivities = book.adjoint_risk()
+    print("Per-leg sensitivities of {} legs: {:.3f} seconds".format(n, time.time() - start))
+    print("Vega of the first 5 legs: {}".format(sensitivities["vega"][:5]))
+
+    # per-expiry vega and rho buckets
+    expiry_buckets = book.adjoint_risk(by='T')
+    print("\nVega and Rho by expiration date:")
+    for T, vega, rho in zip(np.unique(book.get_T()), expiry_buckets["vega"], expiry_buckets["rho"]):
+        print("{}: Vega={:.2f}, Rho={:.2f}".format(T, vega, rho))
+
+    # per-strike vega buckets (strikes rounded to multiples of 10)
+    strike_labels = 10.0 * np.round(book.get_K() / 10.0)
+    strike_buckets = book.adjoint_risk(by=strike_labels)
+    print("\nVega by strike bucket:")
+    for K, vega in zip(np.unique(strike_labels), strike_buckets["vega"]):
+        print("K~{:.0f}: Vega={:.2f}".format(K, vega))
+
+#----------------------------- usage example ---------------------------------#
+if __name__ == "__main__":
+
+    main()
@@ -182,6 +182,7 @@ def main():
         print("\nGamma:\n", option.gamma(**param_dict))
         print("\nVega:\n", option.vega(**param_dict))
         print("\nRho:\n", option.rho(**param_dict))
+        print("\nPrice and greeks in a single pass:\n", option.risk(**param_dict))
         
         # Implied volatility calculation is not implemented for x-axis (columns) 
         # spanned by parameters different from S or K (like sigma or r)
@@ -15,6 +15,7 @@ digital option contracts.
 import numpy as np
 import pandas as pd
 import warnings
+import time
 
 from market.market import MarketEnvironment
 from options.options import PlainVanillaOption, DigitalOption
@@ -103,12 +104,23 @@ def main():
 
     # newton method
     param_dict["minimization_method"] = "Newton"
-    newton_IV = option.implied_volatility(**param_dict)
+    newton_IV, newton_info = option.implied_volatility(full_output=True, verbose=True, **param_dict)
     RMSE_newton = np.sqrt(np.nanmean((newton_IV - expected_IV)**2))
     RMSRE_newton = np.sqrt(np.nanmean(((newton_IV - expected_IV)/expected_IV)**2))
     print("\nImplied Volatility - Newton method - Metrics (NaN excluded): RMSE={:.1E}, RMSRE={:.1E}:\n"\
           .format(RMSE_newton, RMSRE_newton), newton_IV)
     
+    # per-point number of iterations and status flags (0: converged, 1: max_iter exceeded, 2: failed)
+    print("\nNewton method - Iterations: \n", newton_info["iterations"])
+    print("\nNewton method - Status: \n", newton_info["status"])
+    
+    # newton method, starting from a closed-form initial guess
+    initial_guess = "stefanica_radoicic" if opt_style == "plain_vanilla" else "analytic"
+    newton_guess_IV, newton_guess_info = option.implied_volatility(initial_guess=initial_guess, full_output=True, **param_dict)
+    RMSE_newton_guess = np.sqrt(np.nanmean((newton_guess_IV - expected_IV)**2))
+    print("\nImplied Volatility - Newton method from '{}' initial guess - RMSE={:.1E}. Iterations: \n"\
+          .format(initial_guess, RMSE_newton_guess), newton_guess_info["iterations"])
+    
     # Least=Squares method
     param_dict["minimization_method"] = "Least-Squares"
     ls_IV = option.implied_volatility(**param_dict)
@@ -118,6 +130,16 @@ def main():
     print("\nImplied Volatility - Least-Squares constrained method - Metrics (NaN excluded): RMSE={:.1E}, RMSRE={:.1E}:\n"\
           .format(RMSE_ls, RMSRE_ls), ls_IV)
 
+    # Bracketing method (robust where Vega vanishes, as for digital options)
+    param_dict["minimization_method"] = "Bracketing"
+    bracketing_IV, bracketing_info = option.implied_volatility(full_output=True, **param_dict)
+    RMSE_bracketing = np.sqrt(np.nanmean((bracketing_IV - expected_IV)**2))
+    RMSRE_bracketing = np.sqrt(np.nanmean(((bracketing_IV - expected_IV)/expected_IV)**2))
+
+    print("\nImplied Volatility - Bracketing method - Metrics (NaN excluded): RMSE={:.1E}, RMSRE={:.1E}:\n"\
+          .format(RMSE_bracketing, RMSRE_bracketing), bracketing_IV)
+    print("\nBracketing method - Iterations: \n", bracketing_info["iterations"])
+
     #
     # With target_price in input: target_price, but no param_dict['sigma'],
     # is used in minimization.
@@ -149,6 +171,20 @@ def main():
     print("\nImplied Volatility - Least-Squares constrained method - Metrics (NaN excluded): RMSE={:.1E}, RMSRE={:.1E}:\n"\
           .format(RMSE_ls, RMSRE_ls), ls_IV)
     
+    #
+    # Batch of 10^6 quotes (Newton method, no summary printed)
+    #
+    
+    rng = np.random.default_rng(42)
+    S_batch = rng.uniform(80.0, 120.0, 10**6)
+    sigma_batch = rng.uniform(0.1, 0.5, 10**6)
+    target_batch = option.price(S=S_batch, sigma=sigma_batch)
+    
+    start = time.time()
+    batch_IV = option.implied_volatility(S=S_batch, target_price=target_batch)
+    print("\nImplied Volatility of {} quotes - Newton method: {:.3f} seconds, max abs error {:.1E}"\
+          .format(len(S_batch), time.time() - start, np.nanmax(np.abs(batch_IV - sigma_batch))))
+    
 
 #----------------------------- usage example ---------------------------------#
 if __name__ == "__main__":
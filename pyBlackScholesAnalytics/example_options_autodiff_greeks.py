@@ -0,0 +1,83 @@
+"""
+Created by: Gabriele Pompa (gabriele.pompa@gmail.com)
+
+File: example_options_autodiff_greeks.py
+
+Created on Tue Jul 14 2020 - Version: 1.0
+
+Description:
+
+This script shows usage of ADGreeks class, computing exact greeks with
+forward-mode automatic differentiation: the pricing methods of option
+classes run unchanged on DualArrays. Greeks are compared with their analytic
+expressions (.risk() method) and with finite-differences (NumericGreeks class).
+Second-order cross sensitivities (e.g. d^2V/dSdsigma) come from the same pass.
+"""
+
+import numpy as np
+import pandas as pd
+import time
+
+from market.market import MarketEnvironment
+from options.options import PlainVanillaOption, DigitalOption
+from portfolio.portfolio import Portfolio
+from utils.autodiff import ADGreeks, DualArray
+from utils.numeric_routines import NumericGreeks
+
+def main():
+
+    # default market environment
+    market_env = MarketEnvironment()
+    print(market_env)
+
+    #
+    # DualArray: derivatives of d1 and d2 terms w.r.t. S and sigma
+    #
+
+    option = PlainVanillaOption(market_env)
+    print(option)
+
+    S, sigma = DualArray.variables(option.get_S(), option.get_sigma())
+    d1, d2 = option.d1_and_d2(S=S, K=option.get_K(), tau=option.get_tau(), sigma=sigma, r=option.get_r())
+    print("\nd1={:.6f}; dd1/dS={:.6f}; dd1/dsigma={:.6f}; d^2d1/dSdsigma={:.6f}"\
+          .format(d1.get_value(), d1.get_gradient()[0], d1.get_gradient()[1], d1.get_hessian()[0, 1]))
+
+    # underlying and valuation dates grid
+    S_vector = np.linspace(50.0, 150.0, 2000)
+    t_range = pd.date_range(start="01-05-2020", end="30-11-2020", periods=200)
+
+    for option in [PlainVanillaOption(market_env, option_type="put"), DigitalOption(market_env)]:
+
+        # automatic differentiation greeks
+        start = time.time()
+        ad_greeks = ADGreeks(option).all(S=S_vector, t=t_range)
+        print("\nAD greeks computed in {:.3f} seconds".format(time.time() - start))
+
+        # analytic and numeric greeks
+        analytic_greeks = option.risk(S=S_vector, t=t_range)
+        numeric_greeks = NumericGreeks(option).all(S=S_vector, t=t_range)
+
+        for greek_type in ["delta", "theta", "gamma", "vega", "rho"]:
+            print("{}: max abs difference AD Vs analytic={:.1E}, AD Vs numeric={:.1E}"\
+                  .format(greek_type,
+                          np.max(np.abs(ad_greeks[greek_type] - analytic_greeks[greek_type])),
+                          np.max(np.abs(ad_greeks[greek_type] - numeric_greeks[greek_type]))))
+
+    #
+    # second-order sensitivities of a portfolio
+    #
+
+    ptf = Portfolio(name="Example")
+    ptf.add_instrument(PlainVanillaOption(market_env, K=110, T="31-12-2020"), 2)
+    ptf.add_instrument(DigitalOption(market_env, option_type="put", K=90, T="30-06-2021"), -5)
+    print(ptf)
+
+    derivatives = ADGreeks(ptf).derivatives(S=[80.0, 90.0, 100.0, 110.0, 120.0])
+    print("\nPortfolio value: {}".format(derivatives["value"]))
+    print("Portfolio d^2V/dSdsigma: {}".format(derivatives["hessian"][("S", "sigma")]))
+    print("Portfolio d^2V/dsigma^2: {}".format(derivatives["hessian"][("sigma", "sigma")]))
+
+#----------------------------- usage example ---------------------------------#
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,63 @@
+"""
+Created by: Gabriele Pompa (gabriele.pompa@gmail.com)
+
+File: example_options_cache.py
+
+Created on Tue Jul 14 2020 - Version: 1.0
+
+Description:
+
+This script shows usage of the opt-in results cache of PlainVanillaOption and
+Portfolio classes. Repeated calls with identical parameters are served from
+the cache, while setters invalidate stored results.
+"""
+
+import numpy as np
+import pandas as pd
+import time
+
+from market.market import MarketEnvironment
+from options.options import PlainVanillaOption
+from portfolio.portfolio import Portfolio
+
+def main():
+
+    # default market environment
+    market_env = MarketEnvironment()
+    print(market_env)
+
+    # plain-vanilla call option, with results cache enabled
+    option = PlainVanillaOption(market_env)
+    option.enable_cache(max_entries=64, max_bytes=16*1024**2)
+    print(option)
+
+    # a dense grid of underlying values and valuation dates
+    S_vector = np.linspace(50.0, 150.0, 1000)
+    t_range = pd.date_range(start=option.get_t(), end=option.get_T(), periods=100)
+
+    for attempt in range(2):
+        start = time.time()
+        option.price(S=S_vector, t=t_range)
+        print("\nPrice - attempt {}: {:.4f} seconds".format(attempt + 1, time.time() - start))
+        print("Cache info: {}".format(option.get_cache_info()))
+
+    # changing the strike invalidates the cache
+    option.set_K(110.0)
+    print("\nStrike changed. Cache info: {}".format(option.get_cache_info()))
+    option.price(S=S_vector, t=t_range)
+    print("Cache info: {}".format(option.get_cache_info()))
+
+    # portfolio cache
+    ptf = Portfolio(name="Cached")
+    ptf.add_instrument(option, 1)
+    ptf.add_instrument(PlainVanillaOption(market_env, option_type="put"), -1)
+    ptf.enable_cache()
+
+    for attempt in range(2):
+        ptf.delta(S=S_vector, t=t_range)
+        print("\nPortfolio Delta - attempt {}. Cache info: {}".format(attempt + 1, ptf.get_cache_info()))
+
+#----------------------------- usage example ---------------------------------#
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,80 @@
+"""
+Created by: Gabriele Pompa (gabriele.pompa@gmail.com)
+
+File: example_options_day_count.py
+
+Created on Tue Jul 14 2020 - Version: 1.0
+
+Description:
+
+This script shows usage of the date subsystem (dates.py): time-to-maturity of
+options under ACT/365, ACT/360 and business-days (BUS/252, with an optional
+holiday calendar) day-count conventions. Date Strings are parsed once and
+cached, and year fractions are computed vectorized on np.datetime64 arrays.
+Timings are compared with the element-wise pd.Timestamp computation
+(T-t).days/365.0.
+"""
+
+import numpy as np
+import pandas as pd
+import time
+
+from market.market import MarketEnvironment
+from options.options import PlainVanillaOption
+from utils.dates import parse_date_string, year_fraction
+
+def main():
+
+    # default market environment
+    market_env = MarketEnvironment()
+    print(market_env)
+
+    #
+    # day-count conventions
+    #
+
+    holidays = ["14-08-2020", "25-12-2020"]
+
+    for day_count, holidays_calendar in [("ACT/365", None), ("ACT/360", None), ("BUS/252", None), ("BUS/252", holidays)]:
+        option = PlainVanillaOption(market_env, day_count=day_count, holidays=holidays_calendar, verbose=False)
+        print("Day-count: {}, holidays: {} --> tau = {:.6f}, price = {}"\
+              .format(day_count, holidays_calendar, option.get_tau(), option.price()))
+
+    # changing the day-count convention updates time-to-maturity
+    option = PlainVanillaOption(market_env, verbose=False)
+    option.set_day_count("ACT/360")
+    print("\nAfter .set_day_count('ACT/360'): tau = {:.6f}".format(option.get_tau()))
+
+    #
+    # lists of date Strings: each distinct String is parsed once
+    #
+
+    t_dates = ["01-06-2020", "01-09-2020", "01-12-2020"] * 1000
+    print("\nPrices at t={}:\n{}".format(t_dates[:3], option.price(t=t_dates[:3])))
+
+    option.price(t=t_dates)
+    print("Date Strings parsing cache: {}".format(parse_date_string.cache_info()))
+
+    #
+    # vectorized Vs element-wise year fractions
+    #
+
+    t_range = pd.date_range(start=market_env.get_t(), end="2020-12-30", periods=10**5)
+    T = option.get_T()
+
+    start = time.time()
+    tau_vectorized = year_fraction(t_range, T)
+    elapsed_vectorized = time.time() - start
+
+    start = time.time()
+    tau_elementwise = np.array([(T - t).days / 365.0 for t in t_range])
+    elapsed_elementwise = time.time() - start
+
+    assert np.allclose(tau_vectorized, tau_elementwise)
+    print("\nYear fractions of {} dates: vectorized {:.4f} seconds, element-wise {:.4f} seconds"\
+          .format(len(t_range), elapsed_vectorized, elapsed_elementwise))
+
+#----------------------------- usage example ---------------------------------#
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,104 @@
+"""
+Created by: Gabriele Pompa (gabriele.pompa@gmail.com)
+
+File: example_options_float32.py
+
+Created on Tue Jul 14 2020 - Version: 1.0
+
+Description:
+
+This script shows usage of single precision (float32) pricing, either for a
+single call (dtype keyboard parameter) or library-wide (set_float_dtype()
+function). It reports the accuracy of prices and greeks w.r.t. double precision
+(float64) on a large grid of scenarios, together with the memory taken by
+coordinated parameters and computation times.
+"""
+
+import numpy as np
+import pandas as pd
+import time
+import warnings
+
+from market.market import MarketEnvironment
+from options.options import PlainVanillaOption, DigitalOption
+from portfolio.portfolio import OptionBook
+from utils.utils import set_float_dtype, get_float_dtype
+
+def main():
+
+    # NaN greeks at expiration raise warnings
+    warnings.filterwarnings("ignore")
+
+    # default market environment
+    market_env = MarketEnvironment()
+    print(market_env)
+
+    # grid of 2000 underlying values x 500 valuation dates
+    S_vector = np.linspace(50.0, 150.0, 2000)
+    t_range = pd.date_range(start=market_env.get_t(), end="2020-12-30", periods=500)
+
+    metrics = ["price", "delta", "theta", "gamma", "vega", "rho"]
+
+    #
+    # accuracy report: float32 Vs float64
+    #
+
+    for option in [PlainVanillaOption(market_env, option_type="put"), DigitalOption(market_env)]:
+
+        print(option)
+
+        for dtype in ["float64", "float32"]:
+
+            params = option.process_pricing_parameters(S=S_vector, t=t_range, dtype=dtype)
+            params_bytes = sum([params[p].nbytes for p in ["S", "K", "tau", "sigma", "r"]])
+
+            start = time.time()
+            option.risk(S=S_vector, t=t_range, dtype=dtype)
+            print("{}: risk on {} scenarios in {:.3f} seconds (parameters: {:.1f} MB)"\
+                  .format(dtype, params["S"].size, time.time() - start, params_bytes / 1024**2))
+
+        risk_64 = option.risk(S=S_vector, t=t_range)
+        risk_32 = option.risk(S=S_vector, t=t_range, dtype="float32")
+
+        # absolute errors, also relative to the largest absolute value of each metrics
+        print("\n{:>8} {:>10} {:>14} {:>16}".format("metrics", "dtype", "max abs error", "relative to max"))
+        for m in metrics:
+            error = np.nanmax(np.abs(risk_32[m] - risk_64[m]))
+            scale = np.nanmax(np.abs(risk_64[m]))
+            print("{:>8} {:>10} {:>14.1E} {:>16.1E}".format(m, str(risk_32[m].dtype), error, error / scale))
+
+    #
+    # library-wide policy
+    #
+
+    option = PlainVanillaOption(market_env)
+
+    set_float_dtype("float32")
+    print("\nLibrary-wide data-type: {}; price: {} ({})".format(get_float_dtype(), option.price(), option.price().dtype))
+
+    # restoring double precision
+    set_float_dtype(None)
+    print("Library-wide data-type: {}; price: {} ({})".format(get_float_dtype(), option.price(), option.price().dtype))
+
+    #
+    # option book on market scenarios
+    #
+
+    book = OptionBook(market_env, name="Strip")
+    book.add_legs(option_type=["call", "put"] * 50, K=np.repeat(np.linspace(75.0, 125.0, 50), 2),
+                  T="31-12-2020", position=1.0)
+    print(book)
+
+    S_scenarios = np.linspace(50.0, 150.0, 10000)
+    for dtype in ["float64", "float32"]:
+        start = time.time()
+        value = book.price(S=S_scenarios, dtype=dtype)
+        print("{}: value on {} scenarios in {:.3f} seconds".format(dtype, len(S_scenarios), time.time() - start))
+
+    print("Max abs error of book value: {:.1E}"\
+          .format(np.max(np.abs(book.price(S=S_scenarios, dtype="float32") - book.price(S=S_scenarios)))))
+
+#----------------------------- usage example ---------------------------------#
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,70 @@
+"""
+Created by: Gabriele Pompa (gabriele.pompa@gmail.com)
+
+File: example_options_from_arrays.py
+
+Created on Tue Jul 14 2020 - Version: 1.0
+
+Description:
+
+This script shows usage of the bulk constructor .from_arrays() of
+PlainVanillaOption and DigitalOption classes. Many options are created at
+once from aligned arrays of types, strikes and expiration dates, their initial
+prices being computed in a single vectorized call. Single options compute
+their initial price lazily, on first access. Bulk-constructed options are copies
+of a single prototype: terms are validated and parsed in a vectorized way.
+"""
+
+import numpy as np
+import pandas as pd
+import time
+
+from market.market import MarketEnvironment
+from options.options import PlainVanillaOption, DigitalOption
+
+def main():
+
+    # default market environment
+    market_env = MarketEnvironment()
+    print(market_env)
+
+    # number of options
+    n = 10000
+
+    # random number generator
+    rng = np.random.RandomState(42)
+
+    types = np.where(rng.uniform(size=n) > 0.5, 'call', 'put')
+    K = rng.uniform(50.0, 150.0, n)
+    T = pd.to_datetime("31-12-2020", format="%d-%m-%Y") + pd.to_timedelta(30*rng.randint(0, 12, n), unit='D')
+
+    #
+    # bulk construction
+    #
+
+    start = time.time()
+    options = PlainVanillaOption.from_arrays(market_env, types=types, K=K, T=T)
+    initial_prices = [option.get_initial_price() for option in options]
+    print("\n{} Plain-Vanilla options created and priced in {:.3f} seconds".format(n, time.time() - start))
+
+    start = time.time()
+    digitals = DigitalOption.from_arrays(market_env, types=types, K=K, T=T, cash_amount=2.0)
+    print("{} Digital options created and priced in {:.3f} seconds".format(n, time.time() - start))
+
+    #
+    # comparison with one-by-one construction (lazy initial price)
+    #
+
+    i = 0
+    option = PlainVanillaOption(market_env, option_type=types[i], K=K[i], T=T[i])
+    print(option)
+    print("Initial price: .from_arrays()={}; lazy={}".format(initial_prices[i], option.get_initial_price()))
+
+    digital = DigitalOption(market_env, cash_amount=2.0, option_type=types[i], K=K[i], T=T[i])
+    print(digital)
+    print("Initial price: .from_arrays()={}; lazy={}".format(digitals[i].get_initial_price(), digital.get_initial_price()))
+
+#----------------------------- usage example ---------------------------------#
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,78 @@
+"""
+Created by: Gabriele Pompa (gabriele.pompa@gmail.com)
+
+File: example_options_higher_order_greeks.py
+
+Created on Tue Jul 14 2020 - Version: 1.0
+
+Description:
+
+This script shows usage of higher-order greeks (Vanna, Volga, Charm, Speed and
+Color) of PlainVanillaOption and DigitalOption classes and of Portfolio class.
+Greeks are closed-form and vectorized: .higher_order_risk() computes all of
+them in a single pass, sharing d1 and d2 terms. They are compared with second-
+order derivatives from automatic differentiation (ADGreeks class) and with
+finite-differences of Gamma.
+"""
+
+import numpy as np
+import pandas as pd
+
+from market.market import MarketEnvironment
+from options.options import PlainVanillaOption, DigitalOption
+from portfolio.portfolio import Portfolio
+from utils.autodiff import ADGreeks
+
+def main():
+
+    # default market environment
+    market_env = MarketEnvironment()
+    print(market_env)
+
+    # underlying and valuation dates grid
+    S_vector = np.linspace(50.0, 150.0, 200)
+    t_range = pd.date_range(start="01-05-2020", end="30-11-2020", periods=50)
+
+    for option in [PlainVanillaOption(market_env, option_type="put"), DigitalOption(market_env)]:
+
+        print(option)
+
+        # single greeks, with default rescaling
+        print("\nVanna={}; Volga={}; Charm={}; Speed={}; Color={}"\
+              .format(option.vanna(), option.volga(), option.charm(), option.speed(), option.color()))
+
+        # all the higher-order greeks in a single pass, not rescaled
+        greeks = option.higher_order_risk(S=S_vector, t=t_range, vanna_factor=1.0, volga_factor=1.0,
+                                          charm_factor=1.0, color_factor=1.0)
+
+        # second-order derivatives from automatic differentiation
+        hessian = ADGreeks(option).derivatives(S=S_vector, t=t_range)["hessian"]
+        print("Vanna: max abs difference Vs AD={:.1E}".format(np.max(np.abs(greeks["vanna"] - hessian[("S", "sigma")]))))
+        print("Volga: max abs difference Vs AD={:.1E}".format(np.max(np.abs(greeks["volga"] - hessian[("sigma", "sigma")]))))
+        print("Charm: max abs difference Vs AD={:.1E}".format(np.max(np.abs(greeks["charm"] + hessian[("S", "tau")]))))
+
+        # finite-differences of gamma
+        dS = 0.01
+        speed_fd = (option.gamma(S=S_vector + dS, t=t_range) - option.gamma(S=S_vector - dS, t=t_range)) / (2.0 * dS)
+        print("Speed: max abs difference Vs finite-differences={:.1E}".format(np.max(np.abs(greeks["speed"] - speed_fd))))
+
+    #
+    # higher-order greeks of a portfolio
+    #
+
+    ptf = Portfolio(name="Example")
+    ptf.add_instrument(PlainVanillaOption(market_env, K=110, T="31-12-2020"), 2)
+    ptf.add_instrument(PlainVanillaOption(market_env, option_type="put", K=90, T="31-12-2020"), -2)
+    ptf.add_instrument(DigitalOption(market_env, K=100, T="31-12-2020"), 10)
+    print(ptf)
+
+    ptf_greeks = ptf.higher_order_risk(S=[80.0, 90.0, 100.0, 110.0, 120.0])
+    for greek_type in ptf_greeks:
+        print("Portfolio {}: {}".format(greek_type.capitalize(), ptf_greeks[greek_type]))
+
+    print("\nPortfolio Vanna from .vanna(): {}".format(ptf.vanna(S=[80.0, 90.0, 100.0, 110.0, 120.0])))
+
+#----------------------------- usage example ---------------------------------#
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,88 @@
+"""
+Created by: Gabriele Pompa (gabriele.pompa@gmail.com)
+
+File: example_options_labeled_output.py
+
+Created on Tue Jul 14 2020 - Version: 1.0
+
+Description:
+
+This script shows how labelled outputs are produced: metrics are computed on
+np.ndarrays and labels are attached once, at the end. For 2-dim outputs
+(np_output=False) labels are those of a pd.DataFrame, for N-dimensional grids
+of scenarios they are carried by a LabeledArray, which can be sliced by axis
+name and label and converted to pd.Series and pd.DataFrame.
+"""
+
+import numpy as np
+import pandas as pd
+import time
+
+from market.market import MarketEnvironment
+from options.options import PlainVanillaOption
+from portfolio.portfolio import Portfolio
+
+def main():
+
+    # default market environment
+    market_env = MarketEnvironment()
+    print(market_env)
+
+    option = PlainVanillaOption(market_env, option_type="put")
+    print(option)
+
+    #
+    # pd.DataFrame output
+    #
+
+    S_vector = np.linspace(50.0, 150.0, 2000)
+    t_range = pd.date_range(start=market_env.get_t(), end="2020-12-30", periods=500)
+
+    # coordinated parameters are np.ndarray views, shaped as the pd.DataFrame output, and its labels
+    params = option.process_pricing_parameters(S=S_vector, t=t_range, np_output=False)
+    print("Parameters of type {} and shape {}, labelled by index '{}' and columns '{}'"\
+          .format(type(params["S"]).__name__, params["S"].shape, params["index"].name, params["columns"].name))
+
+    for np_output in [True, False]:
+        start = time.time()
+        price = option.price(S=S_vector, t=t_range, np_output=np_output)
+        print("np_output={}: {} prices of type {} in {:.3f} seconds"\
+              .format(np_output, price.size, type(price).__name__, time.time() - start))
+
+    print("\nPrices:\n{}".format(option.price(S=S_vector[::500], t=t_range[::100], np_output=False)))
+
+    #
+    # LabeledArray output on a spot x volatility x date grid
+    #
+
+    sigma_vector = np.array([0.1, 0.2, 0.3])
+    t_dates = ["01-06-2020", "01-09-2020", "01-12-2020"]
+
+    cube = option.grid(["price", "delta"], S=[80.0, 90.0, 100.0, 110.0], sigma=sigma_vector, t=t_dates, np_output=False)["values"]
+    print("\n{}".format(cube["price"]))
+
+    # selections by label and by position
+    print("\nPrices at sigma=0.2:\n{}".format(cube["price"].sel(sigma=0.2).to_pandas()))
+    print("\nDeltas at S=100 on {}:\n{}".format(t_dates[-1], cube["delta"].sel(S=100.0, t=t_dates[-1]).to_pandas()))
+    print("\nPrice at the first scenario: {:.4f}".format(cube["price"].isel(S=0, sigma=0, t=0).to_pandas()))
+
+    # arithmetics keeps labels
+    delta_hedged = cube["price"] - cube["delta"] * cube["price"].get_coords("S")[:, np.newaxis, np.newaxis]
+    print("\nDelta-hedged position value of axes {}: max {:.4f}".format(delta_hedged.get_dims(), np.max(delta_hedged)))
+
+    #
+    # portfolio
+    #
+
+    ptf = Portfolio(name="Bull spread")
+    ptf.add_instrument(PlainVanillaOption(market_env, K=90.0, verbose=False), 1)
+    ptf.add_instrument(PlainVanillaOption(market_env, K=110.0, verbose=False), -1)
+    print(ptf)
+
+    value = ptf.grid(S=[80.0, 100.0, 120.0], r=[0.0, 0.01, 0.05], sigma=sigma_vector, np_output=False)["values"]
+    print("Portfolio value of axes {}, at r=0.01:\n{}".format(value.get_dims(), value.sel(r=0.01).to_pandas()))
+
+#----------------------------- usage example ---------------------------------#
+if __name__ == "__main__":
+
+    main()
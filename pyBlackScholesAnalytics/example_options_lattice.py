@@ -0,0 +1,94 @@
+"""
+Created by: Gabriele Pompa (gabriele.pompa@gmail.com)
+
+File: example_options_lattice.py
+
+Created on Tue Jul 14 2020 - Version: 1.0
+
+Description:
+
+This script shows usage of LatticePricer class, pricing options and portfolios
+on binomial and trinomial lattices. European prices converge to Black-Scholes
+ones, faster if the last time-step is smoothed and Richardson extrapolation is
+used. American puts are priced with early-exercise. All the scenarios of all
+the contracts are valued in a single backward sweep.
+"""
+
+import numpy as np
+import pandas as pd
+import time
+
+from market.market import MarketEnvironment
+from options.options import PlainVanillaOption, DigitalOption
+from portfolio.portfolio import Portfolio
+from utils.lattice import LatticePricer
+
+def main():
+
+    # default market environment
+    market_env = MarketEnvironment()
+    print(market_env)
+
+    # underlying values
+    S_vector = np.array([80.0, 90.0, 100.0, 110.0, 120.0])
+
+    #
+    # convergence to Black-Scholes price
+    #
+
+    for option in [PlainVanillaOption(market_env, option_type="put"), DigitalOption(market_env)]:
+
+        print(option)
+        bs_price = option.price(S=S_vector)
+
+        for method in ["binomial", "trinomial"]:
+            for smoothing, richardson in [(False, False), (True, False), (True, True)]:
+                for n_steps in [50, 200]:
+
+                    lattice = LatticePricer(option, n_steps=n_steps, method=method,
+                                            smoothing=smoothing, richardson=richardson)
+
+                    print("{} ({} steps, smoothing={}, richardson={}): max abs error={:.1E}"\
+                          .format(method, n_steps, smoothing, richardson,
+                                  np.max(np.abs(lattice.price(S=S_vector) - bs_price))))
+
+    #
+    # american put
+    #
+
+    market_env_american = MarketEnvironment(t="01-01-2020", r=0.06, S_t=36.0, sigma=0.2)
+    put = PlainVanillaOption(market_env_american, option_type="put", K=40.0, T="31-12-2020")
+    print(put)
+
+    for n_steps in [25, 50, 100, 200]:
+        lattice = LatticePricer(put, n_steps=n_steps, exercise="american", smoothing=True, richardson=True)
+        print("American put ({} steps): {}".format(n_steps, lattice.price()))
+
+    # early-exercise premium on a grid of underlying values and valuation dates
+    lattice = LatticePricer(put, n_steps=100, smoothing=True, richardson=True)
+    t_range = pd.date_range(start="2020-01-01", end="2020-12-01", periods=4)
+
+    start = time.time()
+    premium = lattice.early_exercise_premium(S=np.linspace(30.0, 50.0, 5), t=t_range, np_output=False)
+    print("\nEarly-exercise premium (in {:.3f} seconds):\n{}".format(time.time() - start, premium))
+
+    #
+    # many strikes and expirations in a single sweep
+    #
+
+    ptf = Portfolio(name="Strip")
+    for K in np.arange(30.0, 52.0, 2.0):
+        for T in ["30-06-2020", "31-12-2020", "30-06-2021"]:
+            ptf.add_instrument(PlainVanillaOption(market_env_american, option_type="put", K=K, T=T, verbose=False), 1)
+    print(ptf)
+
+    start = time.time()
+    value = LatticePricer(ptf, n_steps=200, exercise="american").price(S=np.linspace(30.0, 50.0, 100))
+    print("American value of the strip on 100 underlying values in {:.3f} seconds".format(time.time() - start))
+    print("American value at S={}: {}".format(put.get_S(), LatticePricer(ptf, n_steps=200, exercise="american").price()))
+    print("European value at S={}: {}".format(put.get_S(), ptf.price()))
+
+#----------------------------- usage example ---------------------------------#
+if __name__ == "__main__":
+
+    main()
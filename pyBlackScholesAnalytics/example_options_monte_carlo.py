@@ -0,0 +1,82 @@
+"""
+Created by: Gabriele Pompa (gabriele.pompa@gmail.com)
+
+File: example_options_monte_carlo.py
+
+Created on Tue Jul 14 2020 - Version: 1.0
+
+Description:
+
+This script shows usage of MonteCarloPricer class, pricing options and
+portfolios by Monte Carlo simulation under GBM. Standard errors with and
+without variance reduction (antithetic and control variates) are compared,
+also for a digital option paying a cash amount other than 1, as well as
+running times with a different number of worker processes. Prices are
+reproducible, independently of the number of workers.
+"""
+
+import numpy as np
+import time
+
+from market.market import MarketEnvironment
+from options.options import PlainVanillaOption, DigitalOption
+from portfolio.portfolio import Portfolio
+from utils.monte_carlo import MonteCarloPricer
+
+def main():
+
+    # default market environment
+    market_env = MarketEnvironment()
+    print(market_env)
+
+    # underlying values
+    S_vector = np.array([80.0, 90.0, 100.0, 110.0, 120.0])
+
+    for option in [PlainVanillaOption(market_env, option_type="put"), DigitalOption(market_env, cash_amount=5.0)]:
+
+        print(option)
+        print("Black-Scholes price: {}".format(option.price(S=S_vector)))
+
+        # variance reduction
+        for antithetic, control_variate in [(False, False), (True, False), (True, True)]:
+
+            mc = MonteCarloPricer(option, n_paths=200000, antithetic=antithetic,
+                                  control_variate=control_variate, seed=42)
+            estimate = mc.estimate(S=S_vector)
+
+            print("\nAntithetic={}, Control variate={}".format(antithetic, control_variate))
+            print("MC price: {}".format(estimate["price"]))
+            print("Std. error: {}".format(estimate["std_error"]))
+
+    #
+    # multi-core simulation of many paths, in chunks
+    #
+
+    option = DigitalOption(market_env)
+
+    for n_workers in [1, 2, 4]:
+
+        mc = MonteCarloPricer(option, n_paths=4000000, chunk_size=100000, n_workers=n_workers, seed=42)
+
+        start = time.time()
+        price = mc.price(S=S_vector)
+        print("\n{} workers: {:.3f} seconds; MC price: {}".format(n_workers, time.time() - start, price))
+
+    #
+    # portfolio pricing
+    #
+
+    ptf = Portfolio(name="Example")
+    ptf.add_instrument(PlainVanillaOption(market_env, K=110, T="31-12-2020"), 2)
+    ptf.add_instrument(DigitalOption(market_env, option_type="put", K=90, T="30-06-2021"), -5)
+    print(ptf)
+
+    estimate = MonteCarloPricer(ptf, seed=42).estimate(S=S_vector)
+    print("\nPortfolio Black-Scholes value: {}".format(ptf.price(S=S_vector)))
+    print("Portfolio MC value: {}".format(estimate["price"]))
+    print("Std. error: {}".format(estimate["std_error"]))
+
+#----------------------------- usage example ---------------------------------#
+if __name__ == "__main__":
+
+    main()
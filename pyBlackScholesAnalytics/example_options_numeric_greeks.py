@@ -9,7 +9,8 @@ Description:
     
 This script provides an example of first-order numeric greeks implemented in 
 the NumericGreeks class using finite-difference methods for plain-vanilla 
-and digital option contracts.
+and digital option contracts. Greeks are computed both one by one and all 
+at once, with the .all() method.
 """
 
 import numpy as np
@@ -95,6 +96,12 @@ def main():
     tau_range = np.linspace(1e-4,1.0,1000)
     tau_range = homogenize(tau_range, reverse_order=True)
 
+    # all numeric greeks at once, from a single stacked finite-differences stencil
+    numeric_greeks_Vs_S = NumGreeks.all(S=S_range)
+    for greek_type in ["delta", "theta", "gamma", "vega", "rho"]:
+        print("Numeric {} - max abs difference between .all() and .{}(): {:.1E}"\
+              .format(greek_type, greek_type, np.max(np.abs(numeric_greeks_Vs_S[greek_type] - greeks_factory(NumGreeks, greek_type)(S=S_range)))))
+
     # select greek
     for greek_type in ["delta", "theta", "gamma", "vega", "rho"]:
                 
@@ -0,0 +1,83 @@
+"""
+Created by: Gabriele Pompa (gabriele.pompa@gmail.com)
+
+File: example_options_pde.py
+
+Created on Tue Jul 14 2020 - Version: 1.0
+
+Description:
+
+This script shows usage of PDEPricer class, solving the Black-Scholes PDE by
+Crank-Nicolson finite-differences (with Rannacher smoothing). A single sweep
+gives value, delta, gamma and theta surfaces on a grid of underlying values
+and valuation dates, shaped as the np_output=False output of option methods.
+Results are compared with closed-form ones.
+"""
+
+import numpy as np
+import pandas as pd
+import time
+
+from market.market import MarketEnvironment
+from options.options import PlainVanillaOption, DigitalOption
+from portfolio.portfolio import Portfolio
+from utils.pde import PDEPricer
+
+def main():
+
+    # default market environment
+    market_env = MarketEnvironment()
+    print(market_env)
+
+    # grid of underlying values and valuation dates
+    S_vector = np.linspace(50.0, 150.0, 101)
+    t_range = pd.date_range(start=market_env.get_t(), end="2020-12-01", periods=10)
+
+    #
+    # surfaces Vs closed-form metrics
+    #
+
+    for option in [PlainVanillaOption(market_env, option_type="put"), DigitalOption(market_env)]:
+
+        print(option)
+
+        start = time.time()
+        closed_form = option.risk(S=S_vector, t=t_range, np_output=False)
+        print("Closed-form metrics in {:.3f} seconds".format(time.time() - start))
+
+        for n_S, n_tau in [(200, 100), (400, 200), (800, 400)]:
+
+            pde = PDEPricer(option, n_S=n_S, n_tau=n_tau)
+
+            start = time.time()
+            surface = pde.surface(S=S_vector, t=t_range, np_output=False)
+            elapsed = time.time() - start
+
+            print("\nPDE grid {} x {} (in {:.3f} seconds), max abs error:".format(n_S, n_tau, elapsed))
+            for metrics in ["price", "delta", "gamma", "theta"]:
+                print("{}: {:.1E}".format(metrics, (surface[metrics] - closed_form[metrics]).abs().max().max()))
+
+    # price surface, as pd.DataFrame
+    print("\nPut price surface:\n{}".format(PDEPricer(PlainVanillaOption(market_env, option_type="put"))\
+                                           .price(S=S_vector[::25], t=t_range[::3], np_output=False)))
+
+    #
+    # portfolio: constituents are solved together
+    #
+
+    ptf = Portfolio(name="Bull spread and digital")
+    ptf.add_instrument(PlainVanillaOption(market_env, K=90.0, verbose=False), 1)
+    ptf.add_instrument(PlainVanillaOption(market_env, K=110.0, verbose=False), -1)
+    ptf.add_instrument(DigitalOption(market_env, option_type="put", K=80.0, T="30-06-2021", verbose=False), 5)
+    print(ptf)
+
+    surface = PDEPricer(ptf).surface(S=S_vector, t=t_range, np_output=False)
+    print("Max abs error of portfolio value: {:.1E}"\
+          .format((surface["price"] - ptf.price(S=S_vector, t=t_range, np_output=False)).abs().max().max()))
+    print("Max abs error of portfolio delta: {:.1E}"\
+          .format((surface["delta"] - ptf.delta(S=S_vector, t=t_range, np_output=False)).abs().max().max()))
+
+#----------------------------- usage example ---------------------------------#
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,83 @@
+"""
+Created by: Gabriele Pompa (gabriele.pompa@gmail.com)
+
+File: example_options_price_arrays.py
+
+Created on Tue Jul 14 2020 - Version: 1.0
+
+Description:
+
+This script shows usage of the raw-array (structure-of-arrays) pricing API
+of PlainVanillaOption and DigitalOption classes. A large batch of independent
+quotes, each with its own underlying level, strike, time-to-maturity,
+volatility, short-rate and type, is priced in a single vectorized call and
+compared with the standard .price() method.
+"""
+
+import numpy as np
+import time
+
+from market.market import MarketEnvironment
+from options.options import PlainVanillaOption, DigitalOption
+
+def random_quotes(n, seed=42):
+
+    # random number generator
+    rng = np.random.RandomState(seed)
+
+    return {"S": rng.uniform(50.0, 150.0, n),
+            "K": rng.uniform(50.0, 150.0, n),
+            "tau": rng.uniform(0.01, 2.0, n),
+            "sigma": rng.uniform(0.05, 0.5, n),
+            "r": rng.uniform(0.0, 0.05, n),
+            "is_call": rng.uniform(size=n) > 0.5}
+
+def main():
+
+    # a batch of one million independent quotes
+    n = 1000000
+    quotes = random_quotes(n)
+
+    #
+    # Plain-Vanilla options
+    #
+
+    start = time.time()
+    price = PlainVanillaOption.price_arrays(**quotes)
+    print("\nPlain-Vanilla: {} quotes priced in {:.3f} seconds".format(n, time.time() - start))
+
+    start = time.time()
+    risk = PlainVanillaOption.risk_arrays(**quotes)
+    print("Plain-Vanilla: {} quotes priced and risked in {:.3f} seconds".format(n, time.time() - start))
+    print("Average Delta: {:.4f}".format(risk["delta"].mean()))
+
+    #
+    # Digital options (cash-or-nothing), with a cash amount for each quote
+    #
+
+    Q = np.where(quotes["is_call"], 1.0, 2.0)
+
+    start = time.time()
+    price_digital = DigitalOption.price_arrays(Q=Q, **quotes)
+    print("\nDigital: {} quotes priced in {:.3f} seconds".format(n, time.time() - start))
+
+    #
+    # comparison with standard .price() method for a single quote
+    #
+
+    i = 0
+    market_env = MarketEnvironment(r=quotes["r"][i], S_t=quotes["S"][i], sigma=quotes["sigma"][i])
+    option_type = "call" if quotes["is_call"][i] else "put"
+
+    vanilla = PlainVanillaOption(market_env, option_type=option_type, K=quotes["K"][i])
+    vanilla_price = vanilla.price(tau=quotes["tau"][i])
+    print("\nPlain-Vanilla price: .price_arrays()={:.6f}; .price()={}".format(price[i], vanilla_price))
+
+    digital = DigitalOption(market_env, cash_amount=Q[i], option_type=option_type, K=quotes["K"][i])
+    digital_price = digital.price(tau=quotes["tau"][i])
+    print("Digital price: .price_arrays()={:.6f}; .price()={}".format(price_digital[i], digital_price))
+
+#----------------------------- usage example ---------------------------------#
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,82 @@
+"""
+Created by: Gabriele Pompa (gabriele.pompa@gmail.com)
+
+File: example_options_quasi_monte_carlo.py
+
+Created on Tue Jul 14 2020 - Version: 1.0
+
+Description:
+
+This script shows usage of randomized Quasi-Monte Carlo pricing with
+MonteCarloPricer class (sampler='sobol'): terminal values of the underlying
+are drawn from scrambled Sobol points. Errors (w.r.t. Black-Scholes price) and
+error estimates are compared with plain Monte Carlo, for the same number of
+paths. SobolSequence and BrownianBridge classes (building multi-step paths)
+are shown too.
+"""
+
+import numpy as np
+
+from market.market import MarketEnvironment
+from options.options import PlainVanillaOption, DigitalOption
+from utils.monte_carlo import MonteCarloPricer
+from utils.qmc import SobolSequence, BrownianBridge
+
+def main():
+
+    # default market environment
+    market_env = MarketEnvironment()
+    print(market_env)
+
+    #
+    # Sobol points and Brownian-bridge paths
+    #
+
+    sobol = SobolSequence(4, seed=42)
+    print("\nFirst 4 scrambled Sobol points in [0,1)^4:\n{}".format(sobol.points(0, 4)))
+
+    bridge = BrownianBridge(4)
+    W = bridge.transform(sobol.normals(0, 2**14))
+    print("\nBrownian-bridge paths: mean={}; variance={} (expected: 0 and [0.25, 0.5, 0.75, 1.0])"\
+          .format(W.mean(axis=0), W.var(axis=0)))
+
+    #
+    # Quasi-Monte Carlo Vs Monte Carlo pricing
+    #
+
+    # underlying values
+    S_vector = np.array([80.0, 90.0, 100.0, 110.0, 120.0])
+
+    # number of paths and independent runs
+    n_paths = 2**16
+    n_runs = 10
+
+    for option in [PlainVanillaOption(market_env, option_type="put"), DigitalOption(market_env)]:
+
+        print(option)
+
+        bs_price = option.price(S=S_vector)
+
+        for sampler in ["pseudo", "sobol"]:
+
+            errors = []
+            std_errors = []
+
+            # root-mean-square error over independent runs
+            for seed in range(n_runs):
+
+                mc = MonteCarloPricer(option, n_paths=n_paths, sampler=sampler,
+                                      control_variate=False, seed=seed)
+                estimate = mc.estimate(S=S_vector)
+
+                errors.append(estimate["price"] - bs_price)
+                std_errors.append(estimate["std_error"])
+
+            print("\nSampler '{}' ({} paths):".format(sampler, n_paths))
+            print("RMSE: {}".format(np.sqrt(np.mean(np.square(errors), axis=0))))
+            print("Average estimated std. error: {}".format(np.mean(std_errors, axis=0)))
+
+#----------------------------- usage example ---------------------------------#
+if __name__ == "__main__":
+
+    main()
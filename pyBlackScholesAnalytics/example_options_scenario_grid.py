@@ -0,0 +1,98 @@
+"""
+Created by: Gabriele Pompa (gabriele.pompa@gmail.com)
+
+File: example_options_scenario_grid.py
+
+Created on Tue Jul 14 2020 - Version: 1.0
+
+Description:
+
+This script shows usage of .grid() method of options and portfolios: price and
+greeks are computed on N-dimensional grids of scenarios spanned by any subset
+of underlying, strike-price, time, volatility and short-rate parameters, in a
+single broadcast kernel call. Results are compared with (much slower) loops of
+.price() calls.
+"""
+
+import numpy as np
+import pandas as pd
+import time
+
+from market.market import MarketEnvironment
+from options.options import PlainVanillaOption, DigitalOption
+from portfolio.portfolio import Portfolio
+
+def main():
+
+    # default market environment
+    market_env = MarketEnvironment()
+    print(market_env)
+
+    # scenario axes
+    S_vector = np.linspace(70.0, 130.0, 13)
+    sigma_vector = np.array([0.1, 0.15, 0.2, 0.25, 0.3])
+    r_vector = np.array([0.0, 0.01, 0.03, 0.05])
+    t_range = pd.date_range(start=market_env.get_t(), end="2020-12-01", periods=6)
+
+    #
+    # spot x volatility x short-rate x date cube
+    #
+
+    option = PlainVanillaOption(market_env, option_type="put")
+    print(option)
+
+    start = time.time()
+    cube = option.grid(S=S_vector, sigma=sigma_vector, r=r_vector, t=t_range)
+    print("Grid of prices of shape {} in {:.4f} seconds".format(cube["values"].shape, time.time() - start))
+
+    for name, values in cube["axes"]:
+        print("Axis '{}': {}".format(name, values))
+
+    # the same cube by Python loops
+    start = time.time()
+    cube_loop = np.array([[[option.price(S=S, sigma=sigma, r=r, t=t_range) for r in r_vector]
+                           for sigma in sigma_vector]
+                          for S in S_vector])
+    print("\nLoops of .price() calls in {:.4f} seconds".format(time.time() - start))
+    print("Max abs difference: {:.1E}".format(np.max(np.abs(cube["values"] - cube_loop))))
+
+    # a single scenario of the cube, on the last date
+    print("Price at S={}, sigma={}, r={}, t={}: {}"\
+          .format(S_vector[5], sigma_vector[2], r_vector[3], t_range[-1].date(), cube["values"][5, 2, 3, -1]))
+
+    #
+    # many metrics at once
+    #
+
+    option = DigitalOption(market_env)
+    print(option)
+
+    cube = option.grid(["price", "delta", "gamma", "vega", "vanna"], S=S_vector, sigma=sigma_vector, tau=[0.5, 0.25, 0.1])
+    for metrics in cube["values"]:
+        print("{}: shape {}, range [{:.4f}, {:.4f}]".format(metrics, cube["values"][metrics].shape,
+                                                          cube["values"][metrics].min(), cube["values"][metrics].max()))
+
+    # strike-price and underlying axes together
+    cube = option.grid(K=[90.0, 100.0, 110.0], S=S_vector)
+    print("\nStrike x underlying grid of axes {}:\n{}".format([name for name, values in cube["axes"]], cube["values"]))
+
+    #
+    # portfolio
+    #
+
+    ptf = Portfolio(name="Bull spread")
+    ptf.add_instrument(PlainVanillaOption(market_env, K=90.0, verbose=False), 1)
+    ptf.add_instrument(PlainVanillaOption(market_env, K=110.0, verbose=False), -1)
+    print(ptf)
+
+    cube = ptf.grid(["price", "delta"], S=S_vector, sigma=sigma_vector, r=r_vector, t=t_range)
+    print("Portfolio value and delta grids of shape {}".format(cube["values"]["price"].shape))
+    print("Max abs difference w.r.t. .price() at sigma={}, r={}: {:.1E}"\
+          .format(sigma_vector[0], r_vector[0],
+                  np.max(np.abs(cube["values"]["price"][:, 0, 0, :] -
+                                ptf.price(S=S_vector, sigma=sigma_vector[0], r=r_vector[0], t=t_range).T))))
+
+#----------------------------- usage example ---------------------------------#
+if __name__ == "__main__":
+
+    main()
@@ -88,6 +88,10 @@ def main():
     
     ptf = Portfolio()
     print(ptf)
+    
+    # an empty portfolio is worth nothing and has zero greeks
+    print("\nEmpty portfolio price and greeks:\n", ptf.risk(S=S_vector, t=t_range, np_output=np_output))
+    print("\nEmpty portfolio higher-order greeks:\n", ptf.higher_order_risk(S=S_vector, t=t_range, np_output=np_output))
         
     #
     # Step 1: adding 2 long plain-vanilla call contracts
@@ -27,11 +27,17 @@ class MarketEnvironment:
         S_t (float):              spot price of the underlying asset at the valuation date 't';
         sigma (float):            volatility of underlying asset;
     
+        version (int):            version of the market environment, increased by each setter call.
+    
     Public Methods:
     --------   
     
         getters and setters for all attributes
         
+        get_version: int
+            Returns the version of the market environment. Options and portfolios 
+            bound to the market environment (live_market=True) use it to detect updates.
+        
     Usage examples: 
     --------   
     
@@ -54,6 +60,9 @@ class MarketEnvironment:
         self.__S     = S_t
         self.__sigma = sigma
         
+        # version of the market environment
+        self.__version = 0
+        
     def __repr__(self):
         return r"MarketEnvironment(t={}, r={:.1f}%, S_t={:.1f}, sigma={:.1f}%)".\
                format(self.get_t().strftime("%d-%m-%Y"), self.get_r()*100, self.get_S(), self.get_sigma()*100)
@@ -70,16 +79,23 @@ class MarketEnvironment:
     
     def get_sigma(self):
         return self.__sigma
+
+    def get_version(self):
+        return self.__version
     
     # setters 
     def set_t(self, t):
         self.__t = date_string_to_datetime_obj(t)
+        self.__version += 1
 
     def set_r(self, r):
         self.__r = r
+        self.__version += 1
 
     def set_S(self, S):
         self.__S = S
+        self.__version += 1
         
     def set_sigma(self, sigma):
-        self.__sigma = sigma
\ No newline at end of file
+        self.__sigma = sigma
+        self.__version += 1
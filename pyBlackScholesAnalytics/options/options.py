@@ -21,8 +21,8 @@ import pandas as pd
 # for statistical functions
 from scipy import stats
 
-# for optimization routines
-import scipy.optimize as sc_opt
+# for the standard normal cdf (and its inverse), without the overhead of scipy.stats distributions
+from scipy.special import ndtr, ndtri
 
 # for some mathematical functions
 import math
@@ -36,6 +36,11 @@ import warnings
 # ----------------------- sub-modules imports ------------------------------- #
 
 from utils.utils import *
+from utils.cache import LRUCache, cached_metrics
+from utils.dates import DAY_COUNT_CONVENTIONS, year_fraction, add_year_fraction, sort_dates, to_datetime64
+from utils.labeled_array import LabeledArray
+from utils.numeric_routines import newton_safeguarded, least_squares_bounded, find_brackets, itp_bracketed, \
+                                   ROOT_CONVERGED, ROOT_MAX_ITER, ROOT_FAILED, ROOT_NOT_FOUND
 
 #-----------------------------------------------------------------------------#
 
@@ -48,6 +53,8 @@ class EuropeanOption:
     Attributes:
     -----------
         mkt_env (MarketEnvironment): Instance of MarketEnvironment class
+        live_market (bool):          Optional. If True, the option stays bound to mkt_env and its market 
+                                     attributes (S_t, t, r, sigma) follow mkt_env updates. Default: False;
         type (str):                  Optional. Type of the option. Can be either 'call' or 'put';
         S_t (float):                 'S' attribute of mkt_env.
         K (float):                   Optional. Strike price;
@@ -56,6 +63,13 @@ class EuropeanOption:
         tau (float):                 time to maturity in years, computed as tau=T-t by time_to_maturity() method
         r (float):                   'r' attribute of mkt_env.
         sigma (float):               'sigma' attribute of mkt_env.
+        verbose (bool):              Optional. If False, no initialization message is printed. Default: True.
+        day_count (str):             Optional. Day-count convention of time-to-maturity: 'ACT/365', 'ACT/360' 
+                                     or 'BUS/252' (business days). Default: 'ACT/365'.
+        holidays (Iterable):         Optional. Holiday dates, excluded from business days ('BUS/252' 
+                                     day-count convention only). Default: None.
+        emission_mkt (dict):         market conditions (S_t, t, tau, r, sigma) at emission of the option.
+        initial_price (float):       price of the option at emission. Computed on first access.
 
     Public Methods:
     --------
@@ -98,12 +112,35 @@ class EuropeanOption:
         rho: float
             Computes the Black-Scholes rho of the option.
 
+        risk: dict
+            Computes the Black-Scholes price and all the greeks of the option in a single pass.
+
+        vanna, volga, charm, speed, color: float
+            Computes the Black-Scholes higher-order greeks of the option.
+
+        higher_order_risk: dict
+            Computes all the higher-order greeks of the option in a single pass.
+
+        copy_with_terms: EuropeanOption
+            Returns a copy of the option with different contract terms, without parsing them.
+
+        process_grid_parameters: dict
+            Parses pricing parameters as axes of an N-dimensional grid of scenarios.
+
+        grid: dict
+            Computes price and/or greeks of the option on an N-dimensional grid of scenarios,
+            in a single broadcast kernel call.
+
+        enable_cache, disable_cache, get_cache_info, invalidate_cache
+            Opt-in memoization of payoff, price, PnL, greeks and risk methods.
+
     Template Methods:
     --------   
     
         getters for all common private attributes
         
-        setters for common private attributes, not belonging to mkt_env
+        setters for common private attributes, not belonging to mkt_env. 
+        Changing option terms first settles the initial price at emission.
         
         price_upper_limit: float 
             Template method for upper limit. Raises NotImplementedError if called.
@@ -118,18 +155,31 @@ class EuropeanOption:
         - example_options_other_params.py
         - example_options_IV.py
         - example_options_numeric_analytic_greeks_comparison.py
+        - example_options_higher_order_greeks.py
+        - example_options_scenario_grid.py
 
     """
 
-    def __init__(self, mkt_env, option_type='call', K=100.0, T="31-12-2020"):
+    def __init__(self, mkt_env, option_type='call', K=100.0, T="31-12-2020", live_market=False, verbose=True, 
+                 day_count="ACT/365", holidays=None):
         
-        print("Initializing the EuropeanOption!")
+        if verbose:
+            print("Initializing the EuropeanOption!")
 
         # option type check
         if option_type not in ['call', 'put']:
             raise NotImplementedError("Option Type: '{}' does not exist!".format(option_type))
         
+        # day-count convention check
+        if day_count not in DAY_COUNT_CONVENTIONS:
+            raise NotImplementedError("Day-count convention: '{}' does not exist!".format(day_count))
+        
+        # no market environment bound during initialization
+        self.__mkt_env = None
+        
         self.__type  = option_type
+        self.__day_count = day_count
+        self.__holidays  = holidays
         self.__S     = mkt_env.get_S()
         self.__K     = K
         self.__t     = mkt_env.get_t()
@@ -138,12 +188,25 @@ class EuropeanOption:
         self.__r     = mkt_env.get_r()
         self.__sigma = mkt_env.get_sigma()
         
-        # empty initial price of the option
+        # market conditions at emission, used to lazily compute the initial price
+        self.__emission_mkt = {"S": self.__S, "t": self.__t, "tau": self.__tau, "r": self.__r, "sigma": self.__sigma}
+
+        # empty initial price of the option (computed on first access)
         self.__initial_price = None
                
         # empty informations dictionary
         self.__docstring_dict = {}        
         
+        # results cache (disabled by default) and version of the option state
+        self.__cache = None
+        self.__state_version = 0
+        
+        # optional live binding to the market environment: market attributes 
+        # are re-synchronized whenever the market environment version changes
+        if live_market:
+            self.__mkt_env = mkt_env
+            self.__mkt_version = mkt_env.get_version()
+        
     # string representation method template
     def __repr__(self):
         raise NotImplementedError()
@@ -156,56 +219,146 @@ class EuropeanOption:
         return self.__type
 
     def get_S(self):
+        self.__sync_market()
         return self.__S
     
     def get_K(self):
         return self.__K
     
     def get_t(self):
+        self.__sync_market()
         return self.__t
 
     def get_T(self):
         return self.__T
 
+    def get_day_count(self):
+        return self.__day_count
+
+    def get_holidays(self):
+        return self.__holidays
+
     def get_tau(self):
+        self.__sync_market()
         return self.__tau
 
     def get_r(self):
+        self.__sync_market()
         return self.__r
     
     def get_sigma(self):
+        self.__sync_market()
         return self.__sigma
+
+    def get_mkt_env(self):
+        return self.__mkt_env
+        
+    def get_emission_mkt(self):
+        return self.__emission_mkt
         
     def get_initial_price(self):
-        return NotImplementedError()
+        """
+        Returns the price of the option at emission. It is computed on first 
+        access, using market conditions at emission.
+        """
+        if self.__initial_price is None:
+            self.__initial_price = self.price(S=self.__emission_mkt["S"],
+                                              tau=self.__emission_mkt["tau"],
+                                              sigma=self.__emission_mkt["sigma"],
+                                              r=self.__emission_mkt["r"])
+        return self.__initial_price
     
     # doctring getter template
     def get_docstring(self, label):
         raise NotImplementedError()
 
+    def get_cache(self):
+        return self.__cache
+    
+    def get_state_version(self):
+        self.__sync_market()
+        return self.__state_version
+
     #
     # setters
     #
     
+    def set_initial_price(self, initial_price):
+        self.__initial_price = initial_price
+
     def set_type(self, option_type):
+        # initial price refers to the option terms at emission
+        self.get_initial_price()
         self.__type = option_type
         
         # option type check
         if option_type not in ['call', 'put']:
             raise NotImplementedError("Option Type: '{}' does not exist!".format(option_type))
+
+        self.invalidate_cache()
             
     def set_K(self, K):
+        self.get_initial_price()
         self.__K = K
+        self.invalidate_cache()
     
     def set_T(self, T):
+        self.get_initial_price()
         self.__T = date_string_to_datetime_obj(T)
         # update time to maturity, given changed T, to keep internal consistency
         self.__update_tau() 
+        self.invalidate_cache()
     
     def set_tau(self, tau):
+        self.get_initial_price()
         self.__tau = tau
         # update expiration date, given changed tau, to keep internal consistency
         self.__update_T()
+        self.invalidate_cache()
+        
+    def set_day_count(self, day_count):
+        self.get_initial_price()
+        
+        # day-count convention check
+        if day_count not in DAY_COUNT_CONVENTIONS:
+            raise NotImplementedError("Day-count convention: '{}' does not exist!".format(day_count))
+
+        self.__day_count = day_count
+        # update time to maturity, given changed day-count convention
+        self.__update_tau()
+        self.invalidate_cache()
+
+    def set_holidays(self, holidays):
+        self.get_initial_price()
+        self.__holidays = holidays
+        # update time to maturity, given changed holidays calendar
+        self.__update_tau()
+        self.invalidate_cache()
+        
+    #
+    # results cache methods
+    #
+    
+    def enable_cache(self, max_entries=128, max_bytes=64*1024**2):
+        """
+        Enables memoization of pricing methods (payoff, price, PnL, greeks and risk) 
+        in a bounded LRU cache, keyed on the parameters in input. 
+        The cache is invalidated whenever the option is modified by a setter.
+        """
+        self.__cache = LRUCache(max_entries=max_entries, max_bytes=max_bytes)
+
+    def disable_cache(self):
+        self.__cache = None
+        
+    def get_cache_info(self):
+        """Returns hits, misses, number of entries and size in bytes of the cache (None if disabled)."""
+        return self.__cache.info() if self.__cache is not None else None
+    
+    def invalidate_cache(self):
+        """Marks the option state as changed and clears stored results."""
+        self.__state_version += 1
+        if self.__cache is not None:
+            self.__cache.clear()
         
     #
     # update methods (private)
@@ -215,7 +368,21 @@ class EuropeanOption:
         self.__tau = self.time_to_maturity()
 
     def __update_T(self):
-        self.__T = self.__t + dt.timedelta(days=math.ceil(self.__tau*365))
+        self.__T = add_year_fraction(self.get_t(), self.__tau, day_count=self.__day_count, holidays=self.__holidays)
+
+    def __sync_market(self):
+        """
+        Lazily re-synchronizes market attributes with the bound market environment 
+        (if any), whenever its version has changed. Stored results are invalidated.
+        """
+        if (self.__mkt_env is not None) and (self.__mkt_env.get_version() != self.__mkt_version):
+            self.__mkt_version = self.__mkt_env.get_version()
+            self.__S     = self.__mkt_env.get_S()
+            self.__t     = self.__mkt_env.get_t()
+            self.__r     = self.__mkt_env.get_r()
+            self.__sigma = self.__mkt_env.get_sigma()
+            self.__tau   = self.time_to_maturity()
+            self.invalidate_cache()
 
     #
     # utility methods
@@ -223,24 +390,81 @@ class EuropeanOption:
     
     def time_to_maturity(self, *args, **kwargs):
         """
-        Utility method to compute time-to-maturity
+        Utility method to compute time-to-maturity, under the day-count convention 
+        of the option (see year_fraction() function in dates.py). Valuation date(s) 
+        t are vectorized through their np.datetime64 representation.
         """
         
         # parsing optional parameters
         t = args[0] if len(args) > 0 else kwargs['t'] if 't' in kwargs else self.get_t()
         T = args[1] if len(args) > 1 else kwargs['T'] if 'T' in kwargs else self.get_T()
         
-        # convert to dt.datetime objects, if needed
-        t = date_string_to_datetime_obj(t)
-        T = date_string_to_datetime_obj(T)
-        
         # compute and return time to maturity (in years)
-        return homogenize((T-t).days / 365.0, sort=False)
+        return homogenize(year_fraction(t, T, day_count=self.__day_count, holidays=self.__holidays), sort=False)
+
+    def kernel_terms(self):
+        """
+        Utility method returning the contract terms, other than strike-price, 
+        taken by raw-array kernels (.price_arrays(), .vega_arrays(), .risk_arrays())
+        """
+        return {"is_call": self.get_type() == 'call'}
+
+    def copy_with_terms(self, option_type, K, T, tau):
+        """
+        Utility method returning a copy of the option with different contract terms, 
+        bypassing validation and parsing: option_type must be 'call' or 'put', T a 
+        dt.datetime object and tau the time-to-maturity of T at current valuation date. 
+        Market attributes (and binding) are those of the option. 
+        Used by bulk constructors, which validate and parse terms in a vectorized way.
+        """
+        
+        # shallow copy of the attributes
+        option = object.__new__(type(self))
+        option.__dict__.update(self.__dict__)
+        
+        option.__type = option_type
+        option.__K    = K
+        option.__T    = T
+        option.__tau  = tau
+        option.__emission_mkt = dict(self.__emission_mkt, tau=tau)
+        option.__initial_price = None
+        option.__cache = None
+        option.__state_version = 0
+        
+        return option
+
+    @staticmethod
+    def parse_bulk_terms(mkt_env, types, T):
+        """
+        Utility method validating option types and converting expiration dates 
+        of bulk constructors (see .from_arrays() methods) in a vectorized way: 
+        each distinct expiration date is parsed once (see to_datetime64() function) 
+        and times-to-maturity (ACT/365) at the valuation date of mkt_env are 
+        computed in a single pass.
+        
+        Returns expiration dates (as np.ndarray of dt.datetime objects) and 
+        times-to-maturity (as np.ndarray).
+        """
+        
+        # option types check
+        invalid_types = np.setdiff1d(types, ['call', 'put'])
+        if len(invalid_types) > 0:
+            raise NotImplementedError("Option Type: '{}' does not exist!".format(invalid_types[0]))
+        
+        T = to_datetime64(T)
+        tau = year_fraction(mkt_env.get_t(), T)
+        
+        return pd.DatetimeIndex(T).to_pydatetime(), tau
       
     def process_pricing_parameters(self, *args, **kwargs):
         """
         Utility method to parse underlying, strike-price, time, volatility and 
-        short-rate parameters
+        short-rate parameters.
+        
+        Parameters are returned coordinated as np.ndarrays, also if np_output=False. 
+        In this case, they are shaped as the pd.DataFrame output and its labels are 
+        returned under keys 'index' and 'columns' (None if np_output=True), to be 
+        attached to results only at the end of computations (see attach_labels()).
         """
         
         # 
@@ -273,6 +497,9 @@ class EuropeanOption:
         # squeeze output flag
         np_output = kwargs['np_output'] if 'np_output' in kwargs else True
 
+        # floating-point data-type (default: library-wide one, see set_float_dtype())
+        dtype = float_dtype(kwargs['dtype'] if 'dtype' in kwargs else None)
+
         #
         # Iterable parameters check
         #
@@ -399,7 +626,7 @@ class EuropeanOption:
         # case 3: valuation date in input, to be converted into time-to-maturity
         elif is_date(time_param):
             time_name = "t"
-            time_param = homogenize(time_param, sort_func=date_string_to_datetime_obj)
+            time_param = homogenize(sort_dates(time_param), sort=False)
             tau = self.time_to_maturity(t=time_param)
         # error case: the time parameter in input has a data-type that is not recognized
         else: 
@@ -433,21 +660,30 @@ class EuropeanOption:
         if np.any(r < 0):
             warnings.warn("Warning: r = {} < 0 value encountered".format(r))
 
+        #
+        # Casting parameters to the floating-point data-type, if any
+        #
+        
+        S, K, tau, sigma, r = [cast_to_float(p, dtype) for p in [S, K, tau, sigma, r]]
+
         #
         # Coordinate parameters
         #
         
+        # parameters are always coordinated as np.ndarrays (read-only views, see 
+        # coordinate_x_and_y_as_ndarray()). Labels of pd.DataFrame output, if any, 
+        # are computed here and attached to results only (see attach_labels())
+        scalar_params = {}
+        vector_params = {}
+        
         # Case 0: all scalar parameters
         #
         # make the 4 parameters coordinated together as 1-dim np.ndarray
-        # or pd.DataFrame
         if iterable_parameters == 0:
             
-            coord_params = coordinate(x=S, y=tau, 
-                                      x_name="S", y_name=time_name,
-                                      others_scalar={"K": K, "sigma": sigma, "r": r}, 
-                                      np_output=np_output, 
-                                      col_labels=S, ind_labels=time_param) 
+            coord_args = {"x": S, "y": tau, "x_name": "S", "y_name": time_name,
+                          "col_labels": S, "ind_labels": time_param}
+            scalar_params = {"K": K, "sigma": sigma, "r": r}
             
         # Case 1: S (or K) and/or tau iterable parameters
         #
@@ -458,9 +694,6 @@ class EuropeanOption:
         # be set to True)
         elif iterable_S_or_K or iterable_tau:
             
-            scalar_params = {}
-            vector_params = {}
-            
             # x-axis default setup            
             x=S
             x_name="S"
@@ -496,12 +729,8 @@ class EuropeanOption:
                 del scalar_params["K"]
                 scalar_params["S"] = S
 
-            coord_params = coordinate(x=x, y=tau, 
-                                      x_name=x_name, y_name=time_name,
-                                      others_scalar=scalar_params, 
-                                      others_vector=vector_params,
-                                      np_output=np_output, 
-                                      col_labels=x_col, ind_labels=time_param)   
+            coord_args = {"x": x, "y": tau, "x_name": x_name, "y_name": time_name,
+                          "col_labels": x_col, "ind_labels": time_param}
                         
         # Case 2: sigma and/or r are iterable 1-dim vectors 
         #         and S, K and tau are both scalar
@@ -509,36 +738,43 @@ class EuropeanOption:
             
             # case 2.1: sigma and r are iterable 1-dim vectors
             #
-            # make sigma and r coordinated np.ndarray or pd.DataFrames
+            # make sigma and r coordinated np.ndarray
             # creating a (sigma, r) grid and S, K and tau coordinated accordingly
             if iterable_sigma and iterable_r:
-                coord_params = coordinate(x=sigma, y=r, 
-                                          x_name="sigma", y_name="r",
-                                          others_scalar={"S": S, "K": K, time_name: tau}, 
-                                          np_output=np_output, 
-                                          col_labels=sigma, ind_labels=r)   
+                coord_args = {"x": sigma, "y": r, "x_name": "sigma", "y_name": "r",
+                              "col_labels": sigma, "ind_labels": r}
+                scalar_params = {"S": S, "K": K, time_name: tau}
 
             # case 2.2: sigma is a 1-dim vector and r is scalar
             #
-            # make sigma and tau coordinated np.ndarray or pd.DataFrames
+            # make sigma and tau coordinated np.ndarray
             # and S, K and r coordinated accordingly
             elif iterable_sigma:
-                coord_params = coordinate(x=sigma, y=tau, 
-                                          x_name="sigma", y_name=time_name,
-                                          others_scalar={"S": S, "K": K, "r": r}, 
-                                          np_output=np_output, 
-                                          col_labels=sigma, ind_labels=time_param)   
+                coord_args = {"x": sigma, "y": tau, "x_name": "sigma", "y_name": time_name,
+                              "col_labels": sigma, "ind_labels": time_param}
+                scalar_params = {"S": S, "K": K, "r": r}
 
             # case 2.3: r is a 1-dim vector and sigma is scalar
             #
-            # make r and tau coordinated np.ndarray or pd.DataFrames
+            # make r and tau coordinated np.ndarray
             # and S, K and sigma coordinated accordingly
             elif iterable_r:
-                coord_params = coordinate(x=r, y=tau, 
-                                          x_name="r", y_name=time_name,
-                                          others_scalar={"S": S, "K": K, "sigma": sigma}, 
-                                          np_output=np_output, 
-                                          col_labels=r, ind_labels=time_param)
+                coord_args = {"x": r, "y": tau, "x_name": "r", "y_name": time_name,
+                              "col_labels": r, "ind_labels": time_param}
+                scalar_params = {"S": S, "K": K, "sigma": sigma}
+
+        coord_params = coordinate(**coord_args, 
+                                  others_scalar=scalar_params, 
+                                  others_vector=vector_params,
+                                  np_output=True)
+        
+        # labels of pd.DataFrame output: parameters are reshaped (as views) 
+        # to (len(index), len(columns)) shape
+        if np_output:
+            index, columns = None, None
+        else:
+            index, columns = coordinate_labels(**coord_args)
+            coord_params = {p: coord_params[p].reshape((len(index), len(columns))) for p in coord_params}
 
         # return coordinated parameters
         return {"S": coord_params["S"], 
@@ -546,7 +782,73 @@ class EuropeanOption:
                 "tau": coord_params[time_name], 
                 "sigma": coord_params["sigma"], 
                 "r": coord_params["r"], 
-                "np_output": np_output}
+                "np_output": np_output,
+                "index": index,
+                "columns": columns}
+
+    def process_grid_parameters(self, **kwargs):
+        """
+        Utility method to parse underlying, strike-price, time, volatility and 
+        short-rate parameters as axes of an N-dimensional grid of scenarios.
+        
+        Each Iterable parameter spans an axis of the grid, in the order in which 
+        parameters are given in input (e.g. S=..., sigma=..., r=..., t=... gives 
+        a spot x volatility x short-rate x date grid). Scalar parameters are 
+        common to all the scenarios and missing parameters are taken from the option. 
+        Time parameter can be either 't' (valuation dates) or 'tau' (times-to-maturity). 
+        Values of each axis are used as given (not sorted).
+        
+        Parameters are returned as np.ndarrays with one (possibly unit-length) 
+        dimension per axis, to be broadcast together, and the axes as a list of 
+        (name, values) pairs.
+        """
+        
+        # floating-point data-type (default: library-wide one, see set_float_dtype())
+        dtype = float_dtype(kwargs['dtype'] if 'dtype' in kwargs else None)
+        
+        if 't' in kwargs and 'tau' in kwargs:
+            raise NotImplementedError("Just one between 't' and 'tau' parameters allowed. Both given in input:\nt={}\ntau={}"\
+                                      .format(kwargs['t'], kwargs['tau']))
+        
+        # grid parameters, in input order
+        names = [name for name in kwargs if name in ["S", "K", "t", "tau", "sigma", "r"]]
+        
+        # axes: Iterable parameters, in input order
+        axes = [(name, np.asarray(homogenize(kwargs[name], sort=False))) for name in names 
+                if is_iterable_not_string(kwargs[name])]
+        for name, values in axes:
+            test_dim(values, dim=1)
+        
+        n_axes = len(axes)
+        axes_names = [name for name, values in axes]
+        
+        # default values
+        values = {"S": self.get_S(), "K": self.get_K(), "t": self.get_t(), "sigma": self.get_sigma(), "r": self.get_r()}
+        values.update({name: kwargs[name] for name in names})
+
+        # valuation dates are converted into times-to-maturity
+        if 'tau' not in values:
+            values["tau"] = self.time_to_maturity(t=date_string_to_datetime_obj(values["t"]))
+            if 't' in axes_names:
+                axes_names[axes_names.index('t')] = "tau"
+        
+        grid_params = {}
+        
+        for name in ["S", "K", "tau", "sigma", "r"]:
+            
+            p = cast_to_float(np.asarray(values[name], dtype=float), dtype)
+            
+            # axis parameter: its values along its own dimension
+            if name in axes_names:
+                shape = [1] * n_axes
+                shape[axes_names.index(name)] = p.size
+                p = p.reshape(shape)
+                
+            grid_params[name] = p
+            
+        grid_params["axes"] = axes
+        
+        return grid_params
 
     def d1_and_d2(self, *args, **kwargs):
         """
@@ -582,6 +884,7 @@ class EuropeanOption:
     # Public methods
     # 
 
+    @cached_metrics
     def payoff(self, *args, **kwargs):
         """
         Calculates and returns the payoff of the option.
@@ -619,11 +922,15 @@ class EuropeanOption:
                 
         # call case
         if self.get_type() == 'call':
-            return self.call_payoff(S=S, K=K)
+            payoff = self.call_payoff(S=S, K=K)
         # put case
         else:
-            return self.put_payoff(S=S, K=K)
+            payoff = self.put_payoff(S=S, K=K)
+            
+        # labelling output as pd.DataFrame, if necessary
+        return attach_labels(payoff, param_dict["index"], param_dict["columns"])
                 
+    @cached_metrics
     def price(self, *args, **kwargs):
         """
         Calculates and returns the price of the option. 
@@ -711,22 +1018,16 @@ class EuropeanOption:
         tau = param_dict["tau"]
         sigma = param_dict["sigma"]
         r = param_dict["r"]
-        np_output = param_dict["np_output"]
         
         #
         # for tau==0 output the payoff, otherwise price
         #
         
-        if np_output:
-            # initialize an empty structure to hold prices
-            price = np.empty_like(S, dtype=float)
-            # filter positive times-to-maturity
-            tau_pos = tau > 0
-        else:
-            # initialize an empty structure to hold prices
-            price = pd.DataFrame(index=S.index, columns=S.columns)
-            # filter positive times-to-maturity
-            tau_pos = tau.iloc[:,0] > 0
+        # initialize an empty structure to hold prices
+        price = np.empty_like(S, dtype=np.result_type(S, 1.0))
+        
+        # filter positive times-to-maturity
+        tau_pos = tau > 0
         
         # call case
         if self.get_type() == 'call':
@@ -741,8 +1042,10 @@ class EuropeanOption:
             # tau == 0 case
             price[~tau_pos] = self.put_payoff(S=S[~tau_pos], K=K[~tau_pos])  
             
-        return price
+        # labelling output as pd.DataFrame, if necessary
+        return attach_labels(price, param_dict["index"], param_dict["columns"])
 
+    @cached_metrics
     def PnL(self, *args, **kwargs):
         """
         Calculates and returns the P&L generated owning an option.
@@ -773,7 +1076,8 @@ class EuropeanOption:
         return self.price(*args, **kwargs) - scalarize(self.get_initial_price())
   
     def implied_volatility(self, *args, iv_estimated=0.25, epsilon=1e-8, 
-                           minimization_method="Newton", max_iter = 100, **kwargs):
+                           minimization_method="Newton", max_iter = 100, full_output=False, 
+                           initial_guess="constant", verbose=False, **kwargs):
         """
         Calculates and returns the Black-Scholes Implied Volatility of the option.
         
@@ -782,24 +1086,57 @@ class EuropeanOption:
             - example_options_other_params.py
             - example_options_IV.py
             
-        Implements two minimization routines:
+        Implements three minimization routines:
             
-            - Newton (unconstrained) method;
-            - Least-Squares constrained method. 
+            - Newton method: convergence is tracked element by element and only 
+              still-active elements are re-evaluated. Where vega vanishes and the 
+              solution is bracketed by iv_bounds, a bisection step is taken;
+            - Least-Squares constrained method: since each point depends on its own 
+              implied volatility only, the problem is solved as a batch of bounded 
+              1-D problems. Where no exact solution exists within iv_bounds 
+              (e.g. target price out of no-arbitrage limits, or above the maximum 
+              price of a digital option) the volatility with minimum squared residual 
+              is returned, searched among bounds and price extrema (Vega = 0) and 
+              flagged as ROOT_NOT_FOUND. The former 'cost_tolerance' and 'sol_tolerance' 
+              parameters are deprecated and ignored: epsilon is used instead;
+            - Bracketing method: the solution is first bracketed scanning iv_bounds on a 
+              log-scale grid (refined around the node closest to the target, where no 
+              sign change is found) and then refined with a vectorized ITP bracketing routine. 
+              It converges in a guaranteed number of iterations and it does not require 
+              Vega, so it is robust where Vega vanishes or changes sign (e.g. digital options, 
+              deep wings). Where more than one solution exists (e.g. digital options) the 
+              lowest one is returned. Here epsilon is the absolute tolerance on 
+              implied volatility and initial guesses are not used.
             
         Can be called with the same signature of the .price() public method 
         with additional optional parameters:
             
             - iv_estimated: an initial guess for implied volatility;
+            - initial_guess: "constant" (default) to start from iv_estimated, or 
+              a closed-form approximation method of .iv_guess_arrays() (e.g. "corrado_miller" 
+              or "stefanica_radoicic" for plain-vanilla, "analytic" for digital options),
+              falling back to iv_estimated where the approximation is not defined;
             - target_price: target price to use for implied volatility calculation;
             - epsilon: minimization stopping threshold;
             - minimization_method: minimization methot to use;
-            - max_iter: maximum number of iterations.
+            - max_iter: maximum number of iterations;
+            - iv_bounds: (lower, upper) bounds for implied volatility. Default: (1e-6, 10.0);
+            - full_output: if True, returns also a dictionary with keys 'iterations' 
+              and 'status' (see utils.numeric_routines: ROOT_CONVERGED, ROOT_MAX_ITER, 
+              ROOT_FAILED and ROOT_NOT_FOUND flags) of each point, shaped as the implied volatility;
+            - verbose: if True, a summary of convergence is printed. Default: False.
         """
         
         # preliminary consistency check
         if ('sigma_axis' in kwargs) and (kwargs['sigma_axis'] == True):
             raise NotImplementedError(".implied_volatility() method not implemented for x-axis spanned by 'sigma' parameter.")
+        
+        # deprecated scipy.optimize.least_squares tolerances
+        for tolerance in ["cost_tolerance", "sol_tolerance"]:
+            if tolerance in kwargs:
+                kwargs.pop(tolerance)
+                warnings.warn("'{}' parameter is deprecated and ignored: use 'epsilon' instead".format(tolerance), 
+                              DeprecationWarning)
                             
         # target price
         target_price = kwargs["target_price"] if "target_price" in kwargs else self.price(*args, **kwargs)
@@ -820,96 +1157,96 @@ class EuropeanOption:
         # delete "sigma" from kwargs if it exists
         kwargs.pop("sigma", None)
         
-        if minimization_method == "Newton":
-            
-            # initial guess for implied volatility: iv_{n} and iv_{n+1}
-            # iv_{n+1} will be iteratively updated
-            iv_n = coordinate_y_with_x(x=target_price, y=iv_estimated, np_output=True)
-            iv_np1 = coordinate_y_with_x(x=target_price, y=iv_estimated, np_output=True)
-            
-            # stopping criterion: 
-            #
-            # - SRSR > epsilon threshold or 
-            # - maximum iterations exceeded
-            # 
-            # where: SRSR is the Sum of Relative Squared Residuals between
-            # n-th and (n+1)-th iteration solutions, defined as: 
-            #
-            # SRSR = \Sum_{i} ((x_{n+1} - x_{n})/x_{n})**2 (NaN excluded)
-            
-            # SRSR is initialized at value greater than epsilon by construction
-            SRSR = epsilon + 1
+        # underlying value, strike-price, time-to-maturity and short-rate 
+        # of each target price, as flat np.ndarrays
+        param_dict = self.process_pricing_parameters(*args, **kwargs)
+        S, K, tau, r = [x.ravel() for x in np.broadcast_arrays(param_dict["S"], param_dict["K"], 
+                                                               param_dict["tau"], param_dict["r"])]
+        target = np.asarray(target_price, dtype=float).ravel()
+        
+        # contract terms (type and, for digitals, cash amount)
+        terms = self.kernel_terms()
+        
+        # initial guess for implied volatility
+        iv0 = np.broadcast_to(np.asarray(iv_estimated, dtype=float), output_shape).ravel()
+        if initial_guess != "constant":
+            iv_guess = self.iv_guess_arrays(price=target, S=S, K=K, tau=tau, r=r, method=initial_guess, **terms)
+            iv0 = np.where(np.isfinite(iv_guess) & (iv_guess > 0), iv_guess, iv0)
+        
+        # function to minimize and its derivative w.r.t. to sigma (that is, Vega), 
+        # evaluated only at the still-active elements of position index
+        def f_and_vega(iv, index):
+            f = self.price_arrays(S=S[index], K=K[index], tau=tau[index], sigma=iv, r=r[index], **terms) - target[index]
+            df_div = self.vega_arrays(S=S[index], K=K[index], tau=tau[index], sigma=iv, r=r[index], **terms)
+            return f, df_div
+        
+        # positivity bounds: iv_lower <= iv <= iv_upper
+        iv_bounds = kwargs["iv_bounds"] if "iv_bounds" in kwargs else (1e-6, 10.0)
             
-            # iterations counter initialized at 1
-            iter_num = 1
+        # Stopping criterion for each element: 
+        #
+        # - RSR > epsilon threshold or 
+        # - maximum iterations exceeded
+        # 
+        # where: RSR is the Relative Squared Residual between n-th and 
+        # (n+1)-th iteration solutions, defined as: 
+        #
+        # RSR = ((x_{n+1} - x_{n})/x_{n})**2
+        
+        if minimization_method == "Newton":
             
-            while (SRSR > epsilon) and (iter_num <= max_iter):
-                
-                # update last solution found
-                iv_n = iv_np1
-                
-                # function to minimize at last solution found
-                f_iv_n = self.price(*args, sigma=iv_n, **kwargs) - target_price
-
-                # derivative w.r.t. to sigma (that is, Vega) at last solution found
-                df_div_n = self.vega(*args, sigma=iv_n, factor=1.0, **kwargs)
-                
-                # new solution found
-                iv_np1 = iv_n - f_iv_n/df_div_n
-
-                # calculation of new value for stopping metrics
-                SRSR = np.nansum(((iv_np1 - iv_n)/iv_n)**2)
-
-                # iteration counter update
-                iter_num += 1
-                
-            print("\nTermination value for Sum of Relative Squared Residuals \
-                  \nbetween n-th and (n+1)-th iteration solutions metric \
-                  \n(NaN excluded): {:.1E} (eps = {:.1E}). Iterations: {} \n"\
-                  .format(SRSR, epsilon, iter_num))
+            # per-element Newton method, with bisection fallback where the 
+            # root is bracketed by iv_bounds and Vega vanishes. 
+            iv_np1, iterations, status = newton_safeguarded(fun=f_and_vega, x0=iv0, 
+                                                            lower=iv_bounds[0], upper=iv_bounds[1], 
+                                                            epsilon=epsilon, max_iter=max_iter)
         
         elif minimization_method == "Least-Squares":
-            #
-            # See documentation for scipt.optmize.least_squares function
-            #
-            # at: https://docs.scipy.org/doc/scipy/reference/generated/scipy.optimize.least_squares.html#scipy.optimize.least_squares
-            #
-            
-            # minimization function (function of implied volatility only)
-            f = lambda iv: (self.price(*args, sigma=iv, **kwargs) - target_price).flatten() 
-            
-            # initial implied volatility guess
-            iv0 = np.repeat(iv_estimated, repeats=target_price.size)
-            
-            # positivity bounds: iv > 0
-            iv_bounds = (0.0, np.inf)
-            
-            # minimization method: Trust-Region-Reflective algorithm
-            min_method='trf'
             
-            # tolerance for termination by the change of the cost function
-            cost_tolerance = kwargs["cost_tolerance"] if "cost_tolerance" in kwargs else 1e-12
+            # each point depends on its own implied volatility only: the N-dimensional 
+            # problem is separable and it is solved as N bounded 1-D problems in 
+            # a batch (no NxN Jacobian matrix involved). Where no exact solution 
+            # exists within iv_bounds, the minimum squared residual is searched 
+            # among bounds and price extrema (Vega = 0). 
+            iv_np1, iterations, status = least_squares_bounded(fun=f_and_vega, x0=iv0, 
+                                                               lower=iv_bounds[0], upper=iv_bounds[1], 
+                                                               epsilon=epsilon, max_iter=max_iter)
+        
+        elif minimization_method == "Bracketing":
             
-            # tolerance for termination by the change of the solution found
-            sol_tolerance = kwargs["sol_tolerance"] if "sol_tolerance" in kwargs else 1e-12
+            # function to solve only (no derivative needed)
+            def f(iv, index):
+                return self.price_arrays(S=S[index], K=K[index], tau=tau[index], sigma=iv, r=r[index], **terms) - target[index]
             
-            # optimization
-            res = sc_opt.least_squares(fun=f, x0=iv0, bounds=iv_bounds, method=min_method,
-                                ftol=cost_tolerance, xtol=sol_tolerance)
-            
-            # output message
-            print("\nTermination message: " + res.message + " Success? {}".format(res.success))
-            
-            # optimal iv found
-            iv_np1 = res.x
+            # per-element brackets, then ITP refinement in a guaranteed number of iterations
+            iv_lower, iv_upper = np.full(target.size, iv_bounds[0], dtype=float), np.full(target.size, iv_bounds[1], dtype=float)
+            iv_a, iv_b = find_brackets(fun=f, lower=iv_lower, upper=iv_upper, num=16, log_scale=True)
+            iv_np1, iterations, status = itp_bracketed(fun=f, a=iv_a, b=iv_b, epsilon=epsilon)
+        
+        else:
+            raise NotImplementedError("Minimization method: '{}' does not exist!".format(minimization_method))
+        
+        if verbose:
+            print("\n{} method: {} converged, {} exceeding max_iter={}, {} without solution within iv_bounds \
+                  \nand {} failed (NaN) out of {} points (eps = {:.1E}). Max iterations: {} \n"\
+                  .format(minimization_method, np.sum(status == ROOT_CONVERGED), np.sum(status == ROOT_MAX_ITER), max_iter,
+                          np.sum(status == ROOT_NOT_FOUND), np.sum(status == ROOT_FAILED), status.size, epsilon, 
+                          iterations.max() if iterations.size > 0 else 0))
               
         # output reshape and cast as pd.DataFrame, if needed
         iv_np1 = iv_np1.reshape(output_shape)
         if not np_output:
             iv_np1 = pd.DataFrame(data=iv_np1, index=ind_output, columns=col_output)
 
+        if full_output:
+            info = {"iterations": iterations.reshape(output_shape), "status": status.reshape(output_shape)}
+            if not np_output:
+                info = {k: pd.DataFrame(data=info[k], index=ind_output, columns=col_output) for k in info}
+            return iv_np1, info
+
         return iv_np1
 
+    @cached_metrics
     def delta(self, *args, **kwargs):
         """
         Calculates and returns the Gamma of the option.
@@ -934,11 +1271,15 @@ class EuropeanOption:
                 
         # call case
         if self.get_type() == 'call':
-            return self.call_delta(S=S, K=K, tau=tau, sigma=sigma, r=r)
+            delta = self.call_delta(S=S, K=K, tau=tau, sigma=sigma, r=r)
         # put case
         else:
-            return self.put_delta(S=S, K=K, tau=tau, sigma=sigma, r=r)
+            delta = self.put_delta(S=S, K=K, tau=tau, sigma=sigma, r=r)
+
+        # labelling output as pd.DataFrame, if necessary
+        return attach_labels(delta, param_dict["index"], param_dict["columns"])
 
+    @cached_metrics
     def theta(self, *args, **kwargs):
         """
         Calculates and returns the Theta of the option. 
@@ -969,11 +1310,15 @@ class EuropeanOption:
                 
         # call case
         if self.get_type() == 'call':
-            return self.call_theta(S=S, K=K, tau=tau, sigma=sigma, r=r) * rescaling_factor
+            theta = self.call_theta(S=S, K=K, tau=tau, sigma=sigma, r=r) * rescaling_factor
         # put case
         else:
-            return self.put_theta(S=S, K=K, tau=tau, sigma=sigma, r=r) * rescaling_factor
+            theta = self.put_theta(S=S, K=K, tau=tau, sigma=sigma, r=r) * rescaling_factor
+
+        # labelling output as pd.DataFrame, if necessary
+        return attach_labels(theta, param_dict["index"], param_dict["columns"])
 
+    @cached_metrics
     def gamma(self, *args, **kwargs):
         """
         Calculates and returns the Gamma of the option. 
@@ -998,11 +1343,15 @@ class EuropeanOption:
                 
         # call case
         if self.get_type() == 'call':
-            return self.call_gamma(S=S, K=K, tau=tau, sigma=sigma, r=r)
+            gamma = self.call_gamma(S=S, K=K, tau=tau, sigma=sigma, r=r)
         # put case
         else:
-            return self.put_gamma(S=S, K=K, tau=tau, sigma=sigma, r=r)
+            gamma = self.put_gamma(S=S, K=K, tau=tau, sigma=sigma, r=r)
+
+        # labelling output as pd.DataFrame, if necessary
+        return attach_labels(gamma, param_dict["index"], param_dict["columns"])
           
+    @cached_metrics
     def vega(self, *args, **kwargs):
         """
         Calculates and returns the Vega of the option. 
@@ -1033,11 +1382,15 @@ class EuropeanOption:
 
         # call case
         if self.get_type() == 'call':
-            return self.call_vega(S=S, K=K, tau=tau, sigma=sigma, r=r) * rescaling_factor
+            vega = self.call_vega(S=S, K=K, tau=tau, sigma=sigma, r=r) * rescaling_factor
         # put case
         else:
-            return self.put_vega(S=S, K=K, tau=tau, sigma=sigma, r=r) * rescaling_factor
+            vega = self.put_vega(S=S, K=K, tau=tau, sigma=sigma, r=r) * rescaling_factor
+
+        # labelling output as pd.DataFrame, if necessary
+        return attach_labels(vega, param_dict["index"], param_dict["columns"])
 
+    @cached_metrics
     def rho(self, *args, **kwargs):
         """
         Calculates and returns the Rho of the option. 
@@ -1068,10 +1421,272 @@ class EuropeanOption:
 
         # call case
         if self.get_type() == 'call':
-            return self.call_rho(S=S, K=K, tau=tau, sigma=sigma, r=r) * rescaling_factor
+            rho = self.call_rho(S=S, K=K, tau=tau, sigma=sigma, r=r) * rescaling_factor
+        # put case
+        else:
+            rho = self.put_rho(S=S, K=K, tau=tau, sigma=sigma, r=r) * rescaling_factor
+
+        # labelling output as pd.DataFrame, if necessary
+        return attach_labels(rho, param_dict["index"], param_dict["columns"])
+
+    @cached_metrics
+    def risk(self, *args, **kwargs):
+        """
+        Calculates and returns the price and all the greeks (Delta, Theta, Gamma, 
+        Vega and Rho) of the option in a single pass. Pricing parameters are 
+        processed only once and the intermediate terms shared by price and greeks 
+        (d1, d2, normal cdf/pdf and discount factor) are computed only once too.
+        
+        Usage example: 
+            - example_options.py
+            
+        Can be called with the same signature of the .price() public method.
+
+        Optionally, theta, vega and rho can be rescaled using the "theta_factor", 
+        "vega_factor" and "rho_factor" keyboard parameters, respectively. 
+        Default rescaling is the same of .theta(), .vega() and .rho() methods.
+        
+        Returns a dictionary with keys 'price', 'delta', 'theta', 'gamma', 'vega' 
+        and 'rho', each value being equal to the output of the corresponding method.
+        """
+                       
+        # process input parameters
+        param_dict = self.process_pricing_parameters(*args, **kwargs)
+
+        # underlying value, strike-price, time-to-maturity volatility and short-rate
+        S = param_dict["S"]
+        K = param_dict["K"]
+        tau = param_dict["tau"]
+        sigma = param_dict["sigma"]
+        r = param_dict["r"]
+        
+        # rescaling factors
+        theta_factor = kwargs["theta_factor"] if "theta_factor" in kwargs else 1.0/365.0
+        vega_factor = kwargs["vega_factor"] if "vega_factor" in kwargs else 0.01
+        rho_factor = kwargs["rho_factor"] if "rho_factor" in kwargs else 0.01
+
+        # call case
+        if self.get_type() == 'call':
+            risk_dict = self.call_risk(S=S, K=K, tau=tau, sigma=sigma, r=r)
+            payoff = self.call_payoff(S=S, K=K)
+        # put case
+        else:
+            risk_dict = self.put_risk(S=S, K=K, tau=tau, sigma=sigma, r=r)
+            payoff = self.put_payoff(S=S, K=K)
+            
+        # for tau==0 output the payoff, otherwise price
+        risk_dict["price"] = np.where(tau > 0, risk_dict["price"], payoff)
+
+        # rescaling
+        risk_dict["theta"] = risk_dict["theta"] * theta_factor
+        risk_dict["vega"] = risk_dict["vega"] * vega_factor
+        risk_dict["rho"] = risk_dict["rho"] * rho_factor
+        
+        # labelling output as pd.DataFrame, if necessary
+        return attach_labels(risk_dict, param_dict["index"], param_dict["columns"])
+
+    def __higher_order_greek(self, greek, *args, **kwargs):
+        """
+        Private method returning a single higher-order greek from .higher_order_risk(),
+        forwarding the optional "factor" keyboard parameter as "<greek>_factor".
+        """
+        
+        if "factor" in kwargs:
+            kwargs = dict(kwargs)
+            kwargs[greek + "_factor"] = kwargs.pop("factor")
+            
+        return self.higher_order_risk(*args, **kwargs)[greek]
+
+    @cached_metrics
+    def vanna(self, *args, **kwargs):
+        """
+        Calculates and returns the Vanna (d^2V/dSdsigma) of the option. 
+        
+        Usage example: 
+            - example_options_higher_order_greeks.py
+            
+        Can be called with the same signature of the .price() public method.
+
+        Optionally, the vanna can be rescaled using the "factor" keyboard parameter. 
+        By default it is the variation of Delta for a +1% variation of sigma (not +100%).
+        """
+        return self.__higher_order_greek("vanna", *args, **kwargs)
+
+    @cached_metrics
+    def volga(self, *args, **kwargs):
+        """
+        Calculates and returns the Volga (d^2V/dsigma^2) of the option. 
+        
+        Usage example: 
+            - example_options_higher_order_greeks.py
+            
+        Can be called with the same signature of the .price() public method.
+
+        Optionally, the volga can be rescaled using the "factor" keyboard parameter. 
+        By default it is the variation of Vega (per +1% of sigma) for a +1% variation of sigma.
+        """
+        return self.__higher_order_greek("volga", *args, **kwargs)
+
+    @cached_metrics
+    def charm(self, *args, **kwargs):
+        """
+        Calculates and returns the Charm (dDelta/dt = -d^2V/dSdtau) of the option. 
+        
+        Usage example: 
+            - example_options_higher_order_greeks.py
+            
+        Can be called with the same signature of the .price() public method.
+
+        Optionally, the charm can be rescaled using the "factor" keyboard parameter. 
+        By default it is scaled to consider +1 calendar day (not +1 year).
+        """
+        return self.__higher_order_greek("charm", *args, **kwargs)
+
+    @cached_metrics
+    def speed(self, *args, **kwargs):
+        """
+        Calculates and returns the Speed (d^3V/dS^3) of the option. 
+        
+        Usage example: 
+            - example_options_higher_order_greeks.py
+            
+        Can be called with the same signature of the .price() public method.
+
+        Optionally, the speed can be rescaled using the "factor" keyboard parameter. 
+        By default it is not rescaled.
+        """
+        return self.__higher_order_greek("speed", *args, **kwargs)
+
+    @cached_metrics
+    def color(self, *args, **kwargs):
+        """
+        Calculates and returns the Color (dGamma/dt = -d^3V/dS^2dtau) of the option. 
+        
+        Usage example: 
+            - example_options_higher_order_greeks.py
+            
+        Can be called with the same signature of the .price() public method.
+
+        Optionally, the color can be rescaled using the "factor" keyboard parameter. 
+        By default it is scaled to consider +1 calendar day (not +1 year).
+        """
+        return self.__higher_order_greek("color", *args, **kwargs)
+
+    @cached_metrics
+    def higher_order_risk(self, *args, **kwargs):
+        """
+        Calculates and returns the higher-order greeks (Vanna, Volga, Charm, Speed
+        and Color) of the option in a single pass. Pricing parameters are 
+        processed only once and the intermediate terms shared by the greeks 
+        (d1, d2, normal pdf and their derivatives) are computed only once too.
+        
+        Usage example: 
+            - example_options_higher_order_greeks.py
+            
+        Can be called with the same signature of the .price() public method.
+
+        Optionally, greeks can be rescaled using the "vanna_factor", "volga_factor", 
+        "charm_factor", "speed_factor" and "color_factor" keyboard parameters, respectively. 
+        Default rescaling is the same of .vanna(), .volga(), .charm(), .speed() and .color() methods.
+        
+        Returns a dictionary with keys 'vanna', 'volga', 'charm', 'speed' and 'color', 
+        each value being equal to the output of the corresponding method.
+        """
+                       
+        # process input parameters
+        param_dict = self.process_pricing_parameters(*args, **kwargs)
+
+        # underlying value, strike-price, time-to-maturity volatility and short-rate
+        S = param_dict["S"]
+        K = param_dict["K"]
+        tau = param_dict["tau"]
+        sigma = param_dict["sigma"]
+        r = param_dict["r"]
+        
+        # rescaling factors
+        factors = {"vanna": kwargs["vanna_factor"] if "vanna_factor" in kwargs else 0.01,
+                   "volga": kwargs["volga_factor"] if "volga_factor" in kwargs else 0.01 * 0.01,
+                   "charm": kwargs["charm_factor"] if "charm_factor" in kwargs else 1.0/365.0,
+                   "speed": kwargs["speed_factor"] if "speed_factor" in kwargs else 1.0,
+                   "color": kwargs["color_factor"] if "color_factor" in kwargs else 1.0/365.0}
+
+        # call case
+        if self.get_type() == 'call':
+            greeks_dict = self.call_higher_order_risk(S=S, K=K, tau=tau, sigma=sigma, r=r)
         # put case
         else:
-            return self.put_rho(S=S, K=K, tau=tau, sigma=sigma, r=r) * rescaling_factor
+            greeks_dict = self.put_higher_order_risk(S=S, K=K, tau=tau, sigma=sigma, r=r)
+            
+        # rescaling
+        for greek in greeks_dict:
+            greeks_dict[greek] = greeks_dict[greek] * factors[greek]
+        
+        # labelling output as pd.DataFrame, if necessary
+        return attach_labels(greeks_dict, param_dict["index"], param_dict["columns"])
+
+    def grid(self, metrics="price", **kwargs):
+        """
+        Calculates and returns price and/or greeks of the option on the N-dimensional 
+        grid of scenarios spanned by any subset of the pricing parameters S, K, 
+        t (or tau), sigma and r (see .process_grid_parameters() method). The whole 
+        outer product of the axes is evaluated in a single broadcast kernel call.
+        
+        Usage example: 
+            - example_options_scenario_grid.py
+            
+        Parameter metrics can be either a String (e.g. 'price', 'delta' or 'vanna') 
+        or a List of Strings. Greeks are rescaled as .risk() and .higher_order_risk() 
+        methods, optionally using the same "<greek>_factor" keyboard parameters.
+        
+        Returns a dictionary with keys:
+            
+            - 'values': the np.ndarray of the metrics (or a dictionary of them, 
+              if metrics is a List), with one dimension per axis;
+            - 'axes': the axes as a List of (name, values) pairs.
+        
+        For example, .grid(S=S_vector, sigma=sigma_vector, t=t_range) returns 
+        (len(S_vector), len(sigma_vector), len(t_range)) shaped prices.
+        
+        The same dictionary is returned if np_output=False, with the metrics 
+        labelled as LabeledArrays, carrying the axes (see LabeledArray class).
+        """
+
+        # process input parameters
+        grid_params = self.process_grid_parameters(**kwargs)
+        params = {name: grid_params[name] for name in ["S", "K", "tau", "sigma", "r"]}
+        
+        metrics_list = [metrics] if isinstance(metrics, str) else list(metrics)
+        
+        # rescaling factors
+        default_factors = {"price": 1.0, "delta": 1.0, "theta": 1.0/365.0, "gamma": 1.0, "vega": 0.01, "rho": 0.01,
+                           "vanna": 0.01, "volga": 0.01 * 0.01, "charm": 1.0/365.0, "speed": 1.0, "color": 1.0/365.0}
+
+        invalid_metrics = [m for m in metrics_list if m not in default_factors]
+        if len(invalid_metrics) > 0:
+            raise NotImplementedError("Metrics: '{}' not available on grids!".format(invalid_metrics[0]))
+        
+        factors = {m: kwargs[m + "_factor"] if m + "_factor" in kwargs else default_factors[m] for m in metrics_list}
+        
+        # single broadcast kernel call (per order of greeks)
+        values = {}
+        
+        if any([m in ["delta", "theta", "gamma", "vega", "rho"] for m in metrics_list]):
+            values.update(self.risk_arrays(**params, **self.kernel_terms()))
+        elif "price" in metrics_list:
+            values["price"] = self.price_arrays(**params, **self.kernel_terms())
+            
+        if any([m in ["vanna", "volga", "charm", "speed", "color"] for m in metrics_list]):
+            values.update(self.higher_order_arrays(**params, **self.kernel_terms()))
+        
+        # rescaling
+        values = {m: values[m] * factors[m] for m in metrics_list}
+        
+        # labelling output as LabeledArray, if necessary
+        if ("np_output" in kwargs) and (not kwargs["np_output"]):
+            values = {m: LabeledArray(values[m], grid_params["axes"]) for m in metrics_list}
+        
+        return {"values": values[metrics] if isinstance(metrics, str) else values, 
+                "axes": grid_params["axes"]}
 
 #-----------------------------------------------------------------------------#
         
@@ -1102,6 +1717,24 @@ class PlainVanillaOption(EuropeanOption):
 
         price_lower_limit: float 
             Overridden method. Returns the lower limit for a vanilla option price.
+
+        price_arrays: np.ndarray
+            Static method. Returns the prices of plain-vanilla options from aligned arrays of parameters.
+
+        vega_arrays: np.ndarray
+            Static method. Returns the vegas of plain-vanilla options from aligned arrays of parameters.
+
+        iv_guess_arrays: np.ndarray
+            Static method. Returns closed-form implied volatilities of plain-vanilla options, used as initial guess.
+
+        risk_arrays: dict
+            Static method. Returns the prices and greeks of plain-vanilla options from aligned arrays of parameters.
+
+        higher_order_arrays: dict
+            Static method. Returns the higher-order greeks of plain-vanilla options from aligned arrays of parameters.
+
+        from_arrays: List
+            Class method. Creates many options from aligned arrays of terms, pricing their initial values in a single pass.
                         
     Usage examples: 
     --------   
@@ -1118,6 +1751,10 @@ class PlainVanillaOption(EuropeanOption):
 
         - general: PlainVanillaOption(mkt_env, option_type='call' or 'put' String, K=Float, T="DD-MM-YYYY" String)
 
+        - live market: PlainVanillaOption(mkt_env, live_market=True, ...) keeps the option bound to mkt_env updates.
+
+        - bulk: PlainVanillaOption.from_arrays(mkt_env, types=Array, K=Array, T=Array) returns a list of options.
+
     where: mkt_env is a MarketEnvironment object.
     """
     
@@ -1127,12 +1764,9 @@ class PlainVanillaOption(EuropeanOption):
         # calling the EuropeanOption initializer
         super(PlainVanillaOption, self).__init__(*args, **kwargs)
         
-        # info strings
-        self.__info = r"Plain Vanilla {} [K={:.1f}, T={} (tau={:.2f}y)]".format(self.get_type(), self.get_K(), datetime_obj_to_date_string(self.get_T()), self.get_tau())
-        self.__mkt_info = r"[S_t={:.1f}, r={:.1f}%, sigma={:.1f}%, t={}]".format(self.get_S(), self.get_r()*100, self.get_sigma()*100, datetime_obj_to_date_string(self.get_t()))
-        
-        # initial price of the option (as scalar value)
-        self.__initial_price = self.price()
+        # info strings (formatted on first access)
+        self.__info = None
+        self.__mkt_info = None
         
         # informations dictionary
         self.__docstring_dict = {
@@ -1157,17 +1791,33 @@ class PlainVanillaOption(EuropeanOption):
     #
     
     def get_info(self):
+        if self.__info is None:
+            self.__info = r"Plain Vanilla {} [K={:.1f}, T={} (tau={:.2f}y)]".format(self.get_type(), self.get_K(), datetime_obj_to_date_string(self.get_T()), self.get_emission_mkt()["tau"])
         return self.__info
     
     def get_mkt_info(self):
+        if self.__mkt_info is None:
+            emission_mkt = self.get_emission_mkt()
+            self.__mkt_info = r"[S_t={:.1f}, r={:.1f}%, sigma={:.1f}%, t={}]".format(emission_mkt["S"], emission_mkt["r"]*100, emission_mkt["sigma"]*100, datetime_obj_to_date_string(emission_mkt["t"]))
         return self.__mkt_info
     
-    def get_initial_price(self):
-        return self.__initial_price
-
     def get_docstring(self, label):
         return self.__docstring_dict[self.get_type()][label] 
 
+    #
+    # utility methods
+    #
+
+    def copy_with_terms(self, option_type, K, T, tau):
+        """
+        Overridden method. Returns a copy of the option with different contract 
+        terms, resetting its info strings.
+        """
+        option = super(PlainVanillaOption, self).copy_with_terms(option_type=option_type, K=K, T=T, tau=tau)
+        option.__info = None
+        option.__mkt_info = None
+        return option
+
     #
     # Public methods
     # 
@@ -1205,14 +1855,18 @@ class PlainVanillaOption(EuropeanOption):
 
         if self.get_type() == 'call':
             # call case
-            return self.call_price_upper_limit(S=S)
+            upper_limit = self.call_price_upper_limit(S=S)
         else:
             # put case
-            return self.put_price_upper_limit(S=S, K=K, tau=tau, r=r)
+            upper_limit = self.put_price_upper_limit(S=S, K=K, tau=tau, r=r)
+
+        # labelling output as pd.DataFrame, if necessary
+        return attach_labels(upper_limit, param_dict["index"], param_dict["columns"])
             
     def call_price_upper_limit(self, S):
         """Plain-Vanilla call option price upper limit"""
-        return S
+        # a copy, since S may be a read-only view of the coordinated parameters
+        return S.copy()
     
     def put_price_upper_limit(self, S, K, tau, r):
         """Plain-Vanilla call option price upper limit"""
@@ -1240,10 +1894,13 @@ class PlainVanillaOption(EuropeanOption):
                                        
         # call case
         if self.get_type() == 'call':
-            return self.call_price_lower_limit(S=S, K=K, tau=tau, r=r)
+            lower_limit = self.call_price_lower_limit(S=S, K=K, tau=tau, r=r)
         # put case
         else:
-            return self.put_price_lower_limit(S=S, K=K, tau=tau, r=r)
+            lower_limit = self.put_price_lower_limit(S=S, K=K, tau=tau, r=r)
+
+        # labelling output as pd.DataFrame, if necessary
+        return attach_labels(lower_limit, param_dict["index"], param_dict["columns"])
             
     def call_price_lower_limit(self, S, K, tau, r):
         """Plain-Vanilla call option price lower limit"""
@@ -1262,7 +1919,7 @@ class PlainVanillaOption(EuropeanOption):
         d1, d2 = self.d1_and_d2(S=S, K=K, tau=tau, sigma=sigma, r=r)
 
         # compute price
-        price = S * stats.norm.cdf(d1, 0.0, 1.0) - K * np.exp(-r * tau) * stats.norm.cdf(d2, 0.0, 1.0)
+        price = S * ndtr(d1) - K * np.exp(-r * tau) * ndtr(d2)
                            
         return price
     
@@ -1277,11 +1934,7 @@ class PlainVanillaOption(EuropeanOption):
         d1, _ = self.d1_and_d2(S=S, K=K, tau=tau, sigma=sigma, r=r)
 
         # compute delta
-        delta = stats.norm.cdf(d1, 0.0, 1.0)
-        
-        # stats.norm.cdf down-cast pd.DataFrames to np.ndarray    
-        if isinstance(S, pd.DataFrame):
-            delta = pd.DataFrame(data=delta, index=S.index, columns=S.columns)
+        delta = ndtr(d1)
                            
         return delta
 
@@ -1297,7 +1950,7 @@ class PlainVanillaOption(EuropeanOption):
         d1, d2 = self.d1_and_d2(S=S, K=K, tau=tau, sigma=sigma, r=r)
 
         # compute theta
-        theta = - (S * sigma * stats.norm.pdf(d1, 0.0, 1.0) / (2.0 * np.sqrt(tau))) - r * K * np.exp(-r * tau) * stats.norm.cdf(d2, 0.0, 1.0)
+        theta = - (S * sigma * norm_pdf(d1) / (2.0 * np.sqrt(tau))) - r * K * np.exp(-r * tau) * ndtr(d2)
                            
         return theta
 
@@ -1308,7 +1961,7 @@ class PlainVanillaOption(EuropeanOption):
         d1, d2 = self.d1_and_d2(S=S, K=K, tau=tau, sigma=sigma, r=r)
 
         # compute theta
-        theta = - (S * sigma * stats.norm.pdf(d1, 0.0, 1.0) / (2.0 * np.sqrt(tau))) + r * K * np.exp(-r * tau) * stats.norm.cdf(-d2, 0.0, 1.0)
+        theta = - (S * sigma * norm_pdf(d1) / (2.0 * np.sqrt(tau))) + r * K * np.exp(-r * tau) * ndtr(-d2)
         
         return theta
 
@@ -1319,7 +1972,7 @@ class PlainVanillaOption(EuropeanOption):
         d1, _ = self.d1_and_d2(S=S, K=K, tau=tau, sigma=sigma, r=r)
 
         # compute gamma
-        gamma = stats.norm.pdf(d1, 0.0, 1.0) / (S * sigma * np.sqrt(tau))
+        gamma = norm_pdf(d1) / (S * sigma * np.sqrt(tau))
         
         return gamma
         
@@ -1335,7 +1988,7 @@ class PlainVanillaOption(EuropeanOption):
         d1, _ = self.d1_and_d2(S=S, K=K, tau=tau, sigma=sigma, r=r)
         
         # compute vega
-        vega = S * np.sqrt(tau) * stats.norm.pdf(d1, 0.0, 1.0)
+        vega = S * np.sqrt(tau) * norm_pdf(d1)
                            
         return vega
     
@@ -1351,7 +2004,7 @@ class PlainVanillaOption(EuropeanOption):
         _, d2 = self.d1_and_d2(S=S, K=K, tau=tau, sigma=sigma, r=r)
 
         # compute rho
-        rho = tau * K * np.exp(-r * tau) * stats.norm.cdf(d2, 0.0, 1.0)
+        rho = tau * K * np.exp(-r * tau) * ndtr(d2)
         
         return rho
 
@@ -1362,9 +2015,330 @@ class PlainVanillaOption(EuropeanOption):
         _, d2 = self.d1_and_d2(S=S, K=K, tau=tau, sigma=sigma, r=r)
 
         # compute rho
-        rho = - tau * K * np.exp(-r * tau) * stats.norm.cdf(-d2, 0.0, 1.0)
+        rho = - tau * K * np.exp(-r * tau) * ndtr(-d2)
         
         return rho
+
+    def call_risk(self, S, K, tau, sigma, r):
+        """Plain-Vanilla call option price and greeks, sharing intermediate terms"""
+        return self.risk_arrays(S=S, K=K, tau=tau, sigma=sigma, r=r, is_call=True)
+
+    def put_risk(self, S, K, tau, sigma, r):
+        """Plain-Vanilla put option price and greeks, sharing intermediate terms"""
+        return self.risk_arrays(S=S, K=K, tau=tau, sigma=sigma, r=r, is_call=False)
+
+    def call_higher_order_risk(self, S, K, tau, sigma, r):
+        """Plain-Vanilla call option higher-order greeks, sharing intermediate terms"""
+        return self.higher_order_arrays(S=S, K=K, tau=tau, sigma=sigma, r=r, is_call=True)
+
+    def put_higher_order_risk(self, S, K, tau, sigma, r):
+        """Plain-Vanilla put option higher-order greeks, sharing intermediate terms"""
+        return self.higher_order_arrays(S=S, K=K, tau=tau, sigma=sigma, r=r, is_call=False)
+
+    #
+    # Raw-array (structure-of-arrays) kernels
+    # 
+
+    @staticmethod
+    def price_arrays(S, K, tau, sigma, r, is_call=True):
+        """
+        Calculates and returns the Black-Scholes price of plain-vanilla options 
+        directly from aligned NumPy arrays (or scalars), bypassing parameters 
+        processing: no sorting, type checking, coordination or warnings. 
+        
+        Usage example: 
+            - example_options_price_arrays.py
+        
+        Parameters S, K, tau, sigma, r and is_call are broadcast together 
+        element-wise (see NumPy broadcasting rules), so that N independent quotes 
+        can be priced in a single call passing N-shaped arrays. For tau <= 0 
+        the payoff is returned. 
+        
+        Parameters:
+            
+            S (float; np.ndarray):       underlying value(s)
+            K (float; np.ndarray):       strike-price(s)
+            tau (float; np.ndarray):     time(s)-to-maturity (in years)
+            sigma (float; np.ndarray):   volatility(ies)
+            r (float; np.ndarray):       short-rate(s)
+            is_call (bool; np.ndarray):  True for calls, False for puts
+        
+        Returns:
+            
+            price (np.ndarray): Black-Scholes price(s), of the broadcast shape of the inputs.
+        """
+        
+        # +1 for calls, -1 for puts, in the floating-point data-type of the parameters
+        omega = np.where(is_call, 1.0, -1.0).astype(np.result_type(S, K, tau, sigma, r))
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            
+            # d1 and d2 terms
+            sigma_sqrt_tau = sigma * np.sqrt(tau)
+            d1 = (np.log(S/K) + (r + 0.5 * sigma ** 2) * tau) / sigma_sqrt_tau
+            d2 = d1 - sigma_sqrt_tau
+            
+            # price: omega * (S * N(omega*d1) - K * e^{-r*tau} * N(omega*d2))
+            price = omega * (S * ndtr(omega * d1) - K * np.exp(-r * tau) * ndtr(omega * d2))
+            
+        # for tau <= 0 output the payoff: max(omega * (S-K), 0)
+        return np.where(tau > 0, price, np.maximum(omega * (S - K), 0.0))
+
+    @staticmethod
+    def vega_arrays(S, K, tau, sigma, r, is_call=True):
+        """
+        Calculates and returns the Black-Scholes (non-rescaled) vega of plain-vanilla 
+        options directly from aligned NumPy arrays (or scalars).
+
+        Can be called with the same signature of the .price_arrays() method.
+        """
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            
+            # d1 term
+            sqrt_tau = np.sqrt(tau)
+            d1 = (np.log(S/K) + (r + 0.5 * sigma ** 2) * tau) / (sigma * sqrt_tau)
+            
+            # vega: S * sqrt(tau) * N'(d1), same for calls and puts
+            return S * sqrt_tau * np.exp(-0.5 * d1 ** 2) / np.sqrt(2.0 * np.pi)
+
+    @staticmethod
+    def iv_guess_arrays(price, S, K, tau, r, is_call=True, method="stefanica_radoicic"):
+        """
+        Calculates and returns a closed-form approximation of the Black-Scholes 
+        implied volatility of plain-vanilla options, to be used as initial guess 
+        of .implied_volatility() method, directly from aligned NumPy arrays (or scalars).
+        
+        Usage example: 
+            - example_options_IV.py
+        
+        Available methods:
+            
+            - "brenner_subrahmanyam": at-the-money approximation;
+            - "corrado_miller": quadratic approximation, accurate also near-the-money;
+            - "stefanica_radoicic": explicit formula based on Polya approximation 
+              of the normal CDF, accurate over all moneyness levels. For deep 
+              out-of-the-money normalized prices (below 1e-5), where the formula 
+              loses precision, the small-volatility asymptotic expansion of the 
+              normalized Black price is inverted instead;
+            - "manaster_koehler": inflection point of the price as a function of 
+              volatility, from which Newton method converges monotonically.
+              
+        Where the chosen approximation is not defined (e.g. negative radicands 
+        for deep in/out-of-the-money options), the "manaster_koehler" guess is returned.
+        Puts are converted into calls using put-call parity. 
+        
+        Parameters:
+            
+            price (float; np.ndarray):   target option price(s)
+            S, K, tau, r, is_call:       as in .price_arrays() method
+            method (str):                approximation to use
+        
+        Returns:
+            
+            sigma (np.ndarray): approximated implied volatility(ies).
+        """
+        
+        if method not in ["brenner_subrahmanyam", "corrado_miller", "stefanica_radoicic", "manaster_koehler"]:
+            raise NotImplementedError("Initial guess method: '{}' does not exist!".format(method))
+        
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            
+            # discounted strike-price and log-moneyness y = ln(F/K)
+            K_disc = K * np.exp(-r * tau)
+            y = np.log(S / K_disc)
+            sqrt_tau = np.sqrt(tau)
+            
+            # call price, using put-call parity for puts
+            C = np.where(is_call, price, price + S - K_disc)
+            
+            # inflection point (Manaster-Koehler)
+            sigma_mk = np.sqrt(2.0 * np.abs(y)) / sqrt_tau
+            
+            if method == "brenner_subrahmanyam":
+                sigma = np.sqrt(2.0 * np.pi) / sqrt_tau * C / S
+                
+            elif method == "corrado_miller":
+                half_intrinsic = 0.5 * (S - K_disc)
+                radicand = (C - half_intrinsic)**2 - (S - K_disc)**2 / np.pi
+                sigma = np.sqrt(2.0 * np.pi) / (sqrt_tau * (S + K_disc)) * (C - half_intrinsic + np.sqrt(radicand))
+                
+            elif method == "stefanica_radoicic":
+                # normalized call price and auxiliary terms
+                R = 2.0 * C / K_disc - np.exp(y) + 1.0
+                e_p = np.exp((1.0 - 2.0/np.pi) * y)
+                e_m = np.exp(-(1.0 - 2.0/np.pi) * y)
+                A = (e_p - e_m)**2
+                B = 4.0 * (np.exp(2.0*y/np.pi) + np.exp(-2.0*y/np.pi)) - 2.0 * np.exp(-y) * (e_p + e_m) * (np.exp(2.0*y) + 1.0 - R**2)
+                D = np.exp(-2.0*y) * (R**2 - (np.exp(y) - 1.0)**2) * ((np.exp(y) + 1.0)**2 - R**2)
+                beta = 2.0 * D / (B + np.sqrt(B**2 + 4.0 * A * D))
+                gamma = - 0.5 * np.pi * np.log(beta)
+                
+                # call price at the inflection point: lower or upper branch
+                C_0 = np.where(y >= 0, 
+                               K_disc * (np.exp(y) * ndtr(np.sqrt(2.0 * np.abs(y))) - 0.5), 
+                               K_disc * (0.5 * np.exp(y) - ndtr(-np.sqrt(2.0 * np.abs(y)))))
+                sqrt_gamma_p = np.sqrt(gamma + y)
+                sqrt_gamma_m = np.sqrt(gamma - y)
+                sigma = np.where(C <= C_0, np.abs(sqrt_gamma_p - sqrt_gamma_m), sqrt_gamma_p + sqrt_gamma_m) / sqrt_tau
+                
+                # normalized out-of-the-money price b = price/sqrt(F*K) (discounted), 
+                # with log-moneyness x <= 0, using b_put(x) = b_call(-x) symmetry
+                x = np.where(is_call, y, -y)
+                b = price / np.sqrt(S * K_disc)
+                b = np.where(x > 0, b - (np.exp(0.5*x) - np.exp(-0.5*x)), b)
+                x = - np.abs(x)
+                
+                # asymptotic expansion for s = sigma*sqrt(tau) -> 0: 
+                # ln(b) ~ 3 ln(s) - 2 ln|x| - ln(2 pi)/2 - x^2/(2 s^2) - s^2/8,
+                # inverted by fixed-point iterations
+                s = np.abs(x) / np.sqrt(- 2.0 * np.log(b))
+                for _ in range(4):
+                    s = np.abs(x) / np.sqrt(2.0 * (3.0 * np.log(s) - 2.0 * np.log(np.abs(x)) - 0.5 * np.log(2.0 * np.pi) - np.log(b) - s**2 / 8.0))
+                sigma_asymptotic = s / sqrt_tau
+                
+                deep_otm = (b < 1e-5) & np.isfinite(sigma_asymptotic) & (sigma_asymptotic > 0)
+                sigma = np.where(deep_otm, sigma_asymptotic, sigma)
+                
+            else:
+                sigma = sigma_mk
+                
+            # inflection point, where the approximation is not defined
+            return np.where(np.isfinite(sigma) & (sigma > 0), sigma, sigma_mk)
+
+    @staticmethod
+    def risk_arrays(S, K, tau, sigma, r, is_call=True):
+        """
+        Calculates and returns the Black-Scholes price and (non-rescaled) greeks of 
+        plain-vanilla options directly from aligned NumPy arrays (or scalars).
+        
+        Usage example: 
+            - example_options_price_arrays.py
+
+        Can be called with the same signature of the .price_arrays() method.
+        
+        Returns a dictionary with keys 'price', 'delta', 'theta', 'gamma', 'vega' 
+        and 'rho'. Theta is per year, vega and rho per unit (+100%) variation.
+        """
+
+        # +1 for calls, -1 for puts, in the floating-point data-type of the parameters
+        omega = np.where(is_call, 1.0, -1.0).astype(np.result_type(S, K, tau, sigma, r))
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            
+            # d1 and d2 terms
+            sqrt_tau = np.sqrt(tau)
+            sigma_sqrt_tau = sigma * sqrt_tau
+            d1 = (np.log(S/K) + (r + 0.5 * sigma ** 2) * tau) / sigma_sqrt_tau
+            d2 = d1 - sigma_sqrt_tau
+
+            # shared intermediate terms
+            K_disc = K * np.exp(-r * tau)
+            cdf_omega_d1 = ndtr(omega * d1)
+            cdf_omega_d2 = ndtr(omega * d2)
+            pdf_d1 = np.exp(-0.5 * d1 ** 2) / np.sqrt(2.0 * np.pi)
+
+            price = omega * (S * cdf_omega_d1 - K_disc * cdf_omega_d2)
+
+            return {"price": np.where(tau > 0, price, np.maximum(omega * (S - K), 0.0)),
+                    "delta": omega * cdf_omega_d1,
+                    "theta": - (S * sigma * pdf_d1 / (2.0 * sqrt_tau)) - omega * r * K_disc * cdf_omega_d2,
+                    "gamma": pdf_d1 / (S * sigma_sqrt_tau),
+                    "vega":  S * sqrt_tau * pdf_d1,
+                    "rho":   omega * tau * K_disc * cdf_omega_d2}
+
+    @staticmethod
+    def higher_order_arrays(S, K, tau, sigma, r, is_call=True):
+        """
+        Calculates and returns the (non-rescaled) higher-order greeks of 
+        plain-vanilla options directly from aligned NumPy arrays (or scalars).
+        
+        Usage example: 
+            - example_options_higher_order_greeks.py
+
+        Can be called with the same signature of the .price_arrays() method.
+        
+        Returns a dictionary with keys 'vanna', 'volga', 'charm', 'speed' and 
+        'color'. Vanna and volga are per unit (+100%) variation of sigma, 
+        charm and color per year. Without dividends, they are the same for 
+        calls and puts.
+        """
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            
+            # d1 and d2 terms
+            sqrt_tau = np.sqrt(tau)
+            sigma_sqrt_tau = sigma * sqrt_tau
+            d1 = (np.log(S/K) + (r + 0.5 * sigma ** 2) * tau) / sigma_sqrt_tau
+            d2 = d1 - sigma_sqrt_tau
+
+            # shared intermediate terms
+            pdf_d1 = np.exp(-0.5 * d1 ** 2) / np.sqrt(2.0 * np.pi)
+            gamma = pdf_d1 / (S * sigma_sqrt_tau)
+            
+            # derivative of d1 w.r.t. tau
+            d1_tau = r / sigma_sqrt_tau - d2 / (2.0 * tau)
+
+            vanna = - pdf_d1 * d2 / sigma
+            
+            return {"vanna": vanna,
+                    "volga": - S * sqrt_tau * d1 * vanna,
+                    "charm": - pdf_d1 * d1_tau,
+                    "speed": - gamma * (d1 / sigma_sqrt_tau + 1.0) / S,
+                    "color": gamma * (d1 * d1_tau + 1.0 / (2.0 * tau))}
+
+    #
+    # Bulk constructor
+    # 
+
+    @classmethod
+    def from_arrays(cls, mkt_env, types, K, T, live_market=False):
+        """
+        Creates many plain-vanilla options at once, from aligned arrays (or scalars) 
+        of option types, strike-prices and expiration dates, broadcast together.
+        Option types are validated and expiration dates parsed (each distinct 
+        date once) and turned into times-to-maturity in a vectorized way, 
+        options being then created as copies of a single prototype option (see 
+        .copy_with_terms() method). Initial prices of all the options are computed 
+        in a single vectorized call of .price_arrays() method, instead of one 
+        .price() call per option.
+        
+        Usage example: 
+            - example_options_from_arrays.py
+        
+        Parameters:
+            
+            mkt_env (MarketEnvironment):          market conditions at emission
+            types (str; np.ndarray):              'call' or 'put' type(s)
+            K (float; np.ndarray):                strike-price(s)
+            T (str; dt.datetime; np.ndarray):     expiration date(s)
+            live_market (bool):                   Optional. Binds the options to mkt_env. Default: False
+        
+        Returns:
+            
+            options (List): list of PlainVanillaOption objects, in flattened order.
+        """
+        
+        # aligned option terms
+        types, K, T = np.broadcast_arrays(np.asarray(types), np.asarray(K, dtype=float), to_datetime64(T))
+        types, K, T = types.ravel(), K.ravel(), T.ravel()
+
+        # vectorized terms validation and parsing
+        T, tau = cls.parse_bulk_terms(mkt_env, types, T)
+        
+        prototype = cls(mkt_env, live_market=live_market, verbose=False)
+        options = [prototype.copy_with_terms(option_type=str(types[i]), K=float(K[i]), T=T[i], tau=float(tau[i])) 
+                   for i in range(len(K))]
+        
+        # initial prices in a single pass, at market conditions of emission
+        initial_prices = cls.price_arrays(S=mkt_env.get_S(), K=K, tau=tau, sigma=mkt_env.get_sigma(), r=mkt_env.get_r(),
+                                          is_call=(types == 'call'))
+        
+        for option, initial_price in zip(options, initial_prices):
+            option.set_initial_price(np.array([initial_price]))
+        
+        return options
+
 #-----------------------------------------------------------------------------#
 
 class DigitalOption(EuropeanOption):
@@ -1395,6 +2369,27 @@ class DigitalOption(EuropeanOption):
 
         price_lower_limit: float 
             Overridden method. Returns the lower limit for a vanilla option price.
+
+        payoff_arrays: np.ndarray
+            Static method. Returns the payoffs of CON options from aligned arrays of parameters.
+
+        price_arrays: np.ndarray
+            Static method. Returns the prices of CON options from aligned arrays of parameters.
+
+        vega_arrays: np.ndarray
+            Static method. Returns the vegas of CON options from aligned arrays of parameters.
+
+        iv_guess_arrays: np.ndarray
+            Static method. Returns closed-form implied volatilities of CON options, used as initial guess.
+
+        risk_arrays: dict
+            Static method. Returns the prices and greeks of CON options from aligned arrays of parameters.
+
+        higher_order_arrays: dict
+            Static method. Returns the higher-order greeks of CON options from aligned arrays of parameters.
+
+        from_arrays: List
+            Class method. Creates many options from aligned arrays of terms, pricing their initial values in a single pass.
             
     Usage examples: 
     --------   
@@ -1411,6 +2406,10 @@ class DigitalOption(EuropeanOption):
 
         - general: DigitalOption(mkt_env, cash_amount=Float, option_type='call' or 'put' String, K=Float, T="DD-MM-YYYY" String)
 
+        - live market: DigitalOption(mkt_env, live_market=True, ...) keeps the option bound to mkt_env updates.
+
+        - bulk: DigitalOption.from_arrays(mkt_env, types=Array, K=Array, T=Array, cash_amount=Array) returns a list of options.
+
     where: mkt_env is a MarketEnvironment object.
     """
 
@@ -1424,12 +2423,9 @@ class DigitalOption(EuropeanOption):
         # amount of cash in case of payment
         self.__Q = cash_amount    
         
-        # info strings
-        self.__info = r"CON {} [K={:.1f}, T={} (tau={:.2f}y), Q={:.1f}]".format(self.get_type(), self.get_K(), datetime_obj_to_date_string(self.get_T()), self.get_tau(), self.get_Q())
-        self.__mkt_info = r"[S_t={:.1f}, r={:.1f}%, sigma={:.1f}%, t={}]".format(self.get_S(), self.get_r()*100, self.get_sigma()*100, datetime_obj_to_date_string(self.get_t()))
-        
-        # initial price of the option
-        self.__initial_price = self.price()
+        # info strings (formatted on first access)
+        self.__info = None
+        self.__mkt_info = None
 
         # informations dictionary
         self.__docstring_dict = {
@@ -1454,17 +2450,19 @@ class DigitalOption(EuropeanOption):
     #
     
     def get_info(self):
+        if self.__info is None:
+            self.__info = r"CON {} [K={:.1f}, T={} (tau={:.2f}y), Q={:.1f}]".format(self.get_type(), self.get_K(), datetime_obj_to_date_string(self.get_T()), self.get_emission_mkt()["tau"], self.get_Q())
         return self.__info
     
     def get_mkt_info(self):
+        if self.__mkt_info is None:
+            emission_mkt = self.get_emission_mkt()
+            self.__mkt_info = r"[S_t={:.1f}, r={:.1f}%, sigma={:.1f}%, t={}]".format(emission_mkt["S"], emission_mkt["r"]*100, emission_mkt["sigma"]*100, datetime_obj_to_date_string(emission_mkt["t"]))
         return self.__mkt_info
     
     def get_Q(self):
         return self.__Q
     
-    def get_initial_price(self):
-        return self.__initial_price
-    
     def get_docstring(self, label):
         return self.__docstring_dict[self.get_type()][label] 
     
@@ -1473,7 +2471,34 @@ class DigitalOption(EuropeanOption):
     #
 
     def set_Q(self, cash_amount):
+        # initial price refers to the option terms at emission
+        self.get_initial_price()
         self.__Q = cash_amount
+        self.invalidate_cache()
+
+    #
+    # utility methods
+    #
+
+    def kernel_terms(self):
+        """
+        Utility method returning the contract terms, other than strike-price, 
+        taken by raw-array kernels: option type and cash amount
+        """
+        terms = super(DigitalOption, self).kernel_terms()
+        terms["Q"] = self.get_Q()
+        return terms
+
+    def copy_with_terms(self, option_type, K, T, tau, Q=None):
+        """
+        Overridden method. Returns a copy of the option with different contract 
+        terms, including the cash amount Q (default: the one of the option).
+        """
+        option = super(DigitalOption, self).copy_with_terms(option_type=option_type, K=K, T=T, tau=tau)
+        option.__Q = self.__Q if Q is None else Q
+        option.__info = None
+        option.__mkt_info = None
+        return option
 
     #
     # Public methods
@@ -1481,16 +2506,11 @@ class DigitalOption(EuropeanOption):
     
     def call_payoff(self, S, K):
         """ CON call option payoff"""
-        # Function np.heaviside(arr, x) returns:
-        #        
-        #    0 if arr < 0
-        #    x if arr == 0
-        #    1 if arr > 0
-        return np.heaviside(S-K, 0.0)
+        return self.payoff_arrays(S=S, K=K, is_call=True, Q=self.get_Q())
         
     def put_payoff(self, S, K):
         """ CON put option payoff"""
-        return np.heaviside(K-S, 1.0)
+        return self.payoff_arrays(S=S, K=K, is_call=False, Q=self.get_Q())
         
     def price_upper_limit(self, *args, **kwargs):
         """
@@ -1511,7 +2531,10 @@ class DigitalOption(EuropeanOption):
         r = param_dict["r"]
         
         # the same for call and put
-        return self.get_Q()*np.exp(-r * tau)
+        upper_limit = self.get_Q()*np.exp(-r * tau)
+
+        # labelling output as pd.DataFrame, if necessary
+        return attach_labels(upper_limit, param_dict["index"], param_dict["columns"])
         
     def price_lower_limit(self, *args, **kwargs):
         """
@@ -1531,7 +2554,10 @@ class DigitalOption(EuropeanOption):
         S = param_dict["S"]
         
         # the same for call and put
-        return 0.0*S
+        lower_limit = 0.0*S
+
+        # labelling output as pd.DataFrame, if necessary
+        return attach_labels(lower_limit, param_dict["index"], param_dict["columns"])
        
     def call_price(self, S, K, tau, sigma, r):
         """ CON call option Black-Scholes price"""
@@ -1542,7 +2568,7 @@ class DigitalOption(EuropeanOption):
         _, d2 = self.d1_and_d2(S=S, K=K, tau=tau, sigma=sigma, r=r)
 
         # compute price
-        price = Q * np.exp(-r * tau) * stats.norm.cdf(d2, 0.0, 1.0)
+        price = Q * np.exp(-r * tau) * ndtr(d2)
 
         return price
     
@@ -1559,7 +2585,7 @@ class DigitalOption(EuropeanOption):
         _, d2 = self.d1_and_d2(S=S, K=K, tau=tau, sigma=sigma, r=r)
 
         # compute delta
-        delta = Q * np.exp(-r * tau) * stats.norm.pdf(d2, 0.0, 1.0) / (S * sigma * np.sqrt(tau))
+        delta = Q * np.exp(-r * tau) * norm_pdf(d2) / (S * sigma * np.sqrt(tau))
 
         return delta
 
@@ -1577,7 +2603,7 @@ class DigitalOption(EuropeanOption):
         d1, d2 = self.d1_and_d2(S=S, K=K, tau=tau, sigma=sigma, r=r)
 
         # compute theta
-        theta = Q * np.exp(- r * tau) * (((d1 * sigma * np.sqrt(tau) - 2.0 * r *tau)/(2.0 * sigma * tau * np.sqrt(tau))) * stats.norm.pdf(d2, 0.0, 1.0) + r * stats.norm.cdf(d2, 0.0, 1.0))
+        theta = Q * np.exp(- r * tau) * (((d1 * sigma * np.sqrt(tau) - 2.0 * r *tau)/(2.0 * sigma * tau * np.sqrt(tau))) * norm_pdf(d2) + r * ndtr(d2))
 
         return theta
 
@@ -1597,7 +2623,7 @@ class DigitalOption(EuropeanOption):
         d1, d2 = self.d1_and_d2(S=S, K=K, tau=tau, sigma=sigma, r=r)
 
         # compute gamma
-        gamma = - (d1 * Q * np.exp(- r * tau) * stats.norm.pdf(d2, 0.0, 1.0)) / (S*S * sigma*sigma * tau)
+        gamma = - (d1 * Q * np.exp(- r * tau) * norm_pdf(d2)) / (S*S * sigma*sigma * tau)
 
         return gamma
 
@@ -1615,7 +2641,7 @@ class DigitalOption(EuropeanOption):
         d1, d2 = self.d1_and_d2(S=S, K=K, tau=tau, sigma=sigma, r=r)
 
         # compute vega
-        vega = - (d1 * Q * np.exp(- r * tau) * stats.norm.pdf(d2, 0.0, 1.0)) / (sigma)
+        vega = - (d1 * Q * np.exp(- r * tau) * norm_pdf(d2)) / (sigma)
 
         return vega
     
@@ -1633,7 +2659,7 @@ class DigitalOption(EuropeanOption):
         _, d2 = self.d1_and_d2(S=S, K=K, tau=tau, sigma=sigma, r=r)
 
         # compute rho
-        rho = Q * np.exp(- r * tau) * (((np.sqrt(tau) * stats.norm.pdf(d2, 0.0, 1.0))/(sigma)) - tau * stats.norm.cdf(d2, 0.0, 1.0))
+        rho = Q * np.exp(- r * tau) * (((np.sqrt(tau) * norm_pdf(d2))/(sigma)) - tau * ndtr(d2))
 
         return rho
 
@@ -1644,3 +2670,278 @@ class DigitalOption(EuropeanOption):
 
         return - self.call_rho(S=S, K=K, tau=tau, sigma=sigma, r=r) - tau * Q * np.exp(- r * tau)
 
+    def call_risk(self, S, K, tau, sigma, r):
+        """CON call option price and greeks, sharing intermediate terms"""
+        return self.risk_arrays(S=S, K=K, tau=tau, sigma=sigma, r=r, is_call=True, Q=self.get_Q())
+
+    def put_risk(self, S, K, tau, sigma, r):
+        """CON put option price and greeks, sharing intermediate terms"""
+        return self.risk_arrays(S=S, K=K, tau=tau, sigma=sigma, r=r, is_call=False, Q=self.get_Q())
+
+    def call_higher_order_risk(self, S, K, tau, sigma, r):
+        """CON call option higher-order greeks, sharing intermediate terms"""
+        return self.higher_order_arrays(S=S, K=K, tau=tau, sigma=sigma, r=r, is_call=True, Q=self.get_Q())
+
+    def put_higher_order_risk(self, S, K, tau, sigma, r):
+        """CON put option higher-order greeks, sharing intermediate terms"""
+        return self.higher_order_arrays(S=S, K=K, tau=tau, sigma=sigma, r=r, is_call=False, Q=self.get_Q())
+
+    #
+    # Raw-array (structure-of-arrays) kernels
+    # 
+
+    @staticmethod
+    def payoff_arrays(S, K, is_call=True, Q=1.0):
+        """
+        Calculates and returns the payoff of CON options: Q * I(S > K) for calls 
+        and Q * I(S <= K) for puts. This is the payoff definition used by 
+        .call_payoff(), .put_payoff() and, for tau <= 0, by the raw-array kernels.
+        """
+        
+        # Function np.heaviside(arr, x) returns:
+        #        
+        #    0 if arr < 0
+        #    x if arr == 0
+        #    1 if arr > 0
+        
+        # single option type (also for DualArray underlying values)
+        if np.ndim(is_call) == 0:
+            return Q * (np.heaviside(S - K, 0.0) if is_call else np.heaviside(K - S, 1.0))
+
+        return Q * np.where(is_call, np.heaviside(S - K, 0.0), np.heaviside(K - S, 1.0))
+
+    @staticmethod
+    def price_arrays(S, K, tau, sigma, r, is_call=True, Q=1.0):
+        """
+        Calculates and returns the Black-Scholes price of CON options 
+        directly from aligned NumPy arrays (or scalars), bypassing parameters 
+        processing: no sorting, type checking, coordination or warnings. 
+        
+        Usage example: 
+            - example_options_price_arrays.py
+        
+        Can be called with the same signature of PlainVanillaOption.price_arrays() 
+        method, with the additional cash amount(s) parameter Q (default: 1.0), 
+        broadcast together with the other parameters. For tau <= 0 the payoff 
+        is returned.
+        """
+        
+        # +1 for calls, -1 for puts, in the floating-point data-type of the parameters
+        omega = np.where(is_call, 1.0, -1.0).astype(np.result_type(S, K, tau, sigma, r))
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            
+            # d2 term
+            sigma_sqrt_tau = sigma * np.sqrt(tau)
+            d2 = (np.log(S/K) + (r - 0.5 * sigma ** 2) * tau) / sigma_sqrt_tau
+            
+            # price: Q * e^{-r*tau} * N(omega*d2)
+            price = Q * np.exp(-r * tau) * ndtr(omega * d2)
+            
+        # for tau <= 0 output the payoff: Q * I(S > K) (call), Q * I(S <= K) (put)
+        return np.where(tau > 0, price, DigitalOption.payoff_arrays(S, K, is_call=is_call, Q=Q))
+
+    @staticmethod
+    def vega_arrays(S, K, tau, sigma, r, is_call=True, Q=1.0):
+        """
+        Calculates and returns the Black-Scholes (non-rescaled) vega of CON 
+        options directly from aligned NumPy arrays (or scalars).
+
+        Can be called with the same signature of the .price_arrays() method.
+        """
+        
+        # +1 for calls, -1 for puts, in the floating-point data-type of the parameters
+        omega = np.where(is_call, 1.0, -1.0).astype(np.result_type(S, K, tau, sigma, r))
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            
+            # d1 and d2 terms
+            sigma_sqrt_tau = sigma * np.sqrt(tau)
+            d1 = (np.log(S/K) + (r + 0.5 * sigma ** 2) * tau) / sigma_sqrt_tau
+            d2 = d1 - sigma_sqrt_tau
+            
+            # vega: - omega * Q * e^{-r*tau} * d1 * N'(d2) / sigma
+            return - omega * Q * np.exp(-r * tau) * d1 * np.exp(-0.5 * d2 ** 2) / (np.sqrt(2.0 * np.pi) * sigma)
+
+    @staticmethod
+    def iv_guess_arrays(price, S, K, tau, r, is_call=True, Q=1.0, method="analytic"):
+        """
+        Calculates and returns the Black-Scholes implied volatility of CON options 
+        inverting the pricing formula in closed-form, to be used as initial guess 
+        of .implied_volatility() method, directly from aligned NumPy arrays (or scalars).
+        
+        Usage example: 
+            - example_options_IV.py
+        
+        Available methods:
+            
+            - "analytic": d2 = N^{-1}(price e^{r tau}/Q) for calls (-d2 for puts) 
+              is inverted solving (tau/2) sigma^2 + d2 sqrt(tau) sigma - m = 0, 
+              where m = ln(S/K) + r tau. For m < 0 two solutions may exist, 
+              the lower one is returned. NaN is returned where no solution exists.
+        
+        Parameters:
+            
+            price (float; np.ndarray):   target option price(s)
+            S, K, tau, r, is_call, Q:    as in .price_arrays() method
+            method (str):                approximation to use
+        
+        Returns:
+            
+            sigma (np.ndarray): implied volatility(ies).
+        """
+        
+        if method not in ["analytic"]:
+            raise NotImplementedError("Initial guess method: '{}' does not exist!".format(method))
+
+        # +1 for calls, -1 for puts
+        omega = np.where(is_call, 1.0, -1.0)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            
+            d2 = omega * ndtri(price * np.exp(r * tau) / Q)
+            m = np.log(S/K) + r * tau
+            sqrt_tau = np.sqrt(tau)
+            
+            # upper root for m >= 0 (the only positive one), lower root otherwise
+            sigma = (- d2 * sqrt_tau + np.where(m >= 0, 1.0, -1.0) * np.sqrt(d2**2 * tau + 2.0 * tau * m)) / tau
+            
+            return np.where(sigma > 0, sigma, np.nan)
+
+    @staticmethod
+    def risk_arrays(S, K, tau, sigma, r, is_call=True, Q=1.0):
+        """
+        Calculates and returns the Black-Scholes price and (non-rescaled) greeks of 
+        CON options directly from aligned NumPy arrays (or scalars).
+        
+        Usage example: 
+            - example_options_price_arrays.py
+
+        Can be called with the same signature of the .price_arrays() method.
+        
+        Returns a dictionary with keys 'price', 'delta', 'theta', 'gamma', 'vega' 
+        and 'rho'. Theta is per year, vega and rho per unit (+100%) variation.
+        """
+
+        # +1 for calls, -1 for puts, in the floating-point data-type of the parameters
+        omega = np.where(is_call, 1.0, -1.0).astype(np.result_type(S, K, tau, sigma, r))
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            
+            # d1 and d2 terms
+            sqrt_tau = np.sqrt(tau)
+            sigma_sqrt_tau = sigma * sqrt_tau
+            d1 = (np.log(S/K) + (r + 0.5 * sigma ** 2) * tau) / sigma_sqrt_tau
+            d2 = d1 - sigma_sqrt_tau
+
+            # shared intermediate terms
+            Q_disc = Q * np.exp(- r * tau)
+            cdf_omega_d2 = ndtr(omega * d2)
+            omega_Q_disc_pdf_d2 = omega * Q_disc * np.exp(-0.5 * d2 ** 2) / np.sqrt(2.0 * np.pi)
+            
+            price = Q_disc * cdf_omega_d2
+
+            return {"price": np.where(tau > 0, price, DigitalOption.payoff_arrays(S, K, is_call=is_call, Q=Q)),
+                    "delta": omega_Q_disc_pdf_d2 / (S * sigma_sqrt_tau),
+                    "theta": omega_Q_disc_pdf_d2 * (d1 * sigma_sqrt_tau - 2.0 * r * tau) / (2.0 * sigma * tau * sqrt_tau) + r * price,
+                    "gamma": - (d1 * omega_Q_disc_pdf_d2) / (S*S * sigma*sigma * tau),
+                    "vega":  - (d1 * omega_Q_disc_pdf_d2) / (sigma),
+                    "rho":   omega_Q_disc_pdf_d2 * sqrt_tau / sigma - tau * price}
+
+    @staticmethod
+    def higher_order_arrays(S, K, tau, sigma, r, is_call=True, Q=1.0):
+        """
+        Calculates and returns the (non-rescaled) higher-order greeks of 
+        CON options directly from aligned NumPy arrays (or scalars).
+        
+        Usage example: 
+            - example_options_higher_order_greeks.py
+
+        Can be called with the same signature of the .price_arrays() method.
+        
+        Returns a dictionary with keys 'vanna', 'volga', 'charm', 'speed' and 
+        'color'. Vanna and volga are per unit (+100%) variation of sigma, 
+        charm and color per year.
+        """
+
+        # +1 for calls, -1 for puts, in the floating-point data-type of the parameters
+        omega = np.where(is_call, 1.0, -1.0).astype(np.result_type(S, K, tau, sigma, r))
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            
+            # d1 and d2 terms
+            sqrt_tau = np.sqrt(tau)
+            sigma_sqrt_tau = sigma * sqrt_tau
+            d1 = (np.log(S/K) + (r + 0.5 * sigma ** 2) * tau) / sigma_sqrt_tau
+            d2 = d1 - sigma_sqrt_tau
+
+            # shared intermediate terms
+            omega_Q_disc_pdf_d2 = omega * Q * np.exp(- r * tau) * np.exp(-0.5 * d2 ** 2) / np.sqrt(2.0 * np.pi)
+            delta = omega_Q_disc_pdf_d2 / (S * sigma_sqrt_tau)
+            gamma = - (d1 * omega_Q_disc_pdf_d2) / (S*S * sigma*sigma * tau)
+
+            # derivatives of d1 and d2 w.r.t. tau
+            d1_tau = r / sigma_sqrt_tau - d2 / (2.0 * tau)
+            d2_tau = r / sigma_sqrt_tau - d1 / (2.0 * tau)
+            
+            # derivative of log-discounted pdf(d2) w.r.t. tau, changed of sign
+            log_pdf_tau = r + d2 * d2_tau
+
+            return {"vanna": delta * (d1 * d2 - 1.0) / sigma,
+                    "volga": omega_Q_disc_pdf_d2 * (d1 + d2 - d1 * d1 * d2) / (sigma * sigma),
+                    "charm": delta * (log_pdf_tau + 1.0 / (2.0 * tau)),
+                    "speed": - omega_Q_disc_pdf_d2 * ((1.0 - d1 * d2) / sigma_sqrt_tau - 2.0 * d1) / (S*S*S * sigma*sigma * tau),
+                    "color": gamma * (log_pdf_tau + 1.0 / tau) + omega_Q_disc_pdf_d2 * d1_tau / (S*S * sigma*sigma * tau)}
+
+    #
+    # Bulk constructor
+    # 
+
+    @classmethod
+    def from_arrays(cls, mkt_env, types, K, T, cash_amount=1.0, live_market=False):
+        """
+        Creates many CON options at once, from aligned arrays (or scalars) of 
+        option types, strike-prices, expiration dates and cash amounts, broadcast 
+        together. Terms are validated and parsed in a vectorized way, as in 
+        PlainVanillaOption.from_arrays() method. Initial prices of all the options 
+        are computed in a single vectorized call of .price_arrays() method, instead 
+        of one .price() call per option.
+        
+        Usage example: 
+            - example_options_from_arrays.py
+        
+        Parameters:
+            
+            mkt_env (MarketEnvironment):          market conditions at emission
+            types (str; np.ndarray):              'call' or 'put' type(s)
+            K (float; np.ndarray):                strike-price(s)
+            T (str; dt.datetime; np.ndarray):     expiration date(s)
+            cash_amount (float; np.ndarray):      Optional. Cash amount(s). Default: 1.0
+            live_market (bool):                   Optional. Binds the options to mkt_env. Default: False
+        
+        Returns:
+            
+            options (List): list of DigitalOption objects, in flattened order.
+        """
+        
+        # aligned option terms
+        types, K, T, Q = np.broadcast_arrays(np.asarray(types), np.asarray(K, dtype=float), 
+                                             to_datetime64(T), np.asarray(cash_amount, dtype=float))
+        types, K, T, Q = types.ravel(), K.ravel(), T.ravel(), Q.ravel()
+
+        # vectorized terms validation and parsing
+        T, tau = cls.parse_bulk_terms(mkt_env, types, T)
+        
+        prototype = cls(mkt_env, live_market=live_market, verbose=False)
+        options = [prototype.copy_with_terms(option_type=str(types[i]), K=float(K[i]), T=T[i], tau=float(tau[i]), Q=float(Q[i])) 
+                   for i in range(len(K))]
+        
+        # initial prices in a single pass, at market conditions of emission
+        initial_prices = cls.price_arrays(S=mkt_env.get_S(), K=K, tau=tau, sigma=mkt_env.get_sigma(), r=mkt_env.get_r(),
+                                          is_call=(types == 'call'), Q=Q)
+        
+        for option, initial_price in zip(options, initial_prices):
+            option.set_initial_price(np.array([initial_price]))
+        
+        return options
+
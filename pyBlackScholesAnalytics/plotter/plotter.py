@@ -27,6 +27,7 @@ from mpl_toolkits.mplot3d import Axes3D
 # ----------------------- sub-modules imports ------------------------------- #
 
 from utils.utils import *
+from utils.dates import to_datetime64, sort_dates
 
 #-----------------------------------------------------------------------------#
 
@@ -199,7 +200,7 @@ class Plotter:
 
         # case 2: valuation date in input (if Iterable, sort from first to last, i.e. chronological order)
         elif is_date(time):
-            time_parameter = homogenize(time, sort_func=date_string_to_datetime_obj)
+            time_parameter = homogenize(sort_dates(time), sort=False)
 
         else:
             raise TypeError("Time parameter {} in input has not recognized data-type \
@@ -251,7 +252,7 @@ class Plotter:
             
             # include expiration date to tick labels
             old_time_ticks_label = np.union1d(old_time_ticks_label, datetime_obj_to_date_string(expiration_date))
-            time_ticks_label = homogenize(old_time_ticks_label, sort_func=date_string_to_datetime_obj)
+            time_ticks_label = homogenize(sort_dates(old_time_ticks_label), sort=False)
         
         return time_ticks, time_ticks_label
                             
@@ -308,14 +309,13 @@ class Plotter:
             time = np.union1d(time, expiration_date)
 
             # define a dense grid of times-to-maturity
-            time_dense = pd.date_range(start=min(time, key=date_string_to_datetime_obj), 
-                                       end=max(time, key=date_string_to_datetime_obj),# - pd.Timedelta(days=10), 
-                                       periods=n)
+            time = to_datetime64(time)
+            time_dense = pd.date_range(start=time.min(), end=time.max(), periods=n)
             
             # include the requested dates
             time_dense = time_dense.union(pd.DatetimeIndex(time))
 
-            return homogenize(time_dense, sort_func=date_string_to_datetime_obj)
+            return homogenize(sort_dates(time_dense), sort=False)
                 
     #
     # Public methods
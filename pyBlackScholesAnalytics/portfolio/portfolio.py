@@ -7,16 +7,27 @@ Created on Tue Jul 14 2020 - Version: 1.0
 
 Description: 
     
-This file contains the definition of Portfolio class.
+This file contains the definition of Portfolio and OptionBook classes.
 """
 
 # ----------------------- standard imports ---------------------------------- #
 # for NumPy arrays
 import numpy as np
 
+# for Pandas DatetimeIndex
+import pandas as pd
+
 # ----------------------- sub-modules imports ------------------------------- #
 
 from utils.utils import *
+from utils.cache import LRUCache, cached_metrics
+from utils.dates import to_datetime64, to_holidays, sort_dates, year_fraction, DAY_COUNT_CONVENTIONS
+from utils.labeled_array import LabeledArray
+from utils.autodiff import Tape, AdjointArray
+from options.options import PlainVanillaOption, DigitalOption
+
+# for the standard normal cdf
+from scipy.special import ndtr
 
 #-----------------------------------------------------------------------------#
 
@@ -31,11 +42,16 @@ class Portfolio:
     
         composition (List of Dicts): List of Dicts, each describing a single constituent FinancialInstrument, together
                                      with the position the portfolio is holding on it.
+        netted_composition (Dict):   Canonical netted view of the composition: one entry for each distinct contract,
+                                     keyed by current contract terms, with positions aggregated. Used for pricing.
+                                     It is rebuilt whenever a constituent instrument is added or modified.
         info and mkt_info (Strings): information labels on portfolio and constituent instruments.
         S (Float):                   underlying value when the portfolio is formed.
         K (np.ndarray):              Strikes of constituent options.
         tau (np.ndarray):            Time(s) to maturity of constituent options, when the portfolio is formed.
         is_multi_horizon (Bool):     True if constituent options have different expiration dates.
+        mkt_env (MarketEnvironment): Optional. If given, the portfolio is bound to it: market attributes (t, S, sigma, r) 
+                                     are read from it and setters are forwarded to it.
         
     Public Methods:
     --------
@@ -68,6 +84,25 @@ class Portfolio:
         rho: float
             Computes the Black-Scholes rho of the portfolio.
 
+        vanna, volga, charm, speed, color: float
+            Computes the Black-Scholes higher-order greeks of the portfolio.
+
+        higher_order_risk: dict
+            Computes all the higher-order greeks of the portfolio in a single pass.
+
+        risk: dict
+            Computes the Black-Scholes value and all the greeks of the portfolio in a single pass.
+
+        grid: dict
+            Computes value and/or greeks of the portfolio on an N-dimensional grid of scenarios.
+
+        adjoint_risk: dict
+            Computes the sensitivities of the portfolio value to the inputs of each contract 
+            (or bucket of contracts), in adjoint mode on the equivalent OptionBook.
+
+        enable_cache, disable_cache, get_cache_info, invalidate_cache
+            Opt-in memoization of payoff, price, PnL, greeks and risk methods.
+
     Instantiation and Usage examples: 
     --------   
         
@@ -81,11 +116,19 @@ class Portfolio:
 
     """
     
-    def __init__(self, name="Dummy"):
+    def __init__(self, name="Dummy", mkt_env=None):
+        
+        # optional live binding to a market environment
+        self.__mkt_env = mkt_env
         
         # initialize an empty portfolio
         self.__composition = []
         
+        # netted view of the portfolio (built on first access) and 
+        # state versions of the instruments it refers to
+        self.__netted_composition = None
+        self.__netting_versions = None
+        
         # initialize empty info strings
         self.__info = "{} Portfolio: \n".format(name)
         self.__mkt_info = None
@@ -102,6 +145,10 @@ class Portfolio:
         self.is_multi_strike = False
         self.is_empty = True
         
+        # results cache (disabled by default) and version of the portfolio state
+        self.__cache = None
+        self.__state_version = 0
+        
     def __repr__(self):
         return self.get_info()
     
@@ -116,7 +163,7 @@ class Portfolio:
         return self.__mkt_info
     
     def get_t(self):
-        return self.__t
+        return self.__mkt_env.get_t() if self.__mkt_env is not None else self.__t
     
     def get_T(self):
         return scalarize(self.__T)
@@ -125,13 +172,16 @@ class Portfolio:
         return self.__K
     
     def get_S(self):
-        return self.__S
+        return self.__mkt_env.get_S() if self.__mkt_env is not None else self.__S
 
     def get_sigma(self):
-        return self.__sigma
+        return self.__mkt_env.get_sigma() if self.__mkt_env is not None else self.__sigma
 
     def get_r(self):
-        return self.__r
+        return self.__mkt_env.get_r() if self.__mkt_env is not None else self.__r
+
+    def get_mkt_env(self):
+        return self.__mkt_env
 
     def get_tau(self):
         return self.__tau
@@ -139,21 +189,80 @@ class Portfolio:
     def get_composition(self):
         return self.__composition
     
+    def get_netted_composition(self):
+        # constituents may have been modified since the netted view was built
+        versions = tuple([inst["instrument"].get_state_version() for inst in self.__composition])
+        if (self.__netted_composition is None) or (versions != self.__netting_versions):
+            self.__netted_composition = self.__net_composition()
+            self.__netting_versions = versions
+        return list(self.__netted_composition.values())
+
+    def get_cache(self):
+        return self.__cache
+    
+    def get_state_version(self):
+        # the portfolio state includes the state of the bound market environment 
+        # (if any) and of constituent instruments
+        return (self.__state_version, 
+                self.__mkt_env.get_version() if self.__mkt_env is not None else None,
+                tuple([inst["instrument"].get_state_version() for inst in self.__composition]))
+    
     #
-    # setters
+    # setters (forwarded to the bound market environment, if any)
     #
     
     def set_t(self, t):
-        self.__t = t
+        if self.__mkt_env is not None:
+            self.__mkt_env.set_t(t)
+        else:
+            self.__t = t
+        self.invalidate_cache()
         
     def set_S(self, S):
-        self.__S = S
+        if self.__mkt_env is not None:
+            self.__mkt_env.set_S(S)
+        else:
+            self.__S = S
+        self.invalidate_cache()
         
     def set_sigma(self, sigma):
-        self.__sigma = sigma
+        if self.__mkt_env is not None:
+            self.__mkt_env.set_sigma(sigma)
+        else:
+            self.__sigma = sigma
+        self.invalidate_cache()
 
     def set_r(self, r):
-        self.__r = r
+        if self.__mkt_env is not None:
+            self.__mkt_env.set_r(r)
+        else:
+            self.__r = r
+        self.invalidate_cache()
+
+    #
+    # results cache methods
+    #
+    
+    def enable_cache(self, max_entries=128, max_bytes=64*1024**2):
+        """
+        Enables memoization of pricing methods (payoff, price, PnL, greeks and risk) 
+        in a bounded LRU cache, keyed on the parameters in input. 
+        The cache is invalidated whenever the portfolio, or one of its instruments, is modified.
+        """
+        self.__cache = LRUCache(max_entries=max_entries, max_bytes=max_bytes)
+
+    def disable_cache(self):
+        self.__cache = None
+        
+    def get_cache_info(self):
+        """Returns hits, misses, number of entries and size in bytes of the cache (None if disabled)."""
+        return self.__cache.info() if self.__cache is not None else None
+    
+    def invalidate_cache(self):
+        """Marks the portfolio state as changed and clears stored results."""
+        self.__state_version += 1
+        if self.__cache is not None:
+            self.__cache.clear()
 
     #
     # Composition method
@@ -170,6 +279,12 @@ class Portfolio:
         self.__composition.append({"instrument": FinancialInstrument,
                                    "position":   position,
                                    "info":       instrument_info})
+        
+        # the netted view of the portfolio is rebuilt on next access
+        self.__netted_composition = None
+        
+        # stored results refer to the previous composition
+        self.invalidate_cache()
             
         # update portfolio info strings
         self.__update_info(FinancialInstrument, position)
@@ -187,6 +302,39 @@ class Portfolio:
     # Private methods
     #
     
+    def __contract_key(self, fin_inst):
+        """
+        Current contract terms identifying an instrument: identical contracts are netted together.
+        Options bound to a market environment (live market) are netted only with options bound
+        to the same market environment.
+        """
+        return (type(fin_inst).__name__, 
+                fin_inst.get_type(), 
+                fin_inst.get_K(), 
+                fin_inst.get_T(), 
+                fin_inst.get_tau(),
+                fin_inst.get_day_count(),
+                fin_inst.get_Q() if hasattr(fin_inst, "get_Q") else None,
+                fin_inst.get_S(), 
+                fin_inst.get_sigma(), 
+                fin_inst.get_r(),
+                id(fin_inst.get_mkt_env()) if fin_inst.get_mkt_env() is not None else None)
+    
+    def __net_composition(self):
+        """Returns the netted view of the composition, keyed by current contract terms."""
+        
+        netted_composition = {}
+        
+        for inst in self.__composition:
+            key = self.__contract_key(inst["instrument"])
+            if key in netted_composition:
+                netted_composition[key]["position"] += inst["position"]
+            else:
+                netted_composition[key] = {"instrument": inst["instrument"],
+                                           "position":   inst["position"]}
+                
+        return netted_composition
+    
     def __update_info(self, fin_inst, pos):
         self.__info += self.__composition[-1]["info"] + "\n"
         if self.__mkt_info is None:
@@ -203,7 +351,7 @@ class Portfolio:
     def __update_T(self, fin_inst):
         expiration_dates = np.append(self.get_T(), fin_inst.get_T())
         # filter only distinct strikes
-        self.__T = iterable_to_numpy_array(np.unique(expiration_dates), sort_func=date_string_to_datetime_obj)
+        self.__T = sort_dates(np.unique(expiration_dates))
         # check if the portfolio is a multi-horizon portfolio
         if len(self.__T) > 1:
             self.is_multi_horizon = True
@@ -295,6 +443,7 @@ class Portfolio:
         else:
             return self.get_composition()[0]["instrument"].time_to_maturity(*args, **kwargs)
             
+    @cached_metrics
     def payoff(self, *args, **kwargs):
         """
         Returns the portfolio payoff as the scalar product (i.e. sum of elementwise products) 
@@ -308,8 +457,9 @@ class Portfolio:
         self.check_parameters(*args, **kwargs)
 
         # portfolio payoff is the sum position * instrument_payoff
-        return sum([inst["position"]*inst["instrument"].payoff(*args, **kwargs) for inst in self.get_composition()])
+        return sum([inst["position"]*inst["instrument"].payoff(*args, **kwargs) for inst in self.get_netted_composition()])
               
+    @cached_metrics
     def price(self, *args, **kwargs):
         """
         Returns the portfolio value as the scalar product (i.e. sum of elementwise products) 
@@ -323,8 +473,9 @@ class Portfolio:
         self.check_parameters(*args, **kwargs)
         
         # portfolio price is the sum position * instrument_price
-        return sum([inst["position"]*inst["instrument"].price(*args, **kwargs) for inst in self.get_composition()])
+        return sum([inst["position"]*inst["instrument"].price(*args, **kwargs) for inst in self.get_netted_composition()])
                                       
+    @cached_metrics
     def PnL(self, *args, **kwargs):
         """
         Returns the portfolio Profit & Loss as the scalar product (i.e. sum of elementwise products) 
@@ -338,8 +489,9 @@ class Portfolio:
         self.check_parameters(*args, **kwargs)
 
         # portfolio P&L is the sum position * instrument_payoff
-        return sum([inst["position"]*inst["instrument"].PnL(*args, **kwargs) for inst in self.get_composition()])
+        return sum([inst["position"]*inst["instrument"].PnL(*args, **kwargs) for inst in self.get_netted_composition()])
 
+    @cached_metrics
     def delta(self, *args, **kwargs):
         """
         Returns the portfolio Delta as the scalar product (i.e. sum of elementwise products) 
@@ -353,8 +505,9 @@ class Portfolio:
         self.check_parameters(*args, **kwargs)
 
         # portfolio delta is the sum position * instrument_payoff
-        return sum([inst["position"]*inst["instrument"].delta(*args, **kwargs) for inst in self.get_composition()])
+        return sum([inst["position"]*inst["instrument"].delta(*args, **kwargs) for inst in self.get_netted_composition()])
 
+    @cached_metrics
     def theta(self, *args, **kwargs):
         """
         Returns the portfolio Theta as the scalar product (i.e. sum of elementwise products) 
@@ -368,8 +521,9 @@ class Portfolio:
         self.check_parameters(*args, **kwargs)
 
         # portfolio theta is the sum position * instrument_payoff
-        return sum([inst["position"]*inst["instrument"].theta(*args, **kwargs) for inst in self.get_composition()])
+        return sum([inst["position"]*inst["instrument"].theta(*args, **kwargs) for inst in self.get_netted_composition()])
 
+    @cached_metrics
     def gamma(self, *args, **kwargs):
         """
         Returns the portfolio Gamma as the scalar product (i.e. sum of elementwise products) 
@@ -383,8 +537,9 @@ class Portfolio:
         self.check_parameters(*args, **kwargs)
 
         # portfolio gamma is the sum position * instrument_payoff
-        return sum([inst["position"]*inst["instrument"].gamma(*args, **kwargs) for inst in self.get_composition()])
+        return sum([inst["position"]*inst["instrument"].gamma(*args, **kwargs) for inst in self.get_netted_composition()])
 
+    @cached_metrics
     def vega(self, *args, **kwargs):
         """
         Returns the portfolio Vega as the scalar product (i.e. sum of elementwise products) 
@@ -398,8 +553,9 @@ class Portfolio:
         self.check_parameters(*args, **kwargs)
 
         # portfolio vega is the sum position * instrument_payoff
-        return sum([inst["position"]*inst["instrument"].vega(*args, **kwargs) for inst in self.get_composition()])
+        return sum([inst["position"]*inst["instrument"].vega(*args, **kwargs) for inst in self.get_netted_composition()])
 
+    @cached_metrics
     def rho(self, *args, **kwargs):
         """
         Returns the portfolio Rho as the scalar product (i.e. sum of elementwise products) 
@@ -413,4 +569,723 @@ class Portfolio:
         self.check_parameters(*args, **kwargs)
 
         # portfolio rho is the sum position * instrument_payoff
-        return sum([inst["position"]*inst["instrument"].rho(*args, **kwargs) for inst in self.get_composition()])
+        return sum([inst["position"]*inst["instrument"].rho(*args, **kwargs) for inst in self.get_netted_composition()])
+
+    @cached_metrics
+    def vanna(self, *args, **kwargs):
+        """
+        Returns the portfolio Vanna as the scalar product (i.e. sum of elementwise products) 
+        between single instrument Vannas and positions.
+        
+        Can be called with the same signature of the .vanna() public method of
+        constituent options.
+        """
+                
+        # check parameters
+        self.check_parameters(*args, **kwargs)
+
+        # portfolio vanna is the sum position * instrument_vanna
+        return sum([inst["position"]*inst["instrument"].vanna(*args, **kwargs) for inst in self.get_netted_composition()])
+
+    @cached_metrics
+    def volga(self, *args, **kwargs):
+        """
+        Returns the portfolio Volga as the scalar product (i.e. sum of elementwise products) 
+        between single instrument Volgas and positions.
+        
+        Can be called with the same signature of the .volga() public method of
+        constituent options.
+        """
+                
+        # check parameters
+        self.check_parameters(*args, **kwargs)
+
+        # portfolio volga is the sum position * instrument_volga
+        return sum([inst["position"]*inst["instrument"].volga(*args, **kwargs) for inst in self.get_netted_composition()])
+
+    @cached_metrics
+    def charm(self, *args, **kwargs):
+        """
+        Returns the portfolio Charm as the scalar product (i.e. sum of elementwise products) 
+        between single instrument Charms and positions.
+        
+        Can be called with the same signature of the .charm() public method of
+        constituent options.
+        """
+                
+        # check parameters
+        self.check_parameters(*args, **kwargs)
+
+        # portfolio charm is the sum position * instrument_charm
+        return sum([inst["position"]*inst["instrument"].charm(*args, **kwargs) for inst in self.get_netted_composition()])
+
+    @cached_metrics
+    def speed(self, *args, **kwargs):
+        """
+        Returns the portfolio Speed as the scalar product (i.e. sum of elementwise products) 
+        between single instrument Speeds and positions.
+        
+        Can be called with the same signature of the .speed() public method of
+        constituent options.
+        """
+                
+        # check parameters
+        self.check_parameters(*args, **kwargs)
+
+        # portfolio speed is the sum position * instrument_speed
+        return sum([inst["position"]*inst["instrument"].speed(*args, **kwargs) for inst in self.get_netted_composition()])
+
+    @cached_metrics
+    def color(self, *args, **kwargs):
+        """
+        Returns the portfolio Color as the scalar product (i.e. sum of elementwise products) 
+        between single instrument Colors and positions.
+        
+        Can be called with the same signature of the .color() public method of
+        constituent options.
+        """
+                
+        # check parameters
+        self.check_parameters(*args, **kwargs)
+
+        # portfolio color is the sum position * instrument_color
+        return sum([inst["position"]*inst["instrument"].color(*args, **kwargs) for inst in self.get_netted_composition()])
+
+    @cached_metrics
+    def higher_order_risk(self, *args, **kwargs):
+        """
+        Returns all the higher-order greeks of the portfolio as a dictionary. Each entry is 
+        the scalar product (i.e. sum of elementwise products) between single 
+        instrument entries and positions. Each instrument is processed in a single pass.
+        
+        Can be called with the same signature of the .higher_order_risk() public method of
+        constituent options.
+        """
+                
+        # check parameters
+        self.check_parameters(*args, **kwargs)
+
+        # single instrument higher-order greeks, weighted by position
+        instruments_greeks = [(inst["position"], inst["instrument"].higher_order_risk(*args, **kwargs)) for inst in self.get_netted_composition()]
+
+        # portfolio entries are the sum position * instrument_entry (zero for an empty portfolio)
+        return {greek: sum([position*inst_greeks[greek] for position, inst_greeks in instruments_greeks]) 
+                for greek in ["vanna", "volga", "charm", "speed", "color"]}
+
+    def adjoint_risk(self, by=None, **kwargs):
+        """
+        Returns the sensitivities of the portfolio value to the inputs of each 
+        distinct contract of its netted composition (or bucket of contracts, 
+        e.g. by='K' for per-strike and by='T' for per-expiry buckets), computed 
+        in adjoint mode on the equivalent OptionBook (see OptionBook.from_portfolio() 
+        class method for supported portfolios).
+        
+        Can be called with the same signature of the .adjoint_risk() public method 
+        of OptionBook class.
+        """
+        
+        return OptionBook.from_portfolio(self).adjoint_risk(by=by, **kwargs)
+        
+    @cached_metrics
+    def risk(self, *args, **kwargs):
+        """
+        Returns the portfolio value and all the greeks as a dictionary. Each entry is 
+        the scalar product (i.e. sum of elementwise products) between single 
+        instrument entries and positions. Each instrument is processed in a single pass.
+        
+        Can be called with the same signature of the .risk() public method of
+        constituent options.
+        """
+                
+        # check parameters
+        self.check_parameters(*args, **kwargs)
+
+        # single instrument price and greeks, weighted by position
+        instruments_risk = [(inst["position"], inst["instrument"].risk(*args, **kwargs)) for inst in self.get_netted_composition()]
+
+        # portfolio entries are the sum position * instrument_entry (zero for an empty portfolio)
+        return {metrics: sum([position*inst_risk[metrics] for position, inst_risk in instruments_risk]) 
+                for metrics in ["price", "delta", "theta", "gamma", "vega", "rho"]}
+
+    def grid(self, metrics="price", **kwargs):
+        """
+        Returns value and/or greeks of the portfolio on the N-dimensional grid of 
+        scenarios spanned by any subset of the pricing parameters, as a dictionary 
+        with keys 'values' and 'axes'. Values are the sum of elementwise products 
+        between single instrument values and positions.
+        
+        Can be called with the same signature of the .grid() public method of
+        constituent options (np_output=False labels values as LabeledArrays).
+        """
+                
+        # check parameters
+        self.check_parameters(**kwargs)
+        
+        # constituents grids are computed as np.ndarrays, labels are attached at the end
+        np_output = kwargs.pop("np_output", True)
+
+        # single instrument grids, weighted by position
+        instruments_grid = [(inst["position"], inst["instrument"].grid(metrics, **kwargs)) for inst in self.get_netted_composition()]
+        
+        # empty portfolio: zero values (as .price() method) on the axes given in input
+        if len(instruments_grid) == 0:
+            axes = [(name, np.asarray(homogenize(kwargs[name], sort=False))) for name in kwargs 
+                    if name in ["S", "K", "t", "tau", "sigma", "r"] and is_iterable_not_string(kwargs[name])]
+            zeros = np.zeros(tuple(len(values) for name, values in axes))
+            instruments_grid = [(0.0, {"values": zeros if isinstance(metrics, str) else {m: zeros for m in metrics}, 
+                                       "axes": axes})]
+        
+        axes = instruments_grid[0][1]["axes"]
+        
+        if isinstance(metrics, str):
+            values = sum([position*inst_grid["values"] for position, inst_grid in instruments_grid])
+        else:
+            values = {m: sum([position*inst_grid["values"][m] for position, inst_grid in instruments_grid]) for m in metrics}
+
+        # labelling output as LabeledArray, if necessary
+        if not np_output:
+            values = LabeledArray(values, axes) if isinstance(metrics, str) else {m: LabeledArray(values[m], axes) for m in values}
+
+        return {"values": values, 
+                "axes": axes}
+
+#-----------------------------------------------------------------------------#
+
+class OptionBook:
+    """
+    OptionBook class modeling a (possibly very large) book of plain-vanilla and digital options 
+    on the same underlying. Differently from Portfolio class, legs are not stored as a List of 
+    option objects, but as contiguous NumPy arrays (columns), one for each contract term. 
+    The whole book is priced (or risked) with one vectorized kernel call per option style and 
+    a np.dot (or np.bincount, if values are aggregated by bucket) reduction over positions.
+    
+    Attributes:
+    -----------
+    
+        t (dt.datetime):          valuation date.
+        S (Float):                underlying value.
+        sigma (Float):            volatility of the underlying.
+        r (Float):                continuously compounded short-rate.
+        is_call (np.ndarray):     True for call legs, False for put legs.
+        is_digital (np.ndarray):  True for digital (CON) legs, False for plain-vanilla legs.
+        K (np.ndarray):           Strikes of the legs.
+        T (np.ndarray):           Expiration dates of the legs (as np.datetime64).
+        Q (np.ndarray):           Cash amounts of the legs (1.0 for plain-vanilla legs).
+        position (np.ndarray):    Positions held on the legs.
+        day_count (np.ndarray):   Day-count conventions of the times-to-maturity of the legs.
+        holidays (np.ndarray):    Holidays calendars (as np.ndarray of np.datetime64) of the legs.
+        
+    Public Methods:
+    --------
+    
+        getters for all attributes
+        
+        setters for market attributes
+        
+        add_legs: 
+            Appends a batch of legs to the book.
+            
+        from_portfolio: OptionBook
+            Class method. Creates an OptionBook from an existing Portfolio.
+
+        time_to_maturity: np.ndarray
+            Computes the times-to-maturity of the legs.
+
+        price: float or np.ndarray
+            Computes the Black-Scholes value of the book.
+            
+        risk: dict
+            Computes the Black-Scholes value and all the greeks of the book.
+
+        legs_price_kernel: np.ndarray (or AdjointArray)
+            Computes the Black-Scholes value of the legs, from arithmetic operators and ufuncs only.
+
+        adjoint_risk: dict
+            Computes the sensitivities of the book value to the inputs of each leg 
+            (or bucket of legs), in adjoint mode.
+
+    Instantiation and Usage examples: 
+    --------   
+        
+        - example_option_book.py
+        
+        - default: OptionBook() is an empty book, with no market attributes. 
+        - general: OptionBook(mkt_env=MarketEnvironment, name=String)
+    """
+    
+    def __init__(self, mkt_env=None, name="Dummy"):
+        
+        # initialize an empty book
+        self.__name = name
+        self.__is_call = np.array([], dtype=bool)
+        self.__is_digital = np.array([], dtype=bool)
+        self.__K = np.array([], dtype=float)
+        self.__T = np.array([], dtype='datetime64[D]')
+        self.__Q = np.array([], dtype=float)
+        self.__position = np.array([], dtype=float)
+        self.__day_count = np.array([], dtype=str)
+        
+        # holidays calendars are shared by legs: distinct calendars and their index for each leg
+        self.__calendars = []
+        self.__calendar = np.array([], dtype=int)
+        
+        # initialize market attributes
+        self.__t = mkt_env.get_t() if mkt_env is not None else None
+        self.__S = mkt_env.get_S() if mkt_env is not None else None
+        self.__sigma = mkt_env.get_sigma() if mkt_env is not None else None
+        self.__r = mkt_env.get_r() if mkt_env is not None else None
+        
+    def __repr__(self):
+        return r"OptionBook('{}', legs={}, S_t={}, r={}, sigma={}, t={})".\
+                format(self.__name, len(self.__K), self.get_S(), self.get_r(), self.get_sigma(), 
+                       datetime_obj_to_date_string(self.get_t()))
+    
+    # 
+    # getters
+    #
+    
+    def get_name(self):
+        return self.__name
+
+    def get_t(self):
+        return self.__t
+    
+    def get_S(self):
+        return self.__S
+
+    def get_sigma(self):
+        return self.__sigma
+
+    def get_r(self):
+        return self.__r
+
+    def get_type(self):
+        return np.where(self.__is_call, 'call', 'put')
+
+    def get_is_call(self):
+        return self.__is_call
+
+    def get_is_digital(self):
+        return self.__is_digital
+
+    def get_K(self):
+        return self.__K
+
+    def get_T(self):
+        return self.__T
+
+    def get_Q(self):
+        return self.__Q
+
+    def get_position(self):
+        return self.__position
+
+    def get_day_count(self):
+        return self.__day_count
+
+    def get_holidays(self):
+        holidays = np.empty(len(self.__calendar), dtype=object)
+        holidays[:] = [self.__calendars[i] for i in self.__calendar]
+        return holidays
+    
+    #
+    # setters
+    #
+    
+    def set_t(self, t):
+        self.__t = date_string_to_datetime_obj(t)
+        
+    def set_S(self, S):
+        self.__S = S
+        
+    def set_sigma(self, sigma):
+        self.__sigma = sigma
+
+    def set_r(self, r):
+        self.__r = r
+
+    #
+    # Composition methods
+    #
+    
+    def add_legs(self, option_type, K, T, position, style='plain_vanilla', cash_amount=1.0, 
+                 day_count='ACT/365', holidays=None):
+        """
+        Appends a batch of legs to the book. Parameters are broadcast together, 
+        so that each of them can be either a scalar (common to all legs) or an 
+        Iterable (one value per leg):
+            
+            - option_type: 'call' or 'put' String(s);
+            - K: strike(s);
+            - T: expiration date(s), either 'dd-mm-YYYY' String(s) or dt.datetime object(s);
+            - position: position(s) held;
+            - style: 'plain_vanilla' or 'digital' String(s);
+            - cash_amount: cash amount(s) of digital legs (ignored for plain-vanilla legs);
+            - day_count: day-count convention(s) of the times-to-maturity, 'ACT/365', 
+              'ACT/360' or 'BUS/252' (see year_fraction() function).
+            
+        The holidays calendar (an Iterable of dates, or None), used by 'BUS/252' legs only, 
+        is common to all the legs of the batch.
+        """
+
+        # option type and style checks
+        option_type = np.asarray(option_type)
+        style = np.asarray(style)
+        invalid_types = np.setdiff1d(option_type, ['call', 'put'])
+        if len(invalid_types) > 0:
+            raise NotImplementedError("Option Type: '{}' does not exist!".format(invalid_types[0]))
+        invalid_styles = np.setdiff1d(style, ['plain_vanilla', 'digital'])
+        if len(invalid_styles) > 0:
+            raise NotImplementedError("Option Style: '{}' does not exist!".format(invalid_styles[0]))
+        
+        # day-count convention check
+        day_count = np.asarray(day_count)
+        invalid_day_counts = np.setdiff1d(day_count, list(DAY_COUNT_CONVENTIONS))
+        if len(invalid_day_counts) > 0:
+            raise NotImplementedError("Day-count convention: '{}' does not exist!".format(invalid_day_counts[0]))
+            
+        # expiration dates as np.datetime64 (days)
+        T = to_datetime64(T).astype('datetime64[D]')
+        
+        # broadcast legs terms together
+        is_call, is_digital, K, T, Q, position, day_count = np.broadcast_arrays(option_type == 'call', 
+                                                                                style == 'digital', 
+                                                                                np.asarray(K, dtype=float),
+                                                                                T, 
+                                                                                np.asarray(cash_amount, dtype=float),
+                                                                                np.asarray(position, dtype=float),
+                                                                                day_count)
+        
+        # holidays calendar of the batch, stored once
+        holidays = to_holidays(holidays)
+        calendar = next((i for i, cal in enumerate(self.__calendars) if np.array_equal(cal, holidays)), None)
+        if calendar is None:
+            calendar = len(self.__calendars)
+            self.__calendars.append(holidays)
+
+        # append to the columns
+        self.__is_call = np.append(self.__is_call, is_call)
+        self.__is_digital = np.append(self.__is_digital, is_digital)
+        self.__K = np.append(self.__K, K)
+        self.__T = np.append(self.__T, T)
+        self.__Q = np.append(self.__Q, np.where(is_digital, Q, 1.0))
+        self.__position = np.append(self.__position, position)
+        self.__day_count = np.append(self.__day_count, day_count)
+        self.__calendar = np.append(self.__calendar, np.full(position.shape, calendar))
+        
+    @classmethod
+    def from_portfolio(cls, portfolio, name="Dummy"):
+        """
+        Creates an OptionBook from an existing Portfolio, taking market attributes from 
+        the portfolio and one leg for each distinct contract of its netted composition, 
+        with its own day-count convention and holidays calendar.
+        
+        Market attributes are common to all the legs of a book: portfolios whose contracts 
+        are not all priced on the market of the portfolio (e.g. options bound to different 
+        market environments) are not supported.
+        """
+        
+        book = cls(name=name)
+        
+        # market attributes 
+        book.set_t(portfolio.get_t())
+        book.set_S(portfolio.get_S())
+        book.set_sigma(portfolio.get_sigma())
+        book.set_r(portfolio.get_r())
+        
+        composition = portfolio.get_netted_composition()
+        instruments = [inst["instrument"] for inst in composition]
+        
+        # market check
+        for inst in instruments:
+            if not all(np.array_equal(getattr(inst, getter)(), getattr(portfolio, getter)()) 
+                       for getter in ["get_t", "get_S", "get_sigma", "get_r"]):
+                raise NotImplementedError("OptionBook from Portfolio of options on different markets not available: "\
+                                          "\n\n instrument: {}, \n\n portfolio: {}".format(inst, portfolio))
+        
+        # legs, one batch for each run of contracts sharing the same holidays calendar
+        start = 0
+        while start < len(composition):
+            holidays = to_holidays(instruments[start].get_holidays())
+            end = start + 1
+            while end < len(composition) and np.array_equal(to_holidays(instruments[end].get_holidays()), holidays):
+                end += 1
+                
+            batch = instruments[start:end]
+            is_digital = [isinstance(inst, DigitalOption) for inst in batch]
+            book.add_legs(option_type=[inst.get_type() for inst in batch], 
+                          K=[inst.get_K() for inst in batch], 
+                          T=[inst.get_T() for inst in batch], 
+                          position=[inst["position"] for inst in composition[start:end]], 
+                          style=np.where(is_digital, 'digital', 'plain_vanilla'),
+                          cash_amount=[inst.get_Q() if digital else 1.0 for inst, digital in zip(batch, is_digital)],
+                          day_count=[inst.get_day_count() for inst in batch],
+                          holidays=holidays)
+            start = end
+        
+        return book
+        
+    #
+    # Public methods
+    #
+    
+    def time_to_maturity(self, t=None):
+        """
+        Computes the times-to-maturity (in years) of the legs at the valuation 
+        date t (default: .get_t()), under the day-count convention (and holidays 
+        calendar) of each leg. Legs are processed one group per convention and calendar.
+        """
+        
+        t = to_datetime64(self.get_t() if t is None else t).astype('datetime64[D]')
+        
+        tau = np.empty(self.__T.shape, dtype=float)
+        
+        for day_count in np.unique(self.__day_count):
+            for calendar in np.unique(self.__calendar):
+                legs = (self.__day_count == day_count) & (self.__calendar == calendar)
+                if legs.any():
+                    tau[legs] = year_fraction(t, self.__T[legs], day_count=day_count, 
+                                              holidays=self.__calendars[calendar])
+        
+        return tau
+    
+    def process_pricing_parameters(self, **kwargs):
+        """
+        Utility method to parse underlying, time, volatility and short-rate parameters. 
+        
+        Underlying, volatility and short-rate can be scalars or Iterables of market 
+        scenarios, broadcast together. Time parameter 't' can be a valuation date only.
+        Parameters are reshaped to be broadcast against legs columns.
+        
+        Parameters (and strikes and cash amounts of the legs) are cast to the floating-point 
+        data-type of the 'dtype' keyboard parameter (default: library-wide one, see 
+        set_float_dtype(), or float64).
+        """
+        
+        # floating-point data-type
+        dtype = float_dtype(kwargs['dtype'] if 'dtype' in kwargs else None) or np.dtype(float)
+        
+        # market scenarios
+        S = np.asarray(kwargs['S'] if 'S' in kwargs else self.get_S(), dtype=dtype)
+        sigma = np.asarray(kwargs['sigma'] if 'sigma' in kwargs else self.get_sigma(), dtype=dtype)
+        r = np.asarray(kwargs['r'] if 'r' in kwargs else self.get_r(), dtype=dtype)
+        
+        # times-to-maturity of the legs
+        tau = self.time_to_maturity(t=kwargs['t'] if 't' in kwargs else None).astype(dtype, copy=False)
+        
+        # scenarios shape
+        scenarios_shape = np.broadcast(S, sigma, r).shape
+        
+        # a trailing axis to broadcast scenarios against legs
+        return {"S": S[..., np.newaxis], 
+                "tau": tau, 
+                "sigma": sigma[..., np.newaxis], 
+                "r": r[..., np.newaxis],
+                "K": self.__K.astype(dtype, copy=False),
+                "Q": self.__Q.astype(dtype, copy=False),
+                "scenarios_shape": scenarios_shape}
+
+    def aggregate(self, legs_values, by=None, weighted=True):
+        """
+        Aggregates values of the legs (last axis of legs_values) weighting them by position 
+        (if weighted, otherwise values are just summed). 
+        
+        If by is None, the total value is returned (np.dot reduction). Otherwise 
+        values are aggregated by bucket (np.bincount reduction), where by can be 
+        either 'K' or 'T' (to aggregate by distinct strike or expiration date) or an 
+        Iterable of bucket labels (one for each leg). In this case, the last axis of 
+        the output is spanned by the (sorted) distinct bucket labels.
+        """
+
+        weights = self.__position if weighted else np.ones(len(self.__position))
+        
+        # in the floating-point data-type of the values
+        weights = weights.astype(legs_values.dtype, copy=False)
+
+        if by is None:
+            return legs_values.dot(weights)
+
+        # bucket labels of the legs: by strike, by expiration date or given (one for each leg)
+        if isinstance(by, str):
+            if by not in ['K', 'T']:
+                raise ValueError("Aggregation by '{}' not recognized. Valid aggregations: 'K', 'T' or an Iterable of labels".format(by))
+            labels = self.__K if by == 'K' else self.__T
+        else:
+            labels = np.asarray(by)
+            if labels.shape != self.__position.shape:
+                raise ValueError("{} bucket labels given for {} legs".format(labels.size, len(self.__position)))
+        
+        # distinct buckets and index of the bucket of each leg
+        buckets, bucket_index = np.unique(labels, return_inverse=True)
+        n_buckets = len(buckets)
+        
+        # flattened scenarios, each with its own set of buckets
+        weighted_values = (legs_values * weights).reshape((-1, len(self.__position)))
+        n_scenarios = weighted_values.shape[0]
+        scenario_bucket_index = np.arange(n_scenarios)[:, np.newaxis] * n_buckets + bucket_index
+        
+        bucket_values = np.bincount(scenario_bucket_index.ravel(), 
+                                    weights=weighted_values.ravel(), 
+                                    minlength=n_scenarios * n_buckets)
+        
+        return bucket_values.reshape(legs_values.shape[:-1] + (n_buckets,)).astype(legs_values.dtype, copy=False)
+
+    def price(self, by=None, **kwargs):
+        """
+        Returns the Black-Scholes value of the book. 
+        
+        Optional keyboard parameters are:
+            
+            - S, sigma, r: scalar or Iterable market scenarios (default: market attributes);
+            - t: valuation date (default: .get_t());
+            - by: aggregation buckets (see .aggregate() method; default: total value).
+            
+        Returns a float (or a np.ndarray shaped as the market scenarios, with an 
+        additional last axis of buckets if by is not None).
+        """
+        
+        param_dict = self.process_pricing_parameters(**kwargs)
+        S, tau, sigma, r = param_dict["S"], param_dict["tau"], param_dict["sigma"], param_dict["r"]
+        K, Q = param_dict["K"], param_dict["Q"]
+        
+        # legs values, one vectorized kernel call per style
+        legs_price = np.empty(param_dict["scenarios_shape"] + K.shape, dtype=K.dtype)
+        
+        vanilla = ~self.__is_digital
+        legs_price[..., vanilla] = PlainVanillaOption.price_arrays(S=S, K=K[vanilla], tau=tau[vanilla], 
+                                                                   sigma=sigma, r=r, is_call=self.__is_call[vanilla])
+
+        digital = self.__is_digital
+        legs_price[..., digital] = DigitalOption.price_arrays(S=S, K=K[digital], tau=tau[digital], 
+                                                              sigma=sigma, r=r, is_call=self.__is_call[digital], 
+                                                              Q=Q[digital])
+        
+        return scalarize(self.aggregate(legs_price, by=by))
+    
+    def risk(self, by=None, **kwargs):
+        """
+        Returns the Black-Scholes value and all the greeks of the book as a 
+        dictionary with keys 'price', 'delta', 'theta', 'gamma', 'vega' and 'rho'.
+        
+        Can be called with the same signature of the .price() public method.
+        Greeks are rescaled as .risk() method of EuropeanOption class: theta 
+        to +1 calendar day, vega and rho to +1% variations.
+        """
+        
+        param_dict = self.process_pricing_parameters(**kwargs)
+        S, tau, sigma, r = param_dict["S"], param_dict["tau"], param_dict["sigma"], param_dict["r"]
+        K, Q = param_dict["K"], param_dict["Q"]
+
+        # rescaling factors
+        rescaling_factors = {"price": 1.0, "delta": 1.0, "theta": 1.0/365.0, "gamma": 1.0, "vega": 0.01, "rho": 0.01}
+
+        # legs values, one vectorized kernel call per style
+        vanilla = ~self.__is_digital
+        vanilla_risk = PlainVanillaOption.risk_arrays(S=S, K=K[vanilla], tau=tau[vanilla], 
+                                                      sigma=sigma, r=r, is_call=self.__is_call[vanilla])
+        
+        digital = self.__is_digital
+        digital_risk = DigitalOption.risk_arrays(S=S, K=K[digital], tau=tau[digital], 
+                                                 sigma=sigma, r=r, is_call=self.__is_call[digital], 
+                                                 Q=Q[digital])
+        
+        # metrics of the legs stacked along a leading axis, to be aggregated together
+        legs_metrics = np.empty((len(rescaling_factors),) + param_dict["scenarios_shape"] + K.shape, dtype=K.dtype)
+        for i, metrics in enumerate(rescaling_factors):
+            legs_metrics[i][..., vanilla] = vanilla_risk[metrics]
+            legs_metrics[i][..., digital] = digital_risk[metrics]
+        
+        book_metrics = self.aggregate(legs_metrics, by=by)
+        
+        return {metrics: scalarize(book_metrics[i] * rescaling_factors[metrics]) 
+                for i, metrics in enumerate(rescaling_factors)}
+
+    def legs_price_kernel(self, S, K, tau, sigma, r, where=np.where):
+        """
+        Returns the Black-Scholes value of the legs, written with arithmetic operators and 
+        NumPy ufuncs only (selections being made through the where function in input), 
+        so that it can run either on np.ndarrays or on AdjointArrays recorded on a Tape. 
+        Both plain-vanilla and digital formulas are evaluated on all the legs. 
+        For tau <= 0 the payoff is returned.
+        """
+        
+        # +1 for calls, -1 for puts
+        omega = np.where(self.__is_call, 1.0, -1.0)
+        
+        # a positive time-to-maturity is used for expired legs, 
+        # so that no NaN is back-propagated from unselected values
+        expired = tau <= 0
+        tau_pos = where(expired, 1.0, tau)
+        
+        # d1 and d2 terms and discount factor
+        sigma_sqrt_tau = sigma * np.sqrt(tau_pos)
+        d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * tau_pos) / sigma_sqrt_tau
+        d2 = d1 - sigma_sqrt_tau
+        discount = np.exp(-r * tau_pos)
+        
+        # prices and payoffs of plain-vanilla and digital legs
+        vanilla_price = omega * (S * ndtr(omega * d1) - K * discount * ndtr(omega * d2))
+        digital_price = self.__Q * discount * ndtr(omega * d2)
+        vanilla_payoff = np.maximum(omega * (S - K), 0.0)
+        digital_payoff = self.__Q * np.heaviside(omega * (S - K), np.where(self.__is_call, 0.0, 1.0))
+        
+        price = where(self.__is_digital, digital_price, vanilla_price)
+        payoff = where(self.__is_digital, digital_payoff, vanilla_payoff)
+        
+        return where(expired, payoff, price)
+    
+    def adjoint_risk(self, by=None, **kwargs):
+        """
+        Returns the sensitivities of the book value to the inputs of each leg: 
+        underlying value, time-to-maturity, volatility, short-rate and strike. 
+        
+        Sensitivities are computed in adjoint (reverse) mode: the vectorized valuation 
+        of the book (.legs_price_kernel() method) is recorded once on a Tape, then adjoints 
+        are back-propagated from the book value to the inputs of all the legs in a single 
+        sweep, so that the cost is a small constant multiple of one pricing pass, 
+        whatever the number of legs and buckets.
+        
+        Can be called with the same signature of the .price() public method. If by is None, 
+        sensitivities are returned leg by leg (last axis of the output spanned by legs), 
+        otherwise they are summed by bucket (see .aggregate() method), e.g. by='K' for 
+        per-strike and by='T' for per-expiry buckets.
+        
+        Returns a dictionary with keys:
+            
+            - 'price': the value of the book (as .price() method);
+            - 'delta', 'theta', 'vega', 'rho': sensitivities to underlying, time, volatility 
+              and short-rate of each leg (or bucket), already weighted by position and 
+              rescaled as .risk() method: theta to +1 calendar day, vega and rho to +1% variations;
+            - 'dual_delta': sensitivity to the strike of each leg (or bucket).
+        """
+        
+        param_dict = self.process_pricing_parameters(**kwargs)
+        shape = param_dict["scenarios_shape"] + self.__K.shape
+        
+        # the inputs of each leg (and market scenario) are independent variables
+        tape = Tape()
+        S, K, tau, sigma, r = [tape.variable(np.broadcast_to(x, shape)) for x in [param_dict["S"], self.__K, param_dict["tau"], 
+                                                                                   param_dict["sigma"], param_dict["r"]]]
+        
+        # recorded valuation of the book
+        with np.errstate(divide='ignore', invalid='ignore'):
+            book_price = (self.legs_price_kernel(S=S, K=K, tau=tau, sigma=sigma, r=r, 
+                                                 where=AdjointArray.where) * self.__position).sum(axis=-1)
+        
+        # single backward sweep
+        S_adj, tau_adj, sigma_adj, r_adj, K_adj = tape.gradient(book_price, [S, tau, sigma, r, K])
+        
+        # rescaling as .risk() method
+        sensitivities = {"delta": S_adj, 
+                         "theta": -tau_adj / 365.0, 
+                         "vega": sigma_adj * 0.01, 
+                         "rho": r_adj * 0.01, 
+                         "dual_delta": K_adj}
+        
+        # sensitivities by bucket (already weighted by position)
+        if by is not None:
+            sensitivities = {metrics: self.aggregate(sensitivities[metrics], by=by, weighted=False) for metrics in sensitivities}
+        
+        sensitivities["price"] = scalarize(book_price.get_value())
+        
+        return sensitivities
@@ -0,0 +1,915 @@
+"""
+Created by: Gabriele Pompa (gabriele.pompa@gmail.com)
+
+File: autodiff.py
+
+Created on Tue Jul 14 2020 - Version: 1.0
+
+Description:
+
+This file contains the definition of the DualArray class, implementing
+second-order forward-mode automatic differentiation on NumPy arrays, and of
+the ADGreeks class, computing exact greeks of option contracts and portfolios
+propagating DualArrays through their pricing and payoff methods.
+"""
+
+# ----------------------- standard imports ---------------------------------- #
+# for NumPy arrays
+import numpy as np
+
+# for Pandas Series and DataFrame
+import pandas as pd
+
+# for the standard normal cdf (a NumPy ufunc)
+from scipy.special import ndtr
+
+# ----------------------- sub-modules imports ------------------------------- #
+
+from utils.utils import *
+
+#-----------------------------------------------------------------------------#
+
+class DualArray:
+    """
+    DualArray class: an array of truncated second-order Taylor expansions
+    (hyper-dual numbers) w.r.t. n independent variables. For each element
+    it carries value, gradient and (optionally) hessian, propagated exactly
+    through arithmetic operators and NumPy ufuncs (np.exp, np.log, np.sqrt,
+    np.maximum, np.heaviside, scipy.special.ndtr, ...).
+
+    Functions written with NumPy operations (e.g. .d1_and_d2(), .call_price()
+    and .call_payoff() methods of option classes) can then run on DualArrays
+    unchanged: their output value comes with all the first- and second-order
+    derivatives w.r.t. the variables, in a single pass.
+
+    Attributes:
+    -----------
+        value (np.ndarray):      values, of shape G;
+        gradient (np.ndarray):   first derivatives, of shape (n,) + G;
+        hessian (np.ndarray):    second derivatives, of shape (n, n) + G (None if order=1). 
+                                 Being symmetric, only its upper triangle is stored and propagated.
+
+    Public Methods:
+    --------
+
+        getters for all attributes
+
+        variables: list of DualArray
+            Class method, returning n DualArrays seeded as independent variables.
+
+        where: DualArray
+            Static method, element-wise selection between two DualArrays
+            (the analogous of np.where).
+
+    Instantiation and Usage examples:
+    --------
+
+        - example_options_autodiff_greeks.py
+
+        - S, sigma = DualArray.variables(100.0, 0.2) seeds S and sigma as variables
+          (of index 0 and 1), so that (S * sigma**2).get_gradient()[1] is d(S*sigma**2)/dsigma.
+    """
+
+    # makes NumPy binary operators defer to DualArray
+    __array_priority__ = 1000
+
+    def __init__(self, value, gradient, packed_hessian=None):
+
+        self.__value = np.asarray(value, dtype=float)
+        self.__gradient = np.asarray(gradient, dtype=float)
+        self.__packed_hessian = None if packed_hessian is None else np.asarray(packed_hessian, dtype=float)
+
+    def __repr__(self):
+        return r"DualArray(value={}, gradient={}, hessian={})".format(self.__value, self.__gradient, self.get_hessian())
+
+    # getters
+    def get_value(self):
+        return self.__value
+
+    def get_gradient(self):
+        return self.__gradient
+
+    def get_hessian(self):
+        """Returns the (symmetric) hessian, of shape (n, n) + G (None if order=1)."""
+        
+        if self.__packed_hessian is None:
+            return None
+        
+        n = self.get_n_variables()
+        iu, ju = triu_indices(n)
+        
+        hessian = np.empty((n, n) + self.shape)
+        hessian[iu, ju] = self.__packed_hessian
+        hessian[ju, iu] = self.__packed_hessian
+        
+        return hessian
+    
+    def get_packed_hessian(self):
+        """Returns the upper triangle of the hessian, of shape (n(n+1)/2,) + G (None if order=1)."""
+        return self.__packed_hessian
+
+    @property
+    def shape(self):
+        return self.__value.shape
+
+    @property
+    def ndim(self):
+        return self.__value.ndim
+
+    def get_n_variables(self):
+        return self.__gradient.shape[0]
+
+    def get_order(self):
+        return 1 if self.__packed_hessian is None else 2
+
+    @classmethod
+    def variables(cls, *values, order=2):
+        """
+        Returns n DualArrays seeded as independent variables, one for each
+        value in input. Values are broadcast together.
+        """
+
+        values = np.broadcast_arrays(*[np.asarray(v, dtype=float) for v in values])
+        n = len(values)
+
+        dual_vars = []
+        for i, v in enumerate(values):
+            gradient = np.zeros((n,) + v.shape)
+            gradient[i] = 1.0
+            hessian = np.zeros((n*(n + 1)//2,) + v.shape) if order == 2 else None
+            dual_vars.append(cls(v.copy(), gradient, hessian))
+
+        return dual_vars
+
+    @staticmethod
+    def where(condition, x, y):
+        """
+        Element-wise selection between x and y (DualArrays or constants)
+        according to condition, for values and derivatives alike.
+        """
+
+        ndim = np.broadcast(condition, value_of(x), value_of(y)).nd
+        x_v, x_g, x_h = lift(x, ndim)
+        y_v, y_g, y_h = lift(y, ndim)
+
+        value = np.where(condition, x_v, y_v)
+        gradient = np.where(condition, zeros_if_none(x_g), zeros_if_none(y_g))
+        hessian = None if order_of(x, y) == 1 else np.where(condition, zeros_if_none(x_h), zeros_if_none(y_h))
+
+        return DualArray(value, gradient, hessian)
+
+    def __getitem__(self, key):
+
+        key = key if isinstance(key, tuple) else (key,)
+        hessian = None if self.__packed_hessian is None else self.__packed_hessian[(slice(None),) + key]
+
+        return DualArray(self.__value[key], self.__gradient[(slice(None),) + key], hessian)
+
+    #
+    # Arithmetic operators (dispatched to NumPy ufuncs)
+    #
+
+    def __add__(self, other):
+        return np.add(self, other)
+
+    def __radd__(self, other):
+        return np.add(other, self)
+
+    def __sub__(self, other):
+        return np.subtract(self, other)
+
+    def __rsub__(self, other):
+        return np.subtract(other, self)
+
+    def __mul__(self, other):
+        return np.multiply(self, other)
+
+    def __rmul__(self, other):
+        return np.multiply(other, self)
+
+    def __truediv__(self, other):
+        return np.true_divide(self, other)
+
+    def __rtruediv__(self, other):
+        return np.true_divide(other, self)
+
+    def __pow__(self, other):
+        return np.power(self, other)
+
+    def __rpow__(self, other):
+        return np.power(other, self)
+
+    def __neg__(self):
+        return np.negative(self)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return np.absolute(self)
+
+    # comparisons are made on values
+    def __lt__(self, other):
+        return np.less(self, other)
+
+    def __le__(self, other):
+        return np.less_equal(self, other)
+
+    def __gt__(self, other):
+        return np.greater(self, other)
+
+    def __ge__(self, other):
+        return np.greater_equal(self, other)
+
+    #
+    # NumPy ufuncs dispatch
+    #
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+
+        if method != "__call__" or kwargs:
+            return NotImplemented
+
+        if ufunc in UNARY_RULES:
+            return unary_rule(inputs[0], *UNARY_RULES[ufunc])
+        elif ufunc in BINARY_RULES:
+            return BINARY_RULES[ufunc](*inputs)
+        elif ufunc in VALUE_UFUNCS:
+            # comparisons and tests are made on values only
+            return ufunc(*[value_of(x) for x in inputs])
+        else:
+            return NotImplemented
+
+#-----------------------------------------------------------------------------#
+
+#
+# utility functions of DualArray class
+#
+
+def value_of(x):
+    """Returns the value of a DualArray, or x itself if it is a constant."""
+    return x.get_value() if isinstance(x, DualArray) else np.asarray(x, dtype=float)
+
+def order_of(*xs):
+    """Returns the highest order among DualArrays in input."""
+    return max([x.get_order() for x in xs if isinstance(x, DualArray)] + [1])
+
+def n_variables_of(*xs):
+    """Returns the number of variables of the (first) DualArray in input."""
+    return [x.get_n_variables() for x in xs if isinstance(x, DualArray)][0]
+
+def zeros_if_none(x):
+    return 0.0 if x is None else x
+
+def lift(x, ndim):
+    """
+    Returns value, gradient and hessian of x (None for constants), gradient
+    and hessian reshaped to broadcast against values of ndim dimensions.
+    """
+
+    if not isinstance(x, DualArray):
+        return np.asarray(x, dtype=float), None, None
+
+    v, g, h = x.get_value(), x.get_gradient(), x.get_packed_hessian()
+    missing_axes = (1,) * (ndim - v.ndim)
+    g = g.reshape(g.shape[:1] + missing_axes + v.shape)
+    h = None if h is None else h.reshape(h.shape[:1] + missing_axes + v.shape)
+
+    return v, g, h
+
+# row and column indices of the upper triangle of (n, n) matrices, by n
+TRIU_INDICES = {}
+
+def triu_indices(n):
+    if n not in TRIU_INDICES:
+        TRIU_INDICES[n] = np.triu_indices(n)
+    return TRIU_INDICES[n]
+
+def packed_outer(g1, g2, symmetrize=False):
+    """
+    Upper triangle of the outer product (g1)(g2)^T of gradients g1 and g2 
+    (of (g1)(g2)^T + (g2)(g1)^T, if symmetrize), computed row by row.
+    """
+    
+    n = g1.shape[0]
+    out = np.empty((n*(n + 1)//2,) + np.broadcast(g1[0], g2[0]).shape)
+    
+    start = 0
+    for i in range(n):
+        row = slice(start, start + n - i)
+        np.multiply(g1[i], g2[i:], out=out[row])
+        if symmetrize:
+            out[row] += g2[i] * g1[i:]
+        start += n - i
+    
+    return out
+
+def unary_rule(x, f, df, d2f):
+    """
+    Chain rule for y = f(x):
+
+        grad y = f'(x) grad x
+        hess y = f'(x) hess x + f''(x) (grad x) (grad x)^T
+    """
+
+    v, g, h = lift(x, np.ndim(value_of(x)))
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        y, dy = f(v), df(v)
+        gradient = dy * g
+        if h is None:
+            hessian = None
+        else:
+            hessian = packed_outer(g, g)
+            hessian *= d2f(v)
+            hessian += dy * h
+
+    return DualArray(y, gradient, hessian)
+
+def add_rule(a, b, sign=1.0):
+    """Rule for y = a + sign * b."""
+
+    ndim = np.broadcast(value_of(a), value_of(b)).nd
+    a_v, a_g, a_h = lift(a, ndim)
+    b_v, b_g, b_h = lift(b, ndim)
+
+    n = n_variables_of(a, b)
+
+    value = a_v + sign * b_v
+    gradient = np.broadcast_to(zeros_if_none(a_g) + sign * zeros_if_none(b_g), (n,) + value.shape)
+    hessian = None if order_of(a, b) == 1 else \
+              np.broadcast_to(zeros_if_none(a_h) + sign * zeros_if_none(b_h), (n*(n + 1)//2,) + value.shape)
+
+    return DualArray(value, gradient, hessian)
+
+def multiply_rule(a, b):
+    """
+    Product rule for y = a * b:
+
+        grad y = a grad b + b grad a
+        hess y = a hess b + b hess a + (grad a)(grad b)^T + (grad b)(grad a)^T
+    """
+
+    ndim = np.broadcast(value_of(a), value_of(b)).nd
+    a_v, a_g, a_h = lift(a, ndim)
+    b_v, b_g, b_h = lift(b, ndim)
+
+    value = a_v * b_v
+
+    if a_g is None:
+        gradient = a_v * b_g
+        hessian = None if b_h is None else a_v * b_h
+    elif b_g is None:
+        gradient = b_v * a_g
+        hessian = None if a_h is None else b_v * a_h
+    else:
+        gradient = a_v * b_g + b_v * a_g
+        if order_of(a, b) == 1:
+            hessian = None
+        else:
+            hessian = packed_outer(a_g, b_g, symmetrize=True)
+            hessian = hessian + a_v * zeros_if_none(b_h)
+            hessian += b_v * zeros_if_none(a_h)
+
+    return DualArray(value, gradient, hessian)
+
+def divide_rule(a, b):
+    """Rule for y = a / b = a * (1/b)."""
+
+    if isinstance(b, DualArray):
+        return multiply_rule(a, unary_rule(b, lambda x: 1.0/x, lambda x: -1.0/x**2, lambda x: 2.0/x**3))
+    else:
+        return multiply_rule(a, 1.0/np.asarray(b, dtype=float))
+
+def power_rule(a, b):
+    """Rule for y = a ** b (b constant) or y = exp(b * log(a)) otherwise."""
+
+    if isinstance(b, DualArray):
+        return np.exp(np.multiply(b, np.log(a)))
+
+    p = np.asarray(b, dtype=float)
+
+    return unary_rule(a, lambda x: x**p, lambda x: p * x**(p - 1.0), lambda x: p * (p - 1.0) * x**(p - 2.0))
+
+def extremum_rule(a, b, maximum=True):
+    """Rule for y = max(a, b) (or min(a, b)): derivatives of the selected argument."""
+
+    a_v, b_v = value_of(a), value_of(b)
+    condition = (a_v >= b_v) if maximum else (a_v <= b_v)
+
+    return DualArray.where(condition, a, b)
+
+def heaviside_rule(a, h0):
+    """Rule for y = H(a): a piece-wise constant function (zero derivatives)."""
+
+    ndim = np.broadcast(value_of(a), value_of(h0)).nd
+    a_v, a_g, a_h = lift(a, ndim)
+
+    value = np.heaviside(a_v, value_of(h0))
+    n = n_variables_of(a, h0)
+    
+    gradient = np.zeros((n,) + value.shape)
+    hessian = None if order_of(a, h0) == 1 else np.zeros((n*(n + 1)//2,) + value.shape)
+
+    return DualArray(value, gradient, hessian)
+
+# standard normal pdf
+def norm_pdf(x):
+    return np.exp(-0.5 * x**2) / np.sqrt(2.0 * np.pi)
+
+# ufunc: (f, f', f'')
+UNARY_RULES = {np.negative: (lambda x: -x, lambda x: -np.ones_like(x), lambda x: np.zeros_like(x)),
+               np.positive: (lambda x: x, lambda x: np.ones_like(x), lambda x: np.zeros_like(x)),
+               np.exp:      (np.exp, np.exp, np.exp),
+               np.log:      (np.log, lambda x: 1.0/x, lambda x: -1.0/x**2),
+               np.sqrt:     (np.sqrt, lambda x: 0.5/np.sqrt(x), lambda x: -0.25/(x * np.sqrt(x))),
+               np.square:   (np.square, lambda x: 2.0 * x, lambda x: 2.0 * np.ones_like(x)),
+               np.absolute: (np.absolute, np.sign, lambda x: np.zeros_like(x)),
+               ndtr:        (ndtr, norm_pdf, lambda x: -x * norm_pdf(x))}
+
+BINARY_RULES = {np.add:         add_rule,
+                np.subtract:    lambda a, b: add_rule(a, b, sign=-1.0),
+                np.multiply:    multiply_rule,
+                np.true_divide: divide_rule,
+                np.power:       power_rule,
+                np.maximum:     extremum_rule,
+                np.minimum:     lambda a, b: extremum_rule(a, b, maximum=False),
+                np.heaviside:   heaviside_rule}
+
+VALUE_UFUNCS = [np.less, np.less_equal, np.greater, np.greater_equal, np.equal, np.not_equal,
+                np.isfinite, np.isnan, np.sign]
+
+#-----------------------------------------------------------------------------#
+
+class ADGreeks:
+    """
+    ADGreeks class: a class implementing forward-mode automatic differentiation
+    to compute exact greeks for option contracts. Pricing and payoff methods
+    of the FinancialObject (.call_price(), .put_price(), .call_payoff() and
+    .put_payoff()) are evaluated once on DualArrays seeded in (S, tau, sigma, r),
+    so that no greek has to be derived by hand and no finite-differences
+    epsilon has to be tuned.
+
+    Attributes:
+    -----------
+        FinancialObject (EuropeanOption sub-class or Portfolio):      Instance of an EuropeanOption sub-class
+                                                                      (PlainVanillaOption or DigitalOption) or a Portfolio
+                                                                      class.
+
+    Public Methods:
+    --------
+
+        derivatives: dict
+            Computes value, gradient and hessian of the FinancialObject w.r.t.
+            (S, tau, sigma, r), not rescaled.
+
+        all: dict
+            Computes the price, delta, theta, gamma, vega and rho of the FinancialObject.
+
+        delta, theta, gamma, vega, rho: float
+            Compute a single greek of the FinancialObject (as .all()[greek]).
+
+    Instantiation and Usage examples:
+    --------
+
+        - example_options_autodiff_greeks.py
+    """
+
+    # differentiation variables
+    variables = ["S", "tau", "sigma", "r"]
+
+    def __init__(self, FinancialObject):
+
+        self.opt = FinancialObject
+
+    def derivatives(self, **kwargs):
+        """
+        Value, gradient and hessian w.r.t. S, tau, sigma and r, computed in a
+        single forward pass.
+
+        Can be called as self.opt.price() method.
+
+        Returns a dictionary with keys:
+
+            - 'value': the price;
+            - 'gradient': a dictionary of first derivatives keyed by variable name
+              (e.g. 'sigma' for dV/dsigma);
+            - 'hessian': a dictionary of second derivatives keyed by pairs of variable names
+              (e.g. ('S', 'sigma') for d^2V/dSdsigma).
+        """
+
+        # legs: a single instrument or the portfolio constituents, with their pricing parameters
+        legs, ind_output, col_output = pricing_legs(self.opt, **kwargs)
+
+        total = 0.0
+
+        for leg in legs:
+
+            position, instrument = leg["position"], leg["instrument"]
+            S, K, tau, sigma, r = [leg["params"][p] for p in ["S", "K", "tau", "sigma", "r"]]
+
+            # independent variables
+            S, tau, sigma, r = DualArray.variables(S, tau, sigma, r)
+
+            with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+
+                # call case
+                if instrument.get_type() == 'call':
+                    price = instrument.call_price(S=S, K=K, tau=tau, sigma=sigma, r=r)
+                    payoff = instrument.call_payoff(S=S, K=K)
+                # put case
+                else:
+                    price = instrument.put_price(S=S, K=K, tau=tau, sigma=sigma, r=r)
+                    payoff = instrument.put_payoff(S=S, K=K)
+
+            # for tau==0 output the payoff, otherwise price
+            total = total + position * DualArray.where(tau.get_value() > 0, price, payoff)
+
+        n = len(self.variables)
+        gradient, hessian = total.get_gradient(), total.get_hessian()
+
+        derivatives = {"value": total.get_value(),
+                       "gradient": {self.variables[i]: gradient[i] for i in range(n)},
+                       "hessian": {(self.variables[i], self.variables[j]): hessian[i, j]
+                                   for i in range(n) for j in range(n)}}
+
+        # labelling output as pd.DataFrame, if necessary
+        return attach_labels(derivatives, ind_output, col_output)
+
+    def all(self, **kwargs):
+        """
+        Price and greeks (delta, theta, gamma, vega and rho) computed together,
+        in a single forward pass.
+
+        Can be called as self.opt.price() method.
+
+        Optionally, theta, vega and rho can be rescaled using the "theta_factor",
+        "vega_factor" and "rho_factor" keyboard parameters, respectively.
+        Default rescaling is the same of .theta(), .vega() and .rho() methods
+        of option classes.
+
+        Returns a dictionary with keys 'price', 'delta', 'theta', 'gamma', 'vega'
+        and 'rho'.
+        """
+
+        # rescaling factors
+        theta_factor = kwargs["theta_factor"] if "theta_factor" in kwargs else 1.0/365.0
+        vega_factor = kwargs["vega_factor"] if "vega_factor" in kwargs else 0.01
+        rho_factor = kwargs["rho_factor"] if "rho_factor" in kwargs else 0.01
+
+        derivatives = self.derivatives(**kwargs)
+        gradient, hessian = derivatives["gradient"], derivatives["hessian"]
+
+        return {"price": derivatives["value"],
+                "delta": gradient["S"],
+                "theta": -gradient["tau"] * theta_factor,
+                "gamma": hessian[("S", "S")],
+                "vega": gradient["sigma"] * vega_factor,
+                "rho": gradient["r"] * rho_factor}
+
+    def delta(self, **kwargs):
+        """Exact derivative df/dS. Can be called as self.opt.price() method."""
+        return self.all(**kwargs)["delta"]
+
+    def theta(self, **kwargs):
+        """Exact derivative df/dt = -df/dtau, rescaled as .all(). Can be called as self.opt.price() method."""
+        return self.all(**kwargs)["theta"]
+
+    def gamma(self, **kwargs):
+        """Exact derivative d^2f/dS^2. Can be called as self.opt.price() method."""
+        return self.all(**kwargs)["gamma"]
+
+    def vega(self, **kwargs):
+        """Exact derivative df/dsigma, rescaled as .all(). Can be called as self.opt.price() method."""
+        return self.all(**kwargs)["vega"]
+
+    def rho(self, **kwargs):
+        """Exact derivative df/dr, rescaled as .all(). Can be called as self.opt.price() method."""
+        return self.all(**kwargs)["rho"]
+
+#-----------------------------------------------------------------------------#
+
+class Tape:
+    """
+    Tape class: records the operations made on AdjointArrays, to compute the 
+    gradient of an output w.r.t. many input variables in adjoint (reverse) mode. 
+    
+    The output is evaluated once, recording for each operation the local 
+    derivatives w.r.t. its operands. Then, a single backward sweep propagates 
+    adjoints from the output to all the variables: the cost is a small constant 
+    multiple of one evaluation, independently of the number of variables.
+    
+    Operations are element-wise, so if the output is an array, each element 
+    gets its own gradient w.r.t. the variables elements it depends on (that is, 
+    independent scenarios are back-propagated at once).
+
+    Public Methods:
+    --------
+
+        variable: AdjointArray
+            Returns a new input variable, recorded on the tape.
+
+        record: int
+            Records an operation given its operands and vector-Jacobian products.
+
+        gradient: list of np.ndarray
+            Back-propagates adjoints from an output to a list of variables.
+
+    Instantiation and Usage examples:
+    --------
+
+        - example_option_book_adjoint.py
+
+        - tape = Tape(); x = tape.variable([1.0, 2.0]); y = np.exp(x) * x; 
+          tape.gradient(y, [x]) returns [exp(x) * (1 + x)].
+    """
+
+    def __init__(self):
+
+        # for each node, the List of (operand node, vector-Jacobian product function) pairs
+        self.__nodes = []
+
+    def __len__(self):
+        return len(self.__nodes)
+
+    def variable(self, value):
+        """Returns a new input variable of given value."""
+        return AdjointArray(value, self, self.record([]))
+
+    def record(self, operands):
+        """
+        Records a node, given the List of its (operand node, vjp) pairs, where 
+        vjp(adjoint) returns the contribution of adjoint of the node to the 
+        adjoint of the operand. Returns the index of the node.
+        """
+
+        self.__nodes.append(operands)
+
+        return len(self.__nodes) - 1
+
+    def gradient(self, output, variables, seed=None):
+        """
+        Back-propagates adjoints from output (seeded with ones, if seed is 
+        None) to variables, in a single backward sweep. Returns the List of 
+        adjoints of variables, each of the shape of the variable.
+        """
+
+        adjoints = [None] * len(self.__nodes)
+        adjoints[output.get_index()] = np.ones(output.shape) if seed is None else np.asarray(seed, dtype=float)
+
+        for node in range(output.get_index(), -1, -1):
+
+            adjoint = adjoints[node]
+            if adjoint is None:
+                continue
+
+            for operand, vjp in self.__nodes[node]:
+                contribution = vjp(adjoint)
+                adjoints[operand] = contribution if adjoints[operand] is None else adjoints[operand] + contribution
+
+            # intermediate adjoints are not needed anymore
+            if self.__nodes[node]:
+                adjoints[node] = None
+
+        return [np.zeros(x.shape) if adjoints[x.get_index()] is None 
+                else np.broadcast_to(adjoints[x.get_index()], x.shape) for x in variables]
+
+#-----------------------------------------------------------------------------#
+
+class AdjointArray:
+    """
+    AdjointArray class: an array whose operations (arithmetic operators and 
+    NumPy ufuncs np.exp, np.log, np.sqrt, np.maximum, np.heaviside, 
+    scipy.special.ndtr, ...) are recorded on a Tape, for adjoint differentiation.
+
+    Attributes:
+    -----------
+        value (np.ndarray):   values;
+        tape (Tape):          the tape where operations are recorded;
+        index (int):          the index of the node on the tape.
+
+    Public Methods:
+    --------
+
+        getters for all attributes
+
+        where: AdjointArray
+            Static method, element-wise selection between two AdjointArrays
+            (the analogous of np.where).
+
+        sum: AdjointArray
+            Sum of elements over a given axis.
+
+    Instantiation and Usage examples:
+    --------
+
+        - example_option_book_adjoint.py
+
+        - AdjointArrays are created as variables of a Tape: Tape().variable(value).
+    """
+
+    # makes NumPy binary operators defer to AdjointArray
+    __array_priority__ = 1000
+
+    def __init__(self, value, tape, index):
+
+        self.__value = np.asarray(value, dtype=float)
+        self.__tape = tape
+        self.__index = index
+
+    def __repr__(self):
+        return r"AdjointArray(value={}, index={})".format(self.__value, self.__index)
+
+    # getters
+    def get_value(self):
+        return self.__value
+
+    def get_tape(self):
+        return self.__tape
+
+    def get_index(self):
+        return self.__index
+
+    @property
+    def shape(self):
+        return self.__value.shape
+
+    @property
+    def ndim(self):
+        return self.__value.ndim
+
+    @staticmethod
+    def where(condition, x, y):
+        """
+        Element-wise selection between x and y (AdjointArrays or constants)
+        according to condition. Adjoints flow to the selected operand only.
+        """
+
+        condition = np.asarray(condition, dtype=bool)
+        value = np.where(condition, adjoint_value_of(x), adjoint_value_of(y))
+
+        return record_operation(value, [(x, lambda g: np.where(condition, g, 0.0)),
+                                        (y, lambda g: np.where(condition, 0.0, g))])
+
+    def sum(self, axis=None):
+        """Sum of elements over axis (all of them, if axis is None)."""
+
+        value = self.__value.sum(axis=axis)
+        shape = self.shape
+
+        if axis is None:
+            vjp = lambda g: np.broadcast_to(g, shape)
+        else:
+            vjp = lambda g: np.broadcast_to(np.expand_dims(g, axis), shape)
+
+        return record_operation(value, [(self, vjp)], reduce=False)
+
+    #
+    # Arithmetic operators (dispatched to NumPy ufuncs)
+    #
+
+    def __add__(self, other):
+        return np.add(self, other)
+
+    def __radd__(self, other):
+        return np.add(other, self)
+
+    def __sub__(self, other):
+        return np.subtract(self, other)
+
+    def __rsub__(self, other):
+        return np.subtract(other, self)
+
+    def __mul__(self, other):
+        return np.multiply(self, other)
+
+    def __rmul__(self, other):
+        return np.multiply(other, self)
+
+    def __truediv__(self, other):
+        return np.true_divide(self, other)
+
+    def __rtruediv__(self, other):
+        return np.true_divide(other, self)
+
+    def __pow__(self, other):
+        return np.power(self, other)
+
+    def __neg__(self):
+        return np.negative(self)
+
+    def __pos__(self):
+        return self
+
+    # comparisons are made on values
+    def __lt__(self, other):
+        return np.less(self, other)
+
+    def __le__(self, other):
+        return np.less_equal(self, other)
+
+    def __gt__(self, other):
+        return np.greater(self, other)
+
+    def __ge__(self, other):
+        return np.greater_equal(self, other)
+
+    #
+    # NumPy ufuncs dispatch
+    #
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+
+        if method != "__call__" or kwargs:
+            return NotImplemented
+
+        values = [adjoint_value_of(x) for x in inputs]
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+
+            if ufunc in UNARY_RULES:
+                f, df, _ = UNARY_RULES[ufunc]
+                x, = inputs
+                partial = df(values[0])
+                return record_operation(f(values[0]), [(x, lambda g: partial * g)])
+
+            elif ufunc in ADJOINT_BINARY_PARTIALS:
+                a, b = inputs
+                value, partial_a, partial_b = ADJOINT_BINARY_PARTIALS[ufunc](*values)
+                return record_operation(value, [(a, lambda g: partial_a * g), (b, lambda g: partial_b * g)])
+
+            elif ufunc is np.heaviside:
+                # piece-wise constant function: no operands to back-propagate to
+                return record_operation(np.heaviside(*values), [], tape=tape_of(*inputs))
+
+            elif ufunc in VALUE_UFUNCS:
+                # comparisons and tests are made on values only
+                return ufunc(*values)
+
+            else:
+                return NotImplemented
+
+#-----------------------------------------------------------------------------#
+
+#
+# utility functions of AdjointArray class
+#
+
+def adjoint_value_of(x):
+    """Returns the value of an AdjointArray, or x itself if it is a constant."""
+    return x.get_value() if isinstance(x, AdjointArray) else np.asarray(x, dtype=float)
+
+def tape_of(*xs):
+    """Returns the tape of the (first) AdjointArray in input."""
+    return [x.get_tape() for x in xs if isinstance(x, AdjointArray)][0]
+
+def unbroadcast(g, shape):
+    """Sums adjoint g over the axes along which an operand of given shape has been broadcast."""
+
+    g = np.asarray(g)
+
+    if g.shape == shape:
+        return g
+
+    # leading axes added by broadcasting
+    g = g.sum(axis=tuple(range(g.ndim - len(shape))))
+
+    # axes of length 1 stretched by broadcasting
+    stretched = tuple(i for i, n in enumerate(shape) if (n == 1) and (g.shape[i] != 1))
+
+    return g.sum(axis=stretched, keepdims=True) if stretched else g
+
+def record_operation(value, operands, tape=None, reduce=True):
+    """
+    Records on the tape an operation of given value, with operands given as 
+    a List of (operand, vjp) pairs. Constant operands are skipped. If reduce, 
+    the contributions to each operand are summed over broadcast axes.
+    """
+
+    tape = tape_of(*[x for x, _ in operands]) if tape is None else tape
+
+    recorded_operands = []
+    for x, vjp in operands:
+        if isinstance(x, AdjointArray):
+            if reduce:
+                vjp = (lambda vjp, shape: lambda g: unbroadcast(vjp(g), shape))(vjp, x.shape)
+            recorded_operands.append((x.get_index(), vjp))
+
+    return AdjointArray(value, tape, tape.record(recorded_operands))
+
+def power_partials(a, b):
+    value = a ** b
+    return value, b * a ** (b - 1.0), value * np.log(a)
+
+def extremum_partials(a, b, maximum=True):
+    condition = (a >= b) if maximum else (a <= b)
+    return np.where(condition, a, b), condition.astype(float), (~condition).astype(float)
+
+# ufunc: (value, partial w.r.t. 1st operand, partial w.r.t. 2nd operand)
+ADJOINT_BINARY_PARTIALS = {np.add:         lambda a, b: (a + b, 1.0, 1.0),
+                           np.subtract:    lambda a, b: (a - b, 1.0, -1.0),
+                           np.multiply:    lambda a, b: (a * b, b, a),
+                           np.true_divide: lambda a, b: (a / b, 1.0 / b, -a / b**2),
+                           np.power:       power_partials,
+                           np.maximum:     extremum_partials,
+                           np.minimum:     lambda a, b: extremum_partials(a, b, maximum=False)}
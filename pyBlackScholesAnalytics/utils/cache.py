@@ -0,0 +1,244 @@
+"""
+Created by: Gabriele Pompa (gabriele.pompa@gmail.com)
+
+File: cache.py
+
+Created on Tue Jul 14 2020 - Version: 1.0
+
+Description:
+
+This file contains the definition of the LRUCache class and of the cached_metrics
+decorator, implementing an opt-in memoization layer for pricing methods.
+"""
+
+# ----------------------- standard imports ---------------------------------- #
+# for NumPy arrays
+import numpy as np
+
+# for Pandas Series and DataFrame
+import pandas as pd
+
+# for ordered dictionary (LRU eviction)
+from collections import OrderedDict
+
+# for arrays hashing
+import hashlib
+
+# for memory size of Python objects
+import sys
+
+# to preserve decorated methods name and docstring
+import functools
+
+# ----------------------- sub-modules imports ------------------------------- #
+
+from utils.utils import get_float_dtype
+
+#-----------------------------------------------------------------------------#
+
+def hashable_key(x):
+    """
+    Utility function to convert a pricing parameter x into a hashable key.
+    NumPy arrays and Pandas objects are summarized by data-type, shape and
+    a digest of their content. Lists, Tuples and Dicts are converted recursively.
+    """
+
+    if isinstance(x, (pd.DataFrame, pd.Series)):
+        return (type(x).__name__, hashable_key(x.values), hashable_key(x.index.values))
+    elif isinstance(x, pd.Index):
+        return (type(x).__name__, hashable_key(x.values))
+    elif isinstance(x, np.ndarray):
+        if x.dtype == object:
+            return ("ndarray", x.shape, tuple(hashable_key(xi) for xi in x.ravel()))
+        else:
+            digest = hashlib.sha1(np.ascontiguousarray(x).view(np.uint8)).hexdigest()
+            return ("ndarray", x.dtype.str, x.shape, digest)
+    elif isinstance(x, (list, tuple)):
+        return (type(x).__name__,) + tuple(hashable_key(xi) for xi in x)
+    elif isinstance(x, dict):
+        return ("dict",) + tuple((k, hashable_key(x[k])) for k in sorted(x))
+    else:
+        # scalars, Strings and dates are hashable already
+        return x
+
+#-----------------------------------------------------------------------------#
+
+def size_in_bytes(x):
+    """
+    Utility function to estimate the memory size of a result x.
+    """
+
+    if isinstance(x, np.ndarray):
+        return x.nbytes
+    elif isinstance(x, (pd.DataFrame, pd.Series)):
+        return x.values.nbytes
+    elif isinstance(x, dict):
+        return sum([size_in_bytes(xi) for xi in x.values()])
+    else:
+        return sys.getsizeof(x)
+
+#-----------------------------------------------------------------------------#
+
+def copy_result(x):
+    """
+    Utility function to copy a result x, so that cached values cannot be
+    modified from outside the cache.
+    """
+
+    if isinstance(x, (np.ndarray, pd.DataFrame, pd.Series)):
+        return x.copy()
+    elif isinstance(x, dict):
+        return {k: copy_result(x[k]) for k in x}
+    else:
+        return x
+
+#-----------------------------------------------------------------------------#
+
+class LRUCache:
+    """
+    LRUCache class: a bounded Least-Recently-Used cache of pricing results.
+
+    Attributes:
+    -----------
+        max_entries (int):   maximum number of results stored;
+        max_bytes (int):     maximum memory size (in bytes) of results stored;
+        hits (int):          number of successful look-ups;
+        misses (int):        number of unsuccessful look-ups.
+
+    Public Methods:
+    --------
+
+        getters for all attributes
+
+        get:
+            Returns a copy of the result stored under a key (None if not stored).
+
+        put:
+            Stores a result under a key, evicting least-recently-used results if needed.
+
+        clear:
+            Removes all stored results.
+
+        info: dict
+            Returns hits, misses, number of entries and size in bytes of the cache.
+
+    Instantiation and Usage examples:
+    --------
+
+        - example_options_cache.py
+
+        - default: LRUCache() is equivalent to LRUCache(max_entries=128, max_bytes=64*1024**2)
+    """
+
+    def __init__(self, max_entries=128, max_bytes=64*1024**2):
+
+        self.__max_entries = max_entries
+        self.__max_bytes = max_bytes
+        self.__entries = OrderedDict()
+        self.__bytes = 0
+        self.__hits = 0
+        self.__misses = 0
+
+    def __repr__(self):
+        return r"LRUCache(entries={}/{}, bytes={}/{}, hits={}, misses={})".\
+               format(len(self.__entries), self.get_max_entries(), self.__bytes, self.get_max_bytes(),
+                      self.get_hits(), self.get_misses())
+
+    # getters
+    def get_max_entries(self):
+        return self.__max_entries
+
+    def get_max_bytes(self):
+        return self.__max_bytes
+
+    def get_hits(self):
+        return self.__hits
+
+    def get_misses(self):
+        return self.__misses
+
+    def get(self, key):
+        """
+        Returns a copy of the result stored under key, marking it as the most
+        recently used. Returns None if key is not stored.
+        """
+
+        if key in self.__entries:
+            self.__hits += 1
+            self.__entries.move_to_end(key)
+            return copy_result(self.__entries[key][0])
+        else:
+            self.__misses += 1
+            return None
+
+    def put(self, key, result):
+        """
+        Stores a copy of result under key. Least recently used results are evicted
+        until both entries and bytes limits are satisfied. Results bigger than
+        the bytes limit are not stored.
+        """
+
+        nbytes = size_in_bytes(result)
+
+        if nbytes > self.__max_bytes:
+            return
+
+        if key in self.__entries:
+            self.__bytes -= self.__entries.pop(key)[1]
+
+        self.__entries[key] = (copy_result(result), nbytes)
+        self.__bytes += nbytes
+
+        # LRU eviction
+        while (len(self.__entries) > self.__max_entries) or (self.__bytes > self.__max_bytes):
+            _, (_, evicted_nbytes) = self.__entries.popitem(last=False)
+            self.__bytes -= evicted_nbytes
+
+    def clear(self):
+        """
+        Removes all stored results. Hits and misses counters are not reset.
+        """
+
+        self.__entries.clear()
+        self.__bytes = 0
+
+    def info(self):
+        return {"hits": self.get_hits(),
+                "misses": self.get_misses(),
+                "entries": len(self.__entries),
+                "bytes": self.__bytes}
+
+#-----------------------------------------------------------------------------#
+
+def cached_metrics(method):
+    """
+    Decorator to memoize a pricing method of a class implementing:
+
+        - .get_cache(): returning an LRUCache (or None, if caching is disabled);
+        - .get_state_version(): returning a hashable token of the state of the
+          object, changing whenever the object is modified.
+
+    Results are keyed on the method name, the state of the object, all
+    the parameters in input and the library-wide floating-point data-type
+    (see set_float_dtype()).
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+
+        cache = self.get_cache()
+
+        # caching disabled
+        if cache is None:
+            return method(self, *args, **kwargs)
+
+        key = (method.__name__, self.get_state_version(), hashable_key(args), hashable_key(kwargs), get_float_dtype())
+
+        result = cache.get(key)
+        if result is None:
+            result = method(self, *args, **kwargs)
+            cache.put(key, result)
+
+        return result
+
+    return wrapper
@@ -0,0 +1,207 @@
+"""
+Created by: Gabriele Pompa (gabriele.pompa@gmail.com)
+
+File: dates.py
+
+Created on Tue Jul 14 2020 - Version: 1.0
+
+Description:
+
+This file contains the date subsystem of the library, built on np.datetime64:
+parsing of 'dd-mm-YYYY' date Strings (each String is parsed once and cached in
+a LRU cache), vectorized conversion and chronological sorting of dates and
+vectorized year fractions under ACT/365, ACT/360 and business-days (BUS/252,
+with an optional holiday calendar) day-count conventions.
+"""
+
+# ----------------------- standard imports ---------------------------------- #
+# for NumPy arrays
+import numpy as np
+
+# for Pandas DatetimeIndex
+import pandas as pd
+
+# for date management
+import datetime as dt
+
+# for some mathematical functions
+import math
+
+# for the LRU cache of parsed date Strings
+import functools
+
+#-----------------------------------------------------------------------------#
+
+# date format of date Strings
+DATE_FORMAT = "%d-%m-%Y"
+
+# supported day-count conventions and their days per year
+DAY_COUNT_CONVENTIONS = {"ACT/365": 365.0, "ACT/360": 360.0, "BUS/252": 252.0}
+
+#-----------------------------------------------------------------------------#
+
+@functools.lru_cache(maxsize=4096)
+def parse_date_string(date_string, date_format=DATE_FORMAT):
+    """
+    Parses a date String conform to date_format (default: 'dd-mm-YYYY') into
+    a dt.datetime object. If not conform, it raises a ValueError.
+
+    Each String is parsed once: results are stored in a LRU cache of the most
+    recent 4096 Strings (see parse_date_string.cache_info()).
+    """
+
+    try:
+        return dt.datetime.strptime(date_string, date_format)
+    except ValueError:
+        raise ValueError("date_string {} in input is not conform to 'dd-mm-YYYY' date format".format(date_string))
+
+#-----------------------------------------------------------------------------#
+
+def is_datetime64_array(x):
+    """
+    Utility function to test whether x is a np.ndarray, pd.Index or pd.Series
+    of datetime64 data-type.
+    """
+    return isinstance(x, (np.ndarray, pd.Index, pd.Series)) and x.dtype.kind == "M"
+
+#-----------------------------------------------------------------------------#
+
+def to_datetime64(dates):
+    """
+    Converts dates into np.datetime64 (nanoseconds resolution):
+
+        1-dim case:
+            from 'dd-mm-YYYY' String, dt.datetime (pd.Timestamp) or
+            np.datetime64 object --> to np.datetime64
+
+        Multi-dim case:
+            from (non-String) Iterable of them --> to np.ndarray of np.datetime64.
+            datetime64 arrays (e.g. pd.DatetimeIndex) are converted natively,
+            otherwise each distinct element is converted once.
+
+    Strings are parsed by parse_date_string() function. Other types raise a TypeError.
+    """
+
+    if isinstance(dates, str):
+        # 1-dim case: String
+        return np.datetime64(parse_date_string(dates), 'ns')
+
+    elif isinstance(dates, (dt.datetime, np.datetime64)):
+        # 1-dim case: date object
+        return np.datetime64(dates, 'ns')
+
+    elif is_datetime64_array(dates):
+        # Multi-dim case: datetime64 arrays
+        return np.asarray(dates, dtype='datetime64[ns]')
+
+    elif isinstance(dates, (list, tuple, np.ndarray, pd.Index, pd.Series)):
+        # Multi-dim case: distinct elements are converted once
+        values = np.asarray(dates)
+
+        if values.size == 0:
+            return np.array([], dtype='datetime64[ns]')
+
+        unique_values, inverse = np.unique(values, return_inverse=True)
+        unique_dates = np.array([to_datetime64(d) for d in unique_values], dtype='datetime64[ns]')
+
+        return unique_dates[inverse].reshape(values.shape)
+
+    else:
+        raise TypeError("Type {} of dates {} not recognized".format(type(dates), dates))
+
+#-----------------------------------------------------------------------------#
+
+def sort_dates(dates, reverse_order=False):
+    """
+    Sorts an Iterable of dates ('dd-mm-YYYY' Strings, dt.datetime or np.datetime64
+    objects) in chronological order (reverse chronological, if reverse_order is True),
+    by a vectorized np.argsort of their np.datetime64 representation.
+
+    The sorted elements are returned as np.ndarray, pd.DatetimeIndex and datetime64
+    pd.Series as np.ndarray of pd.Timestamp. Scalars are returned as they are.
+    """
+
+    if isinstance(dates, str) or not isinstance(dates, (list, tuple, np.ndarray, pd.Index, pd.Series)):
+        return dates
+
+    if is_datetime64_array(dates) and not isinstance(dates, np.ndarray):
+        # elements of pd.DatetimeIndex and pd.Series are pd.Timestamp
+        dates = pd.DatetimeIndex(dates)
+        keys = dates.values
+        values = dates.astype(object).to_numpy()
+    else:
+        values = np.asarray(dates)
+        keys = to_datetime64(values)
+
+    # stable sort, as Python sorted()
+    order = np.argsort(keys, kind="stable")
+
+    return values[order[::-1]] if reverse_order else values[order]
+
+#-----------------------------------------------------------------------------#
+
+def to_holidays(holidays):
+    """
+    Utility function to convert an Iterable of holiday dates (or None) into
+    the np.ndarray of np.datetime64 (days resolution) expected by np.busday_count.
+    """
+
+    if holidays is None:
+        return np.array([], dtype='datetime64[D]')
+
+    return np.atleast_1d(to_datetime64(holidays)).astype('datetime64[D]')
+
+#-----------------------------------------------------------------------------#
+
+def year_fraction(start, end, day_count="ACT/365", holidays=None):
+    """
+    Computes the year fraction between start and end dates, vectorized
+    on their np.datetime64 representation (see to_datetime64() function).
+    Start and end dates can be single dates or Iterables, broadcast together.
+
+    Supported day-count conventions (see DAY_COUNT_CONVENTIONS) are:
+
+        - 'ACT/365' (default): actual number of days between dates, divided by 365;
+        - 'ACT/360': actual number of days between dates, divided by 360;
+        - 'BUS/252': number of business days (Monday to Friday, excluding holidays)
+          between dates, divided by 252.
+
+    The number of days is the number of whole days (as .days attribute of
+    dt.timedelta). Year fractions are negative if end date comes before start date.
+    """
+
+    if day_count not in DAY_COUNT_CONVENTIONS:
+        raise NotImplementedError("Day-count convention: '{}' does not exist!".format(day_count))
+
+    start = to_datetime64(start)
+    end = to_datetime64(end)
+
+    if day_count == "BUS/252":
+        days = np.busday_count(start.astype('datetime64[D]'), end.astype('datetime64[D]'),
+                               holidays=to_holidays(holidays))
+    else:
+        days = (end - start) // np.timedelta64(1, 'D')
+
+    return days / DAY_COUNT_CONVENTIONS[day_count]
+
+#-----------------------------------------------------------------------------#
+
+def add_year_fraction(start, tau, day_count="ACT/365", holidays=None):
+    """
+    Returns the date (as dt.datetime object) coming a year fraction tau after
+    the start date, under the day-count convention day_count (see year_fraction()
+    function). The number of days is rounded up.
+    """
+
+    if day_count not in DAY_COUNT_CONVENTIONS:
+        raise NotImplementedError("Day-count convention: '{}' does not exist!".format(day_count))
+
+    days = math.ceil(tau * DAY_COUNT_CONVENTIONS[day_count])
+
+    if day_count == "BUS/252":
+        end = np.busday_offset(to_datetime64(start).astype('datetime64[D]'), days,
+                               roll='forward', holidays=to_holidays(holidays))
+        return pd.Timestamp(end).to_pydatetime()
+    else:
+        start = start if isinstance(start, dt.datetime) else pd.Timestamp(to_datetime64(start)).to_pydatetime()
+        return start + dt.timedelta(days=days)
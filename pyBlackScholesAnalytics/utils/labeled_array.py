@@ -0,0 +1,253 @@
+"""
+Created by: Gabriele Pompa (gabriele.pompa@gmail.com)
+
+File: labeled_array.py
+
+Created on Tue Jul 14 2020 - Version: 1.0
+
+Description:
+
+This file contains the definition of the LabeledArray class, a light-weight
+N-dimensional labelled container (in the spirit of xarray.DataArray) for the
+outputs of computations on grids of scenarios with more than two axes.
+"""
+
+# ----------------------- standard imports ---------------------------------- #
+# for NumPy arrays
+import numpy as np
+
+# for arithmetic operators defined through NumPy ufuncs
+from numpy.lib.mixins import NDArrayOperatorsMixin
+
+# for Pandas Series and DataFrame
+import pandas as pd
+
+# ----------------------- sub-modules imports ------------------------------- #
+
+from utils.utils import is_iterable_not_string, date_string_to_datetime_obj
+
+#-----------------------------------------------------------------------------#
+
+class LabeledArray(NDArrayOperatorsMixin):
+    """
+    LabeledArray class: a np.ndarray of values together with its axes, one
+    (name, labels) pair for each dimension. Values are stored as given (no copy)
+    and labels are attached once, after computations are done on np.ndarrays.
+
+    Arithmetic operators and NumPy ufuncs (np.exp, np.maximum, ...) apply to
+    values. Element-wise results keep the axes; operands which are LabeledArrays
+    too must have the same axes.
+
+    Attributes:
+    -----------
+        values (np.ndarray): values, of shape (len(labels_0), ..., len(labels_N-1));
+        axes (List):         (name, labels) pairs, one for each dimension of values.
+
+    Public Methods:
+    --------
+
+        getters for all attributes
+
+        get_dims: Tuple
+            Returns the names of the axes.
+
+        get_coords: np.ndarray (or pd.Index)
+            Returns the labels of an axis, given its name.
+
+        isel: LabeledArray
+            Selects values by position along named axes.
+
+        sel: LabeledArray
+            Selects values by label along named axes.
+
+        to_pandas: scalar, pd.Series or pd.DataFrame
+            Returns 0, 1 and 2-dim arrays as scalar, pd.Series and pd.DataFrame, respectively.
+
+    Instantiation and Usage examples:
+    --------
+
+        - example_options_labeled_output.py
+
+        - LabeledArray(values, [("S", S_vector), ("sigma", sigma_vector), ("t", t_range)])
+          labels a (len(S_vector), len(sigma_vector), len(t_range)) shaped np.ndarray values.
+    """
+
+    def __init__(self, values, axes):
+
+        self.__values = np.asarray(values)
+        self.__axes = [(name, labels if isinstance(labels, (np.ndarray, pd.Index)) else np.asarray(labels)) 
+                       for name, labels in axes]
+
+        if len(self.__axes) != self.__values.ndim:
+            raise ValueError("{} axes given for {}-dim values".format(len(self.__axes), self.__values.ndim))
+
+        for (name, labels), length in zip(self.__axes, self.__values.shape):
+            if len(labels) != length:
+                raise ValueError("Axis '{}' has {} labels for a dimension of length {}".format(name, len(labels), length))
+
+    def __repr__(self):
+        return r"LabeledArray(dims={}, shape={})".format(self.get_dims(), self.shape) + "\n" + repr(self.__values)
+
+    # getters
+    def get_values(self):
+        return self.__values
+
+    def get_axes(self):
+        return self.__axes
+
+    def get_dims(self):
+        return tuple([name for name, labels in self.__axes])
+
+    def get_coords(self, name):
+        return self.__axes[self.__axis_number(name)][1]
+
+    @property
+    def shape(self):
+        return self.__values.shape
+
+    @property
+    def ndim(self):
+        return self.__values.ndim
+
+    @property
+    def dtype(self):
+        return self.__values.dtype
+
+    #
+    # Private methods
+    #
+
+    def __axis_number(self, name):
+        """Returns the dimension of axis named name."""
+
+        dims = self.get_dims()
+
+        if name not in dims:
+            raise KeyError("No axis named '{}'. Available axes: {}".format(name, dims))
+
+        return dims.index(name)
+
+    #
+    # NumPy protocols
+    #
+
+    def __array__(self, dtype=None):
+        return self.__values if dtype is None else self.__values.astype(dtype, copy=False)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        """
+        Applies ufunc to the values of the inputs, labelling element-wise
+        results with the common axes (other results are returned as np.ndarrays).
+        """
+
+        axes = [x.get_axes() for x in inputs if isinstance(x, LabeledArray)]
+
+        # LabeledArray operands must share the same axes
+        for other_axes in axes[1:]:
+            if not same_axes(axes[0], other_axes):
+                raise ValueError("Operands of '{}' are labelled by different axes: {} and {}"\
+                                 .format(ufunc.__name__, [n for n, l in axes[0]], [n for n, l in other_axes]))
+
+        values = [x.get_values() if isinstance(x, LabeledArray) else x for x in inputs]
+        result = getattr(ufunc, method)(*values, **kwargs)
+
+        def label(x):
+            return LabeledArray(x, axes[0]) if method == "__call__" and np.shape(x) == self.shape else x
+
+        return tuple([label(x) for x in result]) if isinstance(result, tuple) else label(result)
+
+    #
+    # Public methods
+    #
+
+    def isel(self, **indices):
+        """
+        Selects values by position along the named axes. Each index can be an
+        Integer (the axis is dropped), a slice or an Iterable of Integers
+        (e.g. .isel(S=0, t=slice(2, None)) selects the first underlying value
+        on all dates but the first two).
+        """
+
+        values = self.__values
+        axes = list(self.__axes)
+
+        # from the last to the first dimension, so that dropping an axis does not shift the others
+        for k in sorted([self.__axis_number(name) for name in indices], reverse=True):
+
+            name, labels = axes[k]
+            index = indices[name]
+
+            if is_iterable_not_string(index):
+                index = np.asarray(index)
+                values = np.take(values, index, axis=k)
+                axes[k] = (name, labels[index])
+            else:
+                values = values[(slice(None),) * k + (index,)]
+                if isinstance(index, slice):
+                    axes[k] = (name, labels[index])
+                else:
+                    del axes[k]
+
+        return LabeledArray(values, axes)
+
+    def sel(self, **labels):
+        """
+        Selects values by label along the named axes. Each label can be a
+        scalar (the axis is dropped) or an Iterable of labels (e.g.
+        .sel(sigma=0.2, t=["01-06-2020", "01-12-2020"])). Labels of dates can be given as
+        Strings. A KeyError is raised if a label is missing.
+        """
+
+        indices = {}
+
+        for name in labels:
+
+            axis_index = pd.Index(self.get_coords(name))
+
+            # 'dd-mm-YYYY' Strings as dates
+            to_label = date_string_to_datetime_obj if isinstance(axis_index, pd.DatetimeIndex) else (lambda x: x)
+
+            if is_iterable_not_string(labels[name]):
+                label_list = [to_label(l) for l in labels[name]]
+                positions = axis_index.get_indexer(label_list)
+                if np.any(positions < 0):
+                    raise KeyError("Labels {} not found along axis '{}'".format(labels[name], name))
+                indices[name] = positions
+            else:
+                indices[name] = axis_index.get_loc(to_label(labels[name]))
+
+        return self.isel(**indices)
+
+    def to_pandas(self):
+        """
+        Returns 0-dim values as a scalar, 1-dim values as a pd.Series and 2-dim
+        values as a pd.DataFrame (index spanned by the first axis, columns by the
+        second one), without copying values.
+        """
+
+        if self.ndim == 0:
+            return self.__values[()]
+
+        index = [pd.Index(labels, name=name) for name, labels in self.__axes]
+
+        if self.ndim == 1:
+            return pd.Series(data=self.__values, index=index[0], copy=False)
+        elif self.ndim == 2:
+            return pd.DataFrame(data=self.__values, index=index[0], columns=index[1], copy=False)
+        else:
+            raise ValueError("{}-dim values cannot be returned as pd.Series or pd.DataFrame: select along {} axes first"\
+                             .format(self.ndim, self.ndim - 2))
+
+#-----------------------------------------------------------------------------#
+
+def same_axes(axes, other_axes):
+    """
+    Utility function to test whether two Lists of (name, labels) pairs have the
+    same names and labels.
+    """
+
+    if len(axes) != len(other_axes):
+        return False
+
+    return all([name == other_name and len(labels) == len(other_labels) and np.all(np.asarray(labels) == np.asarray(other_labels))
+                for (name, labels), (other_name, other_labels) in zip(axes, other_axes)])
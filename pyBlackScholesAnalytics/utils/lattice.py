@@ -0,0 +1,341 @@
+"""
+Created by: Gabriele Pompa (gabriele.pompa@gmail.com)
+
+File: lattice.py
+
+Created on Tue Jul 14 2020 - Version: 1.0
+
+Description:
+
+This file contains the definition of the LatticePricer class, pricing option
+contracts and portfolios on recombining binomial (Cox-Ross-Rubinstein) and
+trinomial lattices, with european or american exercise. Many contracts and
+pricing scenarios are priced together: each one is a column of a 2-D array
+of node values, swept backward in time with NumPy slices.
+"""
+
+# ----------------------- standard imports ---------------------------------- #
+# for NumPy arrays
+import numpy as np
+
+# for Pandas Series and DataFrame
+import pandas as pd
+
+# ----------------------- sub-modules imports ------------------------------- #
+
+from utils.utils import *
+
+#-----------------------------------------------------------------------------#
+
+def lattice_parameters(tau, sigma, r, n_steps, method="binomial"):
+    """
+    Returns the time-step, the up-move factor, the discount factor per step and
+    the risk-neutral probabilities (from the highest to the lowest move) of a
+    binomial (Cox-Ross-Rubinstein) or trinomial lattice with n_steps time steps,
+    for each (tau, sigma, r) row.
+    """
+
+    dt = tau / n_steps
+    discount = np.exp(- r * dt)
+
+    if method == "binomial":
+
+        u = np.exp(sigma * np.sqrt(dt))
+        p_up = (np.exp(r * dt) - 1.0/u) / (u - 1.0/u)
+        probabilities = (p_up, 1.0 - p_up)
+
+    elif method == "trinomial":
+
+        u = np.exp(sigma * np.sqrt(2.0 * dt))
+        half_up = np.exp(sigma * np.sqrt(0.5 * dt))
+        drift = np.exp(0.5 * r * dt)
+        p_up = ((drift - 1.0/half_up) / (half_up - 1.0/half_up)) ** 2
+        p_down = ((half_up - drift) / (half_up - 1.0/half_up)) ** 2
+        probabilities = (p_up, 1.0 - p_up - p_down, p_down)
+
+    else:
+        raise ValueError("method '{}' not recognized. Valid methods: 'binomial', 'trinomial'.".format(method))
+
+    return dt, u, discount, probabilities
+
+def backward_induction(S, tau, sigma, r, payoff, n_steps, method="binomial", american=False, european_value=None):
+    """
+    Values many contracts at once on binomial or trinomial lattices of n_steps
+    time steps, by backward induction.
+
+    S, tau, sigma and r are 1-D arrays, one entry for each contract to value.
+    Node values are stored in a 2-D (nodes, contracts) array, swept backward 
+    step by step. Contracts have their own time-step, so that contracts with
+    different expirations are valued in the same sweep.
+
+    payoff is a function returning the exercise values given a (nodes, contracts)
+    array of underlying values at the nodes. If american is True, the value
+    at each node is the maximum between continuation and exercise values.
+
+    If european_value is given, it must be a function returning the closed-form
+    european value given a (nodes, contracts) array of underlying values and the
+    1-D array of times-to-maturity. It is used to value the last time-step
+    (smoothing the payoff, as in the Binomial Black-Scholes method).
+
+    Returns the 1-D array of values at the root of the lattices.
+    """
+
+    dt, u, discount, probabilities = lattice_parameters(tau, sigma, r, n_steps, method)
+
+    # discounted probabilities
+    probabilities = [discount * p for p in probabilities]
+
+    # last step valued in closed form, or expiration
+    last_step = n_steps - 1 if european_value is not None else n_steps
+
+    # underlying values at all the levels of the lattice: S * u^k, k = -last_step, ..., last_step
+    S_levels = S * np.exp(np.log(u) * np.arange(-last_step, last_step + 1, dtype=S.dtype)[:, None])
+
+    # underlying values at the nodes of step j (lowest node first): a view on S_levels
+    if method == "binomial":
+        S_nodes = lambda j: S_levels[last_step-j:last_step+j+1:2]
+    else:
+        S_nodes = lambda j: S_levels[last_step-j:last_step+j+1]
+
+    if european_value is not None:
+        V = european_value(S_nodes(last_step), dt)
+        if american:
+            np.maximum(V, payoff(S_nodes(last_step)), out=V)
+    else:
+        V = payoff(S_nodes(last_step))
+
+    # buffer for the contributions of upper nodes
+    buffer = np.empty_like(V)
+
+    for j in range(last_step - 1, -1, -1):
+
+        n_nodes = j + 1 if method == "binomial" else 2 * j + 1
+        V_next, contribution = V[:n_nodes], buffer[:n_nodes]
+
+        # continuation values: node i of step j is reached by nodes i, i+1 (,i+2) of step j+1.
+        # Contributions of upper nodes are buffered before node i is updated in-place
+        if method == "binomial":
+            p_up, p_down = probabilities
+            np.multiply(p_up, V[1:n_nodes+1], out=contribution)
+        else:
+            p_up, p_mid, p_down = probabilities
+            np.multiply(p_up, V[2:n_nodes+2], out=contribution)
+            contribution += p_mid * V[1:n_nodes+1]
+
+        V_next *= p_down
+        V_next += contribution
+
+        # early-exercise
+        if american:
+            np.maximum(V_next, payoff(S_nodes(j)), out=V_next)
+
+    return V[0]
+
+#-----------------------------------------------------------------------------#
+
+class LatticePricer:
+    """
+    LatticePricer class: a class implementing pricing of option contracts on
+    recombining binomial (Cox-Ross-Rubinstein) and trinomial lattices, with
+    european or american exercise. The exercise value is taken from the
+    .call_payoff() and .put_payoff() methods of the FinancialObject, so that
+    any EuropeanOption sub-class (or Portfolio of them) can be priced.
+
+    All the pricing scenarios (e.g. a grid of underlying values and valuation
+    dates) of all the contracts are valued in a single backward sweep: each one
+    is a column of a 2-D array of node values, updated in-place step by step.
+
+    Accuracy at small numbers of steps can be improved with:
+
+        - smoothing: the last time-step is valued with the closed-form european
+          price (.call_price() and .put_price() methods), as in the Binomial
+          Black-Scholes method, removing the oscillations of the error;
+        - Richardson extrapolation: 2*V(n_steps) - V(n_steps/2), removing the
+          leading 1/n_steps term of the error (effective after smoothing).
+
+    Attributes:
+    -----------
+        FinancialObject (EuropeanOption sub-class or Portfolio):      Instance of an EuropeanOption sub-class
+                                                                      (PlainVanillaOption or DigitalOption) or a Portfolio
+                                                                      class.
+        n_steps (int):                                                Optional. Number of time steps. Default: 200;
+        method (str):                                                 Optional. Either 'binomial' or 'trinomial'. Default: 'binomial';
+        exercise (str):                                               Optional. Either 'european' or 'american'. Default: 'european';
+        smoothing (bool):                                             Optional. If True, the last time-step is valued in closed form.
+                                                                      Default: False;
+        richardson (bool):                                            Optional. If True, Richardson extrapolation is used. Default: False.
+
+    Public Methods:
+    --------
+
+        getters and setters for all attributes, except FinancialObject
+
+        price: float
+            Computes the lattice price of the FinancialObject.
+
+        early_exercise_premium: float
+            Computes the difference between american and european lattice prices of the FinancialObject.
+
+    Instantiation and Usage examples:
+    --------
+
+        - example_options_lattice.py
+
+        - LatticePricer(option, n_steps=100, exercise='american', smoothing=True, richardson=True).price(S=[90.0, 100.0])
+    """
+
+    def __init__(self, FinancialObject, n_steps=200, method="binomial", exercise="european",
+                 smoothing=False, richardson=False):
+
+        self.opt = FinancialObject
+        self.__n_steps = n_steps
+        self.__method = method
+        self.__exercise = exercise
+        self.__smoothing = smoothing
+        self.__richardson = richardson
+
+    # getters
+    def get_n_steps(self):
+        return self.__n_steps
+
+    def get_method(self):
+        return self.__method
+
+    def get_exercise(self):
+        return self.__exercise
+
+    def get_smoothing(self):
+        return self.__smoothing
+
+    def get_richardson(self):
+        return self.__richardson
+
+    # setters
+    def set_n_steps(self, n_steps):
+        self.__n_steps = n_steps
+
+    def set_method(self, method):
+        self.__method = method
+
+    def set_exercise(self, exercise):
+        self.__exercise = exercise
+
+    def set_smoothing(self, smoothing):
+        self.__smoothing = smoothing
+
+    def set_richardson(self, richardson):
+        self.__richardson = richardson
+
+    def price(self, **kwargs):
+        """
+        Lattice price of the FinancialObject.
+
+        Can be called as self.opt.price() method.
+        """
+
+        if self.get_exercise() not in ["european", "american"]:
+            raise ValueError("exercise '{}' not recognized. Valid exercises: 'european', 'american'."\
+                             .format(self.get_exercise()))
+
+        # legs: a single instrument or the portfolio constituents, with their pricing parameters
+        legs, ind_output, col_output = pricing_legs(self.opt, **kwargs)
+
+        # contract terms other than strike-price (e.g. type and cash amount), defining the payoff function
+        payoff_terms = lambda instrument: (instrument.__class__.__name__, sorted(instrument.kernel_terms().items()))
+
+        # instruments sharing the same payoff function are given adjacent columns
+        legs = sorted(legs, key=lambda leg: str(payoff_terms(leg["instrument"])))
+
+        # columns of the lattice: flattened pricing parameters of all the instruments
+        columns = 0
+
+        for leg in legs:
+
+            leg["params"] = {p: leg["params"][p].ravel() for p in leg["params"]}
+            leg["columns"] = slice(columns, columns + leg["params"]["S"].size)
+
+            columns += leg["params"]["S"].size
+
+        # groups of adjacent columns sharing the same payoff function, each with a representative instrument
+        groups = []
+        for leg in legs:
+            if groups and payoff_terms(groups[-1]["instrument"]) == payoff_terms(leg["instrument"]):
+                groups[-1]["columns"] = slice(groups[-1]["columns"].start, leg["columns"].stop)
+            else:
+                groups.append({"instrument": leg["instrument"], "columns": leg["columns"]})
+
+        S, K, tau, sigma, r = [np.concatenate([leg["params"][p] for leg in legs]) for p in ["S", "K", "tau", "sigma", "r"]]
+
+        # expired contracts are valued at payoff, on a dummy lattice
+        is_expired = tau <= 0
+        tau_lattice = np.where(is_expired, 1.0, tau)
+
+        def payoff(S_nodes):
+            """Exercise values of the instruments, each group on its own columns."""
+
+            # single group: no need to gather values
+            if len(groups) == 1:
+                instrument = groups[0]["instrument"]
+                if instrument.get_type() == 'call':
+                    return instrument.call_payoff(S=S_nodes, K=K)
+                else:
+                    return instrument.put_payoff(S=S_nodes, K=K)
+
+            values = np.empty_like(S_nodes)
+            for group in groups:
+                cols, instrument = group["columns"], group["instrument"]
+                if instrument.get_type() == 'call':
+                    values[:, cols] = instrument.call_payoff(S=S_nodes[:, cols], K=K[cols])
+                else:
+                    values[:, cols] = instrument.put_payoff(S=S_nodes[:, cols], K=K[cols])
+            return values
+
+        def european_value(S_nodes, tau_nodes):
+            """Closed-form european values of the instruments, each group on its own columns."""
+            values = np.empty_like(S_nodes)
+            for group in groups:
+                cols, instrument = group["columns"], group["instrument"]
+                pricing_args = dict(S=S_nodes[:, cols], K=K[cols], tau=tau_nodes[cols], sigma=sigma[cols], r=r[cols])
+                if instrument.get_type() == 'call':
+                    values[:, cols] = instrument.call_price(**pricing_args)
+                else:
+                    values[:, cols] = instrument.put_price(**pricing_args)
+            return values
+
+        def lattice_values(n_steps):
+            return backward_induction(S, tau_lattice, sigma, r, payoff, n_steps, method=self.get_method(),
+                                      american=self.get_exercise() == "american",
+                                      european_value=european_value if self.get_smoothing() else None)
+
+        values = lattice_values(self.get_n_steps())
+
+        # Richardson extrapolation
+        if self.get_richardson():
+            values = 2.0 * values - lattice_values(self.get_n_steps() // 2)
+
+        values = np.where(is_expired, payoff(S[None, :])[0], values)
+
+        # portfolio value is the sum position * instrument_value
+        price = sum([leg["position"] * values[leg["columns"]].reshape(leg["shape"]) for leg in legs])
+
+        # labelling output as pd.DataFrame, if necessary
+        return attach_labels(price, ind_output, col_output)
+
+    def early_exercise_premium(self, **kwargs):
+        """
+        Difference between american and european lattice prices.
+
+        Can be called as self.opt.price() method.
+        """
+
+        exercise = self.get_exercise()
+
+        try:
+            self.set_exercise("american")
+            american_price = self.price(**kwargs)
+            self.set_exercise("european")
+            european_price = self.price(**kwargs)
+        finally:
+            self.set_exercise(exercise)
+
+        return american_price - european_price
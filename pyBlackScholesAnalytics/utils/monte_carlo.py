@@ -0,0 +1,399 @@
+"""
+Created by: Gabriele Pompa (gabriele.pompa@gmail.com)
+
+File: monte_carlo.py
+
+Created on Tue Jul 14 2020 - Version: 1.0
+
+Description:
+
+This file contains the definition of the MonteCarloPricer class, pricing
+option contracts and portfolios by Monte Carlo simulation of the underlying
+under Geometric Brownian Motion. Paths are simulated in fixed-size chunks,
+each one drawn from an independent random stream, optionally spread across
+a pool of processes.
+"""
+
+# ----------------------- standard imports ---------------------------------- #
+# for NumPy arrays
+import numpy as np
+
+# for Pandas Series and DataFrame
+import pandas as pd
+
+# for the pool of worker processes
+from concurrent.futures import ProcessPoolExecutor
+
+# ----------------------- sub-modules imports ------------------------------- #
+
+from utils.utils import *
+from utils.qmc import SobolSequence
+from options.options import PlainVanillaOption
+
+#-----------------------------------------------------------------------------#
+
+def combine_moments(moments_a, moments_b):
+    """
+    Combines the sample moments of two disjoint sets of samples (Chan et al.
+    pairwise update). Moments are dictionaries with keys:
+
+        - 'n': number of samples;
+        - 'mean_y', 'mean_x': sample means of the target and control variable;
+        - 'M2_yy', 'M2_xx', 'M2_xy': sums of centered squares and cross-products.
+    """
+
+    if moments_a is None:
+        return moments_b
+
+    n_a, n_b = moments_a["n"], moments_b["n"]
+    n = n_a + n_b
+
+    delta_y = moments_b["mean_y"] - moments_a["mean_y"]
+    delta_x = moments_b["mean_x"] - moments_a["mean_x"]
+
+    return {"n": n,
+            "mean_y": moments_a["mean_y"] + delta_y * n_b / n,
+            "mean_x": moments_a["mean_x"] + delta_x * n_b / n,
+            "M2_yy": moments_a["M2_yy"] + moments_b["M2_yy"] + delta_y * delta_y * n_a * n_b / n,
+            "M2_xx": moments_a["M2_xx"] + moments_b["M2_xx"] + delta_x * delta_x * n_a * n_b / n,
+            "M2_xy": moments_a["M2_xy"] + moments_b["M2_xy"] + delta_x * delta_y * n_a * n_b / n}
+
+def terminal_moments(instruments, W_T, antithetic=True):
+    """
+    Returns the sample moments (see combine_moments() function) of:
+
+        - the target variable y: discounted payoff of the instruments (from their .call_payoff() 
+          and .put_payoff() methods, so including the cash amount of digital options), 
+          weighted by position;
+        - the control variable x: discounted payoff of plain-vanilla calls with the same
+          strikes and expiries, weighted by position;
+
+    given an array W_T of terminal values of a standard Brownian motion on [0,1].
+
+    instruments is a list of (position, instrument, pricing parameters) tuples.
+    Parameters are aligned np.ndarrays, to which a leading paths axis is prepended.
+    If antithetic is True, each sample is the average over the (W_T, -W_T) pair.
+    """
+
+    n_draws = len(W_T)
+    shape = instruments[0][2]["S"].shape
+
+    # terminal values, with a leading paths axis
+    W_T = W_T.reshape((n_draws,) + (1,)*len(shape))
+    W_T = np.concatenate([W_T, -W_T]) if antithetic else W_T
+
+    y = 0.0
+    x = 0.0
+
+    for position, instrument, params in instruments:
+
+        S, K, tau, sigma, r = [params[p] for p in ["S", "K", "tau", "sigma", "r"]]
+        discount = np.exp(- r * tau)
+
+        # exact GBM terminal values
+        S_T = S * np.exp((r - 0.5 * sigma ** 2) * tau + sigma * np.sqrt(tau) * W_T)
+
+        # call case
+        if instrument.get_type() == 'call':
+            payoff = instrument.call_payoff(S=S_T, K=K)
+        # put case
+        else:
+            payoff = instrument.put_payoff(S=S_T, K=K)
+
+        y = y + position * discount * payoff
+        x = x + position * discount * np.maximum(S_T - K, 0.0)
+
+    # averaging over antithetic pairs
+    if antithetic:
+        y = 0.5 * (y[:n_draws] + y[n_draws:])
+        x = 0.5 * (x[:n_draws] + x[n_draws:])
+
+    mean_y, mean_x = y.mean(axis=0), x.mean(axis=0)
+    y_c, x_c = y - mean_y, x - mean_x
+
+    return {"n": n_draws,
+            "mean_y": mean_y,
+            "mean_x": mean_x,
+            "M2_yy": (y_c * y_c).sum(axis=0),
+            "M2_xx": (x_c * x_c).sum(axis=0),
+            "M2_xy": (x_c * y_c).sum(axis=0)}
+
+def simulate_chunk(instruments, n_paths, stream, antithetic=True, sampler="pseudo", chunk_size=None):
+    """
+    Simulates a chunk of n_paths terminal values of the underlying under GBM
+    and returns the sample moments of terminal_moments() function. Payoffs are
+    European, so that the terminal value, drawn exactly, is all that is needed:
+    no intermediate time steps are simulated.
+
+    If sampler is 'pseudo', the terminal value of the Brownian motion is drawn 
+    from pseudo-random normals of stream. If sampler is 'sobol', the chunk is a 
+    single randomization of a one-dimensional scrambled Sobol sequence, seeded by
+    stream. Sobol points are generated in sub-chunks of (at most) chunk_size paths.
+
+    If antithetic is True, n_paths/2 points are drawn and each sample is the average
+    over the path and its reflection.
+    """
+
+    n_draws = n_paths // 2 if antithetic else n_paths
+
+    if sampler == "sobol":
+
+        sequence = SobolSequence(1, seed=stream)
+
+        draws_per_chunk = n_draws if chunk_size is None else max(chunk_size // 2 if antithetic else chunk_size, 1)
+
+        moments = None
+        for start in range(0, n_draws, draws_per_chunk):
+            W_T = sequence.normals(start, min(start + draws_per_chunk, n_draws))[:, 0]
+            moments = combine_moments(moments, terminal_moments(instruments, W_T, antithetic))
+
+        return moments
+
+    elif sampler == "pseudo":
+
+        rng = random_generator(stream)
+        W_T = rng.standard_normal(n_draws)
+
+        return terminal_moments(instruments, W_T, antithetic)
+
+    else:
+        raise ValueError("sampler '{}' not recognized. Valid samplers: 'pseudo', 'sobol'.".format(sampler))
+
+#-----------------------------------------------------------------------------#
+
+class MonteCarloPricer:
+    """
+    MonteCarloPricer class: a class implementing Monte Carlo pricing of option
+    contracts under Geometric Brownian Motion. The payoff is taken from the
+    .call_payoff() and .put_payoff() methods of the FinancialObject, so that any
+    EuropeanOption sub-class (or Portfolio of them) can be priced.
+
+    Paths are simulated in chunks of (at most) chunk_size paths, so that memory
+    stays bounded for any number of paths. Each chunk draws from its own
+    independent random stream, spawned from seed: results are reproducible and
+    do not depend on the number of workers. If n_workers > 1, chunks are spread
+    across a pool of processes.
+
+    Samplers:
+
+        - 'pseudo': pseudo-random normals;
+        - 'sobol': randomized Quasi-Monte Carlo, from n_replicates independent scramblings 
+          of the (one-dimensional) Sobol sequence, each of 2^m points. The standard error 
+          is estimated from the dispersion of the replicates estimates.
+
+    Payoffs are European: only the terminal value of the underlying is simulated, 
+    exactly, so there is no time-discretization (for multi-step paths, see the 
+    SobolSequence and BrownianBridge classes of utils.qmc).
+
+    Variance reduction:
+
+        - antithetic variates: normals are drawn in (Z, -Z) pairs;
+        - control variate: the discounted payoff of plain-vanilla calls with the same
+          strikes and expiries, whose expectation is the closed-form Black-Scholes
+          call price. The optimal coefficient is estimated from the simulation.
+
+    Attributes:
+    -----------
+        FinancialObject (EuropeanOption sub-class or Portfolio):      Instance of an EuropeanOption sub-class
+                                                                      (PlainVanillaOption or DigitalOption) or a Portfolio
+                                                                      class.
+        n_paths (int):                                                Optional. Number of simulated paths. Default: 100000;
+        chunk_size (int):                                             Optional. Maximum number of paths per chunk. Default: 50000;
+        antithetic (bool):                                            Optional. If True, antithetic variates are used. Default: True;
+        control_variate (bool):                                       Optional. If True, the control variate is used. Default: True;
+        n_workers (int):                                              Optional. Number of worker processes. Default: 1 (no pool);
+        seed (int):                                                   Optional. Root seed of random streams. Default: None;
+        sampler (str):                                                Optional. Either 'pseudo' or 'sobol'. Default: 'pseudo';
+        n_replicates (int):                                           Optional. Number of randomizations of the Sobol sequence,
+                                                                      for 'sobol' sampler. Default: 16.
+
+    Public Methods:
+    --------
+
+        getters and setters for all attributes, except FinancialObject
+
+        estimate: dict
+            Computes the Monte Carlo price of the FinancialObject, with its standard error.
+
+        price: float
+            Computes the Monte Carlo price of the FinancialObject (as .estimate()['price']).
+
+    Instantiation and Usage examples:
+    --------
+
+        - example_options_monte_carlo.py
+
+        - example_options_quasi_monte_carlo.py
+
+        - MonteCarloPricer(option, n_paths=10**6, n_workers=4, seed=42).price(S=[90.0, 100.0])
+
+        - MonteCarloPricer(option, n_paths=2**14, sampler='sobol', seed=42).estimate()
+    """
+
+    def __init__(self, FinancialObject, n_paths=100000, chunk_size=50000, antithetic=True,
+                 control_variate=True, n_workers=1, seed=None, sampler="pseudo", n_replicates=16):
+
+        self.opt = FinancialObject
+        self.__n_paths = n_paths
+        self.__chunk_size = chunk_size
+        self.__antithetic = antithetic
+        self.__control_variate = control_variate
+        self.__n_workers = n_workers
+        self.__seed = seed
+        self.__sampler = sampler
+        self.__n_replicates = n_replicates
+
+    # getters
+    def get_n_paths(self):
+        return self.__n_paths
+
+    def get_chunk_size(self):
+        return self.__chunk_size
+
+    def get_antithetic(self):
+        return self.__antithetic
+
+    def get_control_variate(self):
+        return self.__control_variate
+
+    def get_n_workers(self):
+        return self.__n_workers
+
+    def get_seed(self):
+        return self.__seed
+
+    def get_sampler(self):
+        return self.__sampler
+
+    def get_n_replicates(self):
+        return self.__n_replicates
+
+    # setters
+    def set_n_paths(self, n_paths):
+        self.__n_paths = n_paths
+
+    def set_chunk_size(self, chunk_size):
+        self.__chunk_size = chunk_size
+
+    def set_antithetic(self, antithetic):
+        self.__antithetic = antithetic
+
+    def set_control_variate(self, control_variate):
+        self.__control_variate = control_variate
+
+    def set_n_workers(self, n_workers):
+        self.__n_workers = n_workers
+
+    def set_seed(self, seed):
+        self.__seed = seed
+
+    def set_sampler(self, sampler):
+        self.__sampler = sampler
+
+    def set_n_replicates(self, n_replicates):
+        self.__n_replicates = n_replicates
+
+    def __chunks(self):
+        """
+        Private method returning the list of path counts of the chunks. With
+        antithetic variates, each chunk simulates an even number of paths.
+
+        For 'sobol' sampler, chunks are the n_replicates randomizations, each of 
+        2^m points, with m as large as possible within n_paths in total.
+        """
+
+        n_paths, chunk_size = self.get_n_paths(), self.get_chunk_size()
+
+        if self.get_sampler() == "sobol":
+            paths_per_point = 2 if self.get_antithetic() else 1
+            n_points = max(n_paths // (paths_per_point * self.get_n_replicates()), 1)
+            return [paths_per_point * 2 ** int(np.log2(n_points))] * self.get_n_replicates()
+
+        # antithetic pairs are never split across chunks
+        if self.get_antithetic():
+            n_paths, chunk_size = 2 * (n_paths // 2), max(2 * (chunk_size // 2), 2)
+
+        n_full, remainder = divmod(n_paths, chunk_size)
+
+        return [chunk_size] * n_full + ([remainder] if remainder > 0 else [])
+
+    def estimate(self, **kwargs):
+        """
+        Monte Carlo price of the FinancialObject.
+
+        Can be called as self.opt.price() method.
+
+        Returns a dictionary with keys:
+
+            - 'price': the Monte Carlo estimate of the price;
+            - 'std_error': the standard error of the estimate (for 'sobol' sampler, 
+              estimated from the dispersion of replicates);
+            - 'n_paths': the number of simulated paths.
+        """
+
+        # legs: a single instrument or the portfolio constituents, with their pricing parameters
+        legs, ind_output, col_output = pricing_legs(self.opt, **kwargs)
+        instruments_params = [(leg["position"], leg["instrument"], leg["params"]) for leg in legs]
+
+        # closed-form expectation of the control variate
+        control_price = sum([position * PlainVanillaOption.price_arrays(**params, is_call=True)
+                             for position, instrument, params in instruments_params])
+
+        # independent random streams, one per chunk
+        chunks = self.__chunks()
+        streams = spawn_streams(self.get_seed(), len(chunks))
+        chunk_args = [[instruments_params] * len(chunks), chunks, streams,
+                      [self.get_antithetic()] * len(chunks), [self.get_sampler()] * len(chunks),
+                      [self.get_chunk_size()] * len(chunks)]
+
+        # sample moments of each chunk
+        if self.get_n_workers() > 1:
+            with ProcessPoolExecutor(max_workers=self.get_n_workers()) as executor:
+                chunks_moments = list(executor.map(simulate_chunk, *chunk_args))
+        else:
+            chunks_moments = list(map(simulate_chunk, *chunk_args))
+
+        # combined moments
+        moments = None
+        for chunk_moments in chunks_moments:
+            moments = combine_moments(moments, chunk_moments)
+
+        n = moments["n"]
+        var_y = moments["M2_yy"] / (n - 1)
+
+        if self.get_control_variate():
+
+            var_x = moments["M2_xx"] / (n - 1)
+            cov_xy = moments["M2_xy"] / (n - 1)
+
+            # optimal control coefficient (zero if the control is degenerate, e.g. tau=0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                beta = np.where(var_x > 0, cov_xy / var_x, 0.0)
+
+            price = moments["mean_y"] - beta * (moments["mean_x"] - control_price)
+            variance = np.maximum(var_y - beta * cov_xy, 0.0)
+        else:
+            beta = 0.0
+            price = moments["mean_y"]
+            variance = var_y
+
+        # randomized QMC: the error is estimated from the dispersion of replicates estimates
+        if self.get_sampler() == "sobol":
+            replicates = np.array([m["mean_y"] - beta * (m["mean_x"] - control_price) for m in chunks_moments])
+            std_error = replicates.std(axis=0, ddof=1) / np.sqrt(len(replicates))
+        else:
+            std_error = np.sqrt(variance / n)
+
+        estimate = {"price": price,
+                    "std_error": std_error,
+                    "n_paths": n * 2 if self.get_antithetic() else n}
+
+        # labelling output as pd.DataFrame, if necessary
+        estimate.update(attach_labels({metrics: estimate[metrics] for metrics in ["price", "std_error"]}, 
+                                      ind_output, col_output))
+
+        return estimate
+
+    def price(self, **kwargs):
+        """Monte Carlo price. Can be called as self.opt.price() method."""
+        return self.estimate(**kwargs)["price"]
@@ -9,6 +9,9 @@ File name: numerical_routines.py
 # for NumPy arrays
 import numpy as np
 
+# for Pandas Series and DataFrame
+import pandas as pd
+
 # ----------------------- sub-modules imports ------------------------------- #
 
 from utils.utils import *
@@ -47,6 +50,10 @@ class NumericGreeks:
         rho: float
             Computes the numeric rho of the FinancialObject.
         
+        all: dict
+            Computes the numeric price, delta, theta, gamma, vega and rho of the 
+            FinancialObject at once, from a single stacked finite-differences stencil.
+        
     Instantiation and Usage examples: 
     --------   
         
@@ -152,3 +159,483 @@ class NumericGreeks:
         rescaling_factor = kwargs["factor"] if "factor" in kwargs else 0.01
 
         return ((self.f(r=r0+self.get_epsilon(), **kwargs) - self.f(r=r0-self.get_epsilon(), **kwargs))/(2*self.get_epsilon())) * rescaling_factor
+
+    def all(self, **kwargs):
+        """
+        Numeric price and greeks (delta, theta, gamma, vega and rho) computed together. 
+        
+        Can be called as self.opt.price() method.
+        
+        Pricing parameters are processed only once. The center point and the 8 
+        points bumped by +/-epsilon in S, tau, sigma and r are stacked along a new 
+        leading axis and priced in a single vectorized call (one for each instrument, 
+        if the FinancialObject is a Portfolio). The center price is shared by 
+        gamma and returned as 'price'. Expired points (tau <= 0) are valued at 
+        payoff, as in .price() method. 
+        
+        Optionally, theta, vega and rho can be rescaled using the "theta_factor", 
+        "vega_factor" and "rho_factor" keyboard parameters, respectively. 
+        Default rescaling is the same of .theta(), .vega() and .rho() methods.
+        
+        Returns a dictionary with keys 'price', 'delta', 'theta', 'gamma', 'vega' 
+        and 'rho'.
+        """
+        
+        eps = self.get_epsilon()
+        
+        # rescaling factors
+        theta_factor = kwargs["theta_factor"] if "theta_factor" in kwargs else 1.0/365.0
+        vega_factor = kwargs["vega_factor"] if "vega_factor" in kwargs else 0.01
+        rho_factor = kwargs["rho_factor"] if "rho_factor" in kwargs else 0.01
+        
+        # stencil: center and +/-eps bumps of (S, tau, sigma, r), stacked along a leading axis
+        stencil_names = ["center", "S+", "S-", "tau+", "tau-", "sigma+", "sigma-", "r+", "r-"]
+        bumps = np.zeros((len(stencil_names), 4))
+        for i, name in enumerate(stencil_names[1:], start=1):
+            bumps[i, (i - 1) // 2] = eps if name.endswith("+") else -eps
+        
+        # legs: a single instrument or the portfolio constituents, with their 
+        # pricing parameters (processed once for all the stencil)
+        legs, ind_output, col_output = pricing_legs(self.opt, **kwargs)
+        
+        # empty portfolio: zero value and greeks, as Portfolio.price()
+        if len(legs) == 0:
+            return dict.fromkeys(["price", "delta", "theta", "gamma", "vega", "rho"], 0)
+        
+        stencil_prices = 0.0
+        
+        for leg in legs:
+            
+            position, instrument = leg["position"], leg["instrument"]
+            S, K, tau, sigma, r = [leg["params"][p] for p in ["S", "K", "tau", "sigma", "r"]]
+            
+            # bumped parameters, of shape (9,) + shape of parameters (in double precision, 
+            # differences of close values being taken)
+            bumps_shape = (len(stencil_names),) + (1,) * S.ndim
+            S_st, tau_st, sigma_st, r_st = [x + bumps[:, j].reshape(bumps_shape) for j, x in enumerate([S, tau, sigma, r])]
+            
+            # single vectorized pricing of the whole stencil
+            stencil_prices = stencil_prices + position * instrument.price_arrays(S=S_st, K=K, tau=tau_st, 
+                                                                                 sigma=sigma_st, r=r_st, 
+                                                                                 **instrument.kernel_terms())
+        
+        f = dict(zip(stencil_names, stencil_prices))
+        
+        greeks = {"price": f["center"],
+                  "delta": (f["S+"] - f["S-"])/(2*eps),
+                  "theta": -(f["tau+"] - f["tau-"])/(2*eps) * theta_factor,
+                  "gamma": (f["S-"] - 2.0*f["center"] + f["S+"])/(eps*eps),
+                  "vega": (f["sigma+"] - f["sigma-"])/(2*eps) * vega_factor,
+                  "rho": (f["r+"] - f["r-"])/(2*eps) * rho_factor}
+        
+        # labelling output as pd.DataFrame, if necessary
+        return attach_labels(greeks, ind_output, col_output)
+
+#-----------------------------------------------------------------------------#
+
+# status flags of vectorized root-finders
+ROOT_CONVERGED = 0
+ROOT_MAX_ITER = 1
+ROOT_FAILED = 2
+ROOT_NOT_FOUND = 3
+
+def newton_safeguarded(fun, x0, lower, upper, epsilon=1e-8, max_iter=100, block_size=2**16):
+    """
+    Vectorized Newton-Raphson root-finder, solving N independent equations 
+    f_i(x_i) = 0 at once, with convergence tracked element by element.
+    
+    Only still-active elements are re-evaluated at each iteration. For each 
+    element, the last iterates with f < 0 and f > 0 (if any) bracket a root. 
+    Wherever the Newton step is not finite (vanishing derivative), falls 
+    outside the bracket or does not halve the last step size, a bisection 
+    step is taken instead. If no bracket is 
+    available yet, f is evaluated at bounds [lower_i, upper_i] (once, and only 
+    for the elements concerned) to look for one.
+    
+    Elements are solved in blocks of (at most) block_size elements, so that 
+    temporary arrays of each iteration stay small enough to be cache-friendly.
+    
+    Parameters:
+        
+        fun (callable):              fun(x, index) returns the pair (f, df) of np.ndarrays 
+                                     of function values and derivatives, evaluated at x 
+                                     for the elements of position index;
+        x0 (np.ndarray):             initial guesses, of shape (N,);
+        lower, upper (np.ndarray):   lower and upper bounds for the solutions;
+        epsilon (float):             stopping threshold on the squared relative step 
+                                     ((x_{n+1} - x_{n})/x_{n})**2 of each element;
+        max_iter (int):              maximum number of iterations;
+        block_size (int):            maximum number of elements solved together.
+    
+    Returns:
+        
+        x (np.ndarray):              solutions found (NaN where failed);
+        iterations (np.ndarray):     number of iterations of each element;
+        status (np.ndarray):         ROOT_CONVERGED, ROOT_MAX_ITER or ROOT_FAILED flag of each element.
+    """
+    
+    x = np.array(x0, dtype=float).ravel()
+    n = x.size
+    lower = np.broadcast_to(np.asarray(lower, dtype=float), (n,))
+    upper = np.broadcast_to(np.asarray(upper, dtype=float), (n,))
+    
+    # block by block, with positions of fun() offset by the start of the block
+    if n > block_size:
+        blocks = [newton_safeguarded(fun=lambda x, index, start=start: fun(x, index + start), 
+                                     x0=x[start:start + block_size], 
+                                     lower=lower[start:start + block_size], upper=upper[start:start + block_size], 
+                                     epsilon=epsilon, max_iter=max_iter, block_size=block_size) 
+                  for start in range(0, n, block_size)]
+        return tuple([np.concatenate(results) for results in zip(*blocks)])
+    
+    iterations = np.full(n, max_iter, dtype=int)
+    status = np.full(n, ROOT_MAX_ITER, dtype=int)
+    
+    x = np.clip(x, lower, upper)
+    iterations[~np.isfinite(x)] = 0
+    status[~np.isfinite(x)] = ROOT_FAILED
+    
+    # state of active elements, kept compact: position, current iterate, 
+    # bounds, last iterates with negative and positive function value 
+    # (NaN if none), last step size and bounds-checked flag
+    index = np.flatnonzero(np.isfinite(x))
+    x_n = x[index]
+    lower_n = lower[index]
+    upper_n = upper[index]
+    x_neg = np.full(index.size, np.nan)
+    x_pos = np.full(index.size, np.nan)
+    dx_old = np.full(index.size, np.inf)
+    bounds_checked = np.zeros(index.size, dtype=bool)
+    
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+    
+        for iter_num in range(1, max_iter + 1):
+            
+            if index.size == 0:
+                break
+        
+            f, df = fun(x_n, index)
+            
+            # bracket update
+            x_neg = np.where(f < 0, x_n, x_neg)
+            x_pos = np.where(f > 0, x_n, x_pos)
+            bracketed = ~np.isnan(x_neg) & ~np.isnan(x_pos)
+            lo = np.where(bracketed, np.minimum(x_neg, x_pos), lower_n)
+            hi = np.where(bracketed, np.maximum(x_neg, x_pos), upper_n)
+            
+            # Newton step: accepted if finite and within bracket (if any) and 
+            # bounds. Within a bracket, it must also halve the last step size
+            x_np1 = x_n - f/df
+            newton_ok = (x_np1 > lo) & (x_np1 < hi) & (~bracketed | (np.abs(x_np1 - x_n) <= 0.5 * dx_old))
+            
+            if not np.all(newton_ok):
+                
+                # fallback steps, computed for the elements concerned only
+                k = np.flatnonzero(~newton_ok)
+                
+                # look for a bracket at bounds, where needed and not done yet
+                check = k[~bracketed[k] & ~bounds_checked[k] & np.isfinite(f[k])]
+                if check.size > 0:
+                    for bound in [lower_n[check], upper_n[check]]:
+                        f_bound, _ = fun(bound, index[check])
+                        x_neg[check] = np.where(f_bound < 0, bound, x_neg[check])
+                        x_pos[check] = np.where(f_bound > 0, bound, x_pos[check])
+                    bounds_checked[check] = True
+                    bracketed[check] = ~np.isnan(x_neg[check]) & ~np.isnan(x_pos[check])
+                    lo[check] = np.where(bracketed[check], np.minimum(x_neg[check], x_pos[check]), lo[check])
+                    hi[check] = np.where(bracketed[check], np.maximum(x_neg[check], x_pos[check]), hi[check])
+                
+                # bisection within bracket, or damped step towards violated bound
+                x_np1[k] = np.where(bracketed[k], 0.5 * (lo[k] + hi[k]), 
+                                    np.where(x_np1[k] <= lo[k], 0.5 * (x_n[k] + lo[k]), 
+                                             np.where(x_np1[k] >= hi[k], 0.5 * (x_n[k] + hi[k]), np.nan)))
+            
+            # per-element stopping criteria
+            failed = ~np.isfinite(x_np1) | ~np.isfinite(f)
+            converged = ~failed & ((f == 0.0) | (((x_np1 - x_n)/x_n)**2 <= epsilon))
+            done = converged | failed
+            
+            x[index[done]] = x_np1[done]
+            iterations[index[done]] = iter_num
+            status[index[converged]] = ROOT_CONVERGED
+            status[index[failed]] = ROOT_FAILED
+            
+            # active set shrinking
+            keep = ~done
+            dx_old = np.abs(x_np1 - x_n)[keep]
+            index, x_n, lower_n, upper_n = index[keep], x_np1[keep], lower_n[keep], upper_n[keep]
+            x_neg, x_pos, bounds_checked = x_neg[keep], x_pos[keep], bounds_checked[keep]
+    
+    # elements exceeding maximum number of iterations
+    x[index] = x_n
+    x[status == ROOT_FAILED] = np.nan
+    
+    return x, iterations, status
+
+#-----------------------------------------------------------------------------#
+
+def least_squares_bounded(fun, x0, lower, upper, epsilon=1e-8, max_iter=100, num=16):
+    """
+    Vectorized bounded least-squares solver for N independent (separable) 
+    problems: min_{x_i} f_i(x_i)**2 subject to lower_i <= x_i <= upper_i.
+    
+    The squared residual is stationary where g_i(x_i) = f_i(x_i) * f_i'(x_i) = 0, 
+    that is at roots of f_i or at extrema of f_i (f_i' = 0, e.g. the vega = 0 
+    peak of a digital option price as a function of volatility). Roots are first 
+    searched with newton_safeguarded(). For elements where Newton does not end 
+    on a root, the squared residual is sampled on a log-scale grid of num 
+    sub-intervals and its minimum is refined by itp_bracketed() on g_i between
+    the grid nodes adjacent to the minimum node. The solution is the point with
+    minimum squared residual among the refined minimum, the last Newton iterate 
+    and the bounds. 
+    
+    Elements solved at a root are flagged ROOT_CONVERGED, elements solved at a 
+    bound or at an extremum of f_i with non-zero residual (no root within bounds) 
+    are flagged ROOT_NOT_FOUND.
+    
+    Parameters and returned values as in newton_safeguarded() (iterations 
+    being those of the Newton stage), with additional parameter:
+        
+        num (int):                   number of sub-intervals of the grid search 
+                                     (bounds must be positive).
+    """
+    
+    x, iterations, status = newton_safeguarded(fun=fun, x0=x0, lower=lower, upper=upper, 
+                                               epsilon=epsilon, max_iter=max_iter)
+    
+    lower = np.broadcast_to(np.asarray(lower, dtype=float), x.shape)
+    upper = np.broadcast_to(np.asarray(upper, dtype=float), x.shape)
+    index = np.arange(x.size)
+    
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        
+        # residuals at the Newton solution and at the bounds 
+        f_x, f_lower, f_upper = [np.abs(fun(c, index)[0]) for c in [x, lower, upper]]
+    
+    # a converged Newton iterate is a root only if it improves on both bounds 
+    # (damped steps towards a bound converge close to it, off any root)
+    on_root = (status == ROOT_CONVERGED) & (f_x < f_lower) & (f_x < f_upper)
+    index = np.flatnonzero(~on_root)
+    
+    if index.size > 0:
+        
+        lower, upper = lower[index], upper[index]
+        columns = np.arange(index.size)
+        
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            
+            # residuals on the search grid, of shape (num+1, n)
+            nodes = np.exp(np.linspace(np.log(lower), np.log(upper), num + 1))
+            f_nodes = np.vstack([fun(node, index)[0] for node in nodes])
+            
+            # grid nodes adjacent to the grid minimum of the squared residual
+            j = np.argmin(np.where(np.isfinite(f_nodes), f_nodes**2, np.inf), axis=0)
+            a, b = nodes[np.maximum(j - 1, 0), columns], nodes[np.minimum(j + 1, num), columns]
+            
+            # refinement: the squared residual is stationary where f * f' = 0 
+            def g(y, k):
+                f, df = fun(y, index[k])
+                return f * df
+            x_min = itp_bracketed(fun=g, a=a, b=b, epsilon=epsilon)[0]
+            
+            # the refined minimum is a root if f changes sign between adjacent nodes
+            f_a, f_b = f_nodes[np.maximum(j - 1, 0), columns], f_nodes[np.minimum(j + 1, num), columns]
+            
+            # squared residuals of candidates (inf, if not available)
+            candidates = np.vstack([x_min, x[index], lower, upper])
+            residuals = np.vstack([fun(c, index)[0] for c in candidates])**2
+            residuals = np.where(np.isfinite(residuals), residuals, np.inf)
+        
+        best = np.argmin(residuals, axis=0)
+        solved = np.isfinite(residuals[best, columns])
+        is_root = (best == 0) & (f_a * f_b <= 0)
+        
+        x[index] = np.where(solved, candidates[best, columns], np.nan)
+        status[index] = np.where(solved, np.where(is_root, ROOT_CONVERGED, ROOT_NOT_FOUND), ROOT_FAILED)
+    
+    return x, iterations, status
+
+#-----------------------------------------------------------------------------#
+
+def find_brackets(fun, lower, upper, num=16, log_scale=True, max_refine=8):
+    """
+    Vectorized bracket search for N independent equations f_i(x_i) = 0.
+    
+    Each interval [lower_i, upper_i] is split into num sub-intervals (of
+    equal ratio if log_scale, equal length otherwise) and the first 
+    sub-interval where f_i changes sign is returned: if more than one 
+    root exists, the lowest one is bracketed.
+    
+    Where no sign change is found, the grid is refined around the node 
+    of minimum |f_i| (that is, between its adjacent nodes), up to max_refine 
+    times: this catches pairs of close roots around an extremum of f_i 
+    (e.g. near the vega = 0 peak of a digital option price), which a single 
+    grid may step over.
+    
+    Parameters:
+        
+        fun (callable):              fun(x, index) returns f evaluated at x for the 
+                                     elements of position index;
+        lower, upper (np.ndarray):   lower and upper bounds of search intervals, of shape (N,);
+        num (int):                   number of sub-intervals;
+        log_scale (bool):            if True, sub-intervals are equally spaced in log-scale 
+                                     (bounds must be positive);
+        max_refine (int):            maximum number of grid refinements around the 
+                                     node of minimum |f_i|.
+    
+    Returns:
+        
+        a, b (np.ndarray):           bracketing intervals (NaN where no sign change is found).
+    """
+    
+    lower, upper = [np.array(x, dtype=float).ravel() for x in np.broadcast_arrays(lower, upper)]
+    n = lower.size
+    
+    a, b = np.full(n, np.nan), np.full(n, np.nan)
+    
+    # elements still without a bracket and their search intervals
+    index = np.arange(n)
+    
+    for refinement in range(max_refine + 1):
+        
+        columns = np.arange(index.size)
+        
+        # nodes of the search grid, of shape (num+1, n)
+        if log_scale:
+            nodes = np.exp(np.linspace(np.log(lower), np.log(upper), num + 1))
+        else:
+            nodes = np.linspace(lower, upper, num + 1)
+        
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            values = np.vstack([fun(node, index) for node in nodes])
+        signs = np.sign(values)
+        
+        # first sign change
+        change = (signs[:-1] * signs[1:] <= 0) & (signs[:-1] != 0) | (signs[:-1] == 0)
+        found = np.any(change, axis=0)
+        first = np.argmax(change, axis=0)
+        
+        a[index[found]] = nodes[first, columns][found]
+        b[index[found]] = nodes[np.minimum(first + 1, num), columns][found]
+        
+        # refinement between the nodes adjacent to the node of minimum |f|
+        nearest = np.argmin(np.where(np.isfinite(values), np.abs(values), np.inf), axis=0)
+        lower = nodes[np.maximum(nearest - 1, 0), columns][~found]
+        upper = nodes[np.minimum(nearest + 1, num), columns][~found]
+        index = index[~found]
+        
+        if index.size == 0:
+            break
+    
+    return a, b
+
+#-----------------------------------------------------------------------------#
+
+def itp_bracketed(fun, a, b, epsilon=1e-10, k2=2.0, n0=1):
+    """
+    Vectorized ITP (Interpolate-Truncate-Project) bracketing root-finder, 
+    solving N independent equations f_i(x_i) = 0 at once, given brackets 
+    [a_i, b_i] where f_i changes sign. 
+    
+    ITP combines regula-falsi interpolation, truncation and projection onto 
+    a shrinking neighbourhood of the bisection point: it keeps superlinear 
+    convergence on smooth functions, while never needing more than n0 
+    iterations more than bisection, that is: 
+        
+        ceil(log2((b_i - a_i)/(2 epsilon))) + n0
+    
+    Only still-active elements are evaluated at each iteration. 
+    
+    Parameters:
+        
+        fun (callable):              fun(x, index) returns f evaluated at x for the 
+                                     elements of position index;
+        a, b (np.ndarray):           brackets, of shape (N,). Elements where f_i does 
+                                     not change sign (or with NaN brackets) are flagged as failed;
+        epsilon (float):             absolute tolerance on the solution;
+        k2 (float):                  truncation exponent, in [1, 1 + (1 + sqrt(5))/2);
+        n0 (int):                    slack on the number of iterations of bisection.
+    
+    Returns:
+        
+        x (np.ndarray):              solutions found (NaN where failed);
+        iterations (np.ndarray):     number of iterations of each element;
+        status (np.ndarray):         ROOT_CONVERGED or ROOT_FAILED flag of each element.
+    """
+    
+    a, b = [np.array(x, dtype=float).ravel() for x in np.broadcast_arrays(a, b)]
+    a, b = np.minimum(a, b), np.maximum(a, b)
+    n = a.size
+    
+    x = np.full(n, np.nan)
+    iterations = np.zeros(n, dtype=int)
+    status = np.full(n, ROOT_FAILED, dtype=int)
+    
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        
+        # function values at brackets, oriented so that f(a) <= 0 <= f(b)
+        index = np.flatnonzero(np.isfinite(a) & np.isfinite(b))
+        f_a, f_b = fun(a[index], index), fun(b[index], index)
+        orientation = np.where(f_b >= f_a, 1.0, -1.0)
+        f_a, f_b = orientation * f_a, orientation * f_b
+        
+        # exact roots at brackets
+        at_a, at_b = (f_a == 0), (f_b == 0) & (f_a != 0)
+        x[index[at_a]], x[index[at_b]] = a[index[at_a]], b[index[at_b]]
+        status[index[at_a | at_b]] = ROOT_CONVERGED
+        
+        # active elements: sign change within bracket
+        keep = (f_a < 0) & (f_b > 0)
+        index, orientation, f_a, f_b = index[keep], orientation[keep], f_a[keep], f_b[keep]
+        a_n, b_n = a[index], b[index]
+        
+        # ITP parameters
+        k1 = 0.2 / (b_n - a_n)
+        n_max = np.ceil(np.log2(np.maximum((b_n - a_n) / (2.0 * epsilon), 1.0))).astype(int) + n0
+        
+        iter_num = 0
+        while index.size > 0:
+            
+            # converged elements (after n_max iterations the bracket is 2*epsilon wide, up to rounding)
+            done = ((b_n - a_n) <= 2.0 * epsilon) | (iter_num >= n_max)
+            x[index[done]] = 0.5 * (a_n[done] + b_n[done])
+            iterations[index[done]] = iter_num
+            status[index[done]] = ROOT_CONVERGED
+            keep = ~done
+            index, orientation, f_a, f_b, a_n, b_n, k1, n_max = index[keep], orientation[keep], f_a[keep], \
+                f_b[keep], a_n[keep], b_n[keep], k1[keep], n_max[keep]
+            
+            if index.size == 0:
+                break
+            
+            # interpolation (regula-falsi)
+            x_half = 0.5 * (a_n + b_n)
+            x_f = (f_b * a_n - f_a * b_n) / (f_b - f_a)
+            
+            # truncation
+            sigma = np.sign(x_half - x_f)
+            delta = k1 * (b_n - a_n)**k2
+            x_t = np.where(delta <= np.abs(x_half - x_f), x_f + sigma * delta, x_half)
+            
+            # projection
+            radius = np.maximum(epsilon * 2.0**(n_max - iter_num) - 0.5 * (b_n - a_n), 0.0)
+            x_itp = np.where(np.abs(x_t - x_half) <= radius, x_t, x_half - sigma * radius)
+            
+            # bracket update
+            f_itp = orientation * fun(x_itp, index)
+            iter_num += 1
+            
+            right = f_itp > 0
+            left = f_itp < 0
+            root = f_itp == 0
+            b_n, f_b = np.where(right | root, x_itp, b_n), np.where(right, f_itp, f_b)
+            a_n, f_a = np.where(left | root, x_itp, a_n), np.where(left, f_itp, f_a)
+            
+            # failed evaluations (NaN) are dropped
+            failed = np.isnan(f_itp)
+            iterations[index[failed]] = iter_num
+            keep = ~failed
+            index, orientation, f_a, f_b, a_n, b_n, k1, n_max = index[keep], orientation[keep], f_a[keep], \
+                f_b[keep], a_n[keep], b_n[keep], k1[keep], n_max[keep]
+    
+    return x, iterations, status
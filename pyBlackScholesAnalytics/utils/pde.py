@@ -0,0 +1,321 @@
+"""
+Created by: Gabriele Pompa (gabriele.pompa@gmail.com)
+
+File: pde.py
+
+Created on Tue Jul 14 2020 - Version: 1.0
+
+Description:
+
+This file contains the definition of the PDEPricer class, pricing option
+contracts and portfolios by finite-differences solution of the Black-Scholes
+PDE (Crank-Nicolson scheme with Rannacher smoothing). A single sweep in
+time-to-maturity gives the whole value surface, together with delta, gamma
+and theta.
+"""
+
+# ----------------------- standard imports ---------------------------------- #
+# for NumPy arrays
+import numpy as np
+
+# for Pandas Series and DataFrame
+import pandas as pd
+
+# for banded (tridiagonal) linear systems
+from scipy.linalg import solve_banded
+
+# for interpolation between grid nodes
+from scipy.interpolate import CubicSpline
+
+# ----------------------- sub-modules imports ------------------------------- #
+
+from utils.utils import *
+
+# number of points per cell averaging the payoff in the initial condition
+PAYOFF_AVERAGING_POINTS = 8
+
+# relative bump of underlying values for the derivatives of the payoff, at expiration
+PAYOFF_BUMP = 1e-6
+
+#-----------------------------------------------------------------------------#
+
+class PDEPricer:
+    """
+    PDEPricer class: a class implementing pricing of option contracts by
+    finite-differences solution of the Black-Scholes PDE
+
+        dV/dtau = 0.5*sigma^2*S^2*d^2V/dS^2 + r*S*dV/dS - r*V
+
+    on a uniform grid of n_S intervals in [0, S_max] and (about) n_tau time-steps.
+    The initial condition (tau=0) is taken from the .call_payoff() and .put_payoff()
+    methods of the FinancialObject, so that any EuropeanOption sub-class (or
+    Portfolio of them) can be priced, even without a closed-form price.
+
+    Boundary conditions are the discounted payoff at S=0 and the discounted payoff
+    of the forward at S=S_max. Time-steps are Crank-Nicolson ones, except the first
+    rannacher_steps ones, which are made of two fully-implicit half-steps to damp
+    the oscillations due to the non-smooth payoff. Each step is a banded (tridiagonal)
+    linear solve, the constituents of a Portfolio being its right-hand sides.
+
+    The initial condition is the payoff averaged over the cell of each node of the S grid.
+    Times-to-maturity requested are nodes of the time grid. Values, delta and gamma
+    between nodes of the S grid are obtained by cubic-spline interpolation, theta
+    from the PDE itself. Expired scenarios (tau <= 0) are valued at payoff, as
+    returned by .call_payoff() and .put_payoff() methods, with delta and gamma
+    from its finite differences.
+
+    Surfaces are returned as values (pd.DataFrame, if np_output is False) for
+    analysis: the plotter package evaluates metrics through the FinancialObject
+    itself and does not take them as input.
+
+    Attributes:
+    -----------
+        FinancialObject (EuropeanOption sub-class or Portfolio):      Instance of an EuropeanOption sub-class
+                                                                      (PlainVanillaOption or DigitalOption) or a Portfolio
+                                                                      class.
+        n_S (int):                                                    Optional. Number of intervals of the S grid. Default: 400;
+        n_tau (int):                                                  Optional. Number of time-steps up to the largest
+                                                                      time-to-maturity. Default: 200;
+        rannacher_steps (int):                                        Optional. Number of initial fully-implicit steps. Default: 2;
+        S_max (float):                                                Optional. Upper bound of the S grid. Default: None, that is
+                                                                      max(S, K) * max(2, exp(4*sigma*sqrt(tau))).
+
+    Public Methods:
+    --------
+
+        getters and setters for all attributes, except FinancialObject
+
+        surface: dict
+            Computes the value, delta, gamma and theta of the FinancialObject in a single sweep.
+
+        price, delta, gamma, theta: float
+            Compute a single metrics of the FinancialObject (as .surface()[metrics]).
+
+    Instantiation and Usage examples:
+    --------
+
+        - example_options_pde.py
+
+        - PDEPricer(option).surface(S=np.linspace(50, 150, 100), t=pd.date_range(...), np_output=False)
+          returns a dictionary of DataFrames, shaped as the .price() output of the option.
+    """
+
+    def __init__(self, FinancialObject, n_S=400, n_tau=200, rannacher_steps=2, S_max=None):
+
+        self.opt = FinancialObject
+        self.__n_S = n_S
+        self.__n_tau = n_tau
+        self.__rannacher_steps = rannacher_steps
+        self.__S_max = S_max
+
+    # getters
+    def get_n_S(self):
+        return self.__n_S
+
+    def get_n_tau(self):
+        return self.__n_tau
+
+    def get_rannacher_steps(self):
+        return self.__rannacher_steps
+
+    def get_S_max(self):
+        return self.__S_max
+
+    # setters
+    def set_n_S(self, n_S):
+        self.__n_S = n_S
+
+    def set_n_tau(self, n_tau):
+        self.__n_tau = n_tau
+
+    def set_rannacher_steps(self, rannacher_steps):
+        self.__rannacher_steps = rannacher_steps
+
+    def set_S_max(self, S_max):
+        self.__S_max = S_max
+
+    def __time_grid(self, taus):
+        """
+        Private method returning the time grid: from 0 to the largest of taus,
+        with steps not larger than max(taus)/n_tau and each of taus as a node.
+        """
+
+        nodes = np.unique(np.concatenate([[0.0], taus]))
+        dt_max = nodes[-1] / self.get_n_tau()
+
+        grid = [np.array([0.0])]
+        for tau_start, tau_end in zip(nodes[:-1], nodes[1:]):
+            n_steps = max(int(np.ceil((tau_end - tau_start) / dt_max - 1e-9)), 1)
+            grid.append(np.linspace(tau_start, tau_end, n_steps + 1)[1:])
+
+        return np.concatenate(grid)
+
+    def surface(self, **kwargs):
+        """
+        Value, delta, gamma and theta of the FinancialObject.
+
+        Can be called as self.opt.price() method, with constant volatility and short-rate.
+
+        Optionally, theta can be rescaled using the "theta_factor" keyboard parameter.
+        Default rescaling is the same of .theta() method of option classes.
+
+        Returns a dictionary with keys 'price', 'delta', 'gamma' and 'theta', each
+        value being shaped as the output of .price() method (e.g. a pd.DataFrame with
+        times as index and underlying values as columns, if np_output is False).
+        """
+
+        # rescaling factor
+        theta_factor = kwargs["theta_factor"] if "theta_factor" in kwargs else 1.0/365.0
+
+        # legs: a single instrument or the portfolio constituents, with their pricing parameters flattened
+        legs, ind_output, col_output = pricing_legs(self.opt, **kwargs)
+        for leg in legs:
+            leg["params"] = {p: leg["params"][p].ravel() for p in leg["params"]}
+
+        # a single PDE operator for all the constituents
+        sigma, r = [np.unique(np.concatenate([leg["params"][p] for leg in legs])) for p in ["sigma", "r"]]
+        if len(sigma) > 1 or len(r) > 1:
+            raise NotImplementedError("PDEPricer requires a single volatility and short-rate value. Given: sigma={}, r={}"\
+                                      .format(sigma, r))
+        sigma, r = sigma[0], r[0]
+
+        for leg in legs:
+            K = np.unique(leg["params"]["K"])
+            if len(K) > 1:
+                raise NotImplementedError("PDEPricer requires a single strike-price per instrument. Given: K={}".format(K))
+            leg["K"] = K[0]
+
+        # times-to-maturity at which the solution is needed (expired scenarios read the payoff)
+        taus = np.unique(np.concatenate([np.maximum(leg["params"]["tau"], 0.0) for leg in legs]))
+        tau_grid = self.__time_grid(taus)
+
+        # uniform S grid
+        S_max = self.get_S_max()
+        if S_max is None:
+            S_max = max(np.max([leg["params"]["S"].max() for leg in legs]), np.max([leg["K"] for leg in legs])) \
+                    * max(2.0, np.exp(4.0 * sigma * np.sqrt(tau_grid[-1])))
+
+        n_S = self.get_n_S()
+        S_grid = np.linspace(0.0, S_max, n_S + 1)
+
+        def payoff(S):
+            """Payoffs of the instruments, as a (len(S), n_instruments) array."""
+            return np.column_stack([leg["instrument"].call_payoff(S=S, K=leg["K"]) if leg["instrument"].get_type() == 'call'
+                                    else leg["instrument"].put_payoff(S=S, K=leg["K"]) for leg in legs]).astype(float)
+
+        def boundaries(tau):
+            """Values at S=0 and S=S_max: discounted payoffs of the forward."""
+            discount = np.exp(- r * tau)
+            return discount * payoff(np.array([0.0, S_max / discount]))
+
+        # PDE operator coefficients on interior nodes (i=1, ..., n_S-1), per unit time:
+        # L(V)_i = a_i*V_{i-1} + b_i*V_i + c_i*V_{i+1}
+        i = np.arange(1, n_S)[:, None]
+        a = 0.5 * sigma**2 * i**2 - 0.5 * r * i
+        b = - sigma**2 * i**2 - r
+        c = 0.5 * sigma**2 * i**2 + 0.5 * r * i
+
+        def theta_step(V, dt, theta, tau_new):
+            """
+            Theta-scheme time-step: theta=0.5 is Crank-Nicolson, theta=1.0 fully-implicit.
+            """
+
+            # explicit part
+            rhs = V[1:-1] + (1.0 - theta) * dt * (a * V[:-2] + b * V[1:-1] + c * V[2:])
+
+            # boundary values at the new time
+            V_new = np.empty_like(V)
+            V_new[[0, -1]] = boundaries(tau_new)
+            rhs[0] += theta * dt * a[0] * V_new[0]
+            rhs[-1] += theta * dt * c[-1] * V_new[-1]
+
+            # implicit part: tridiagonal matrix in banded form (upper, main and lower diagonals)
+            ab = np.zeros((3, n_S - 1))
+            ab[0, 1:] = - theta * dt * c[:-1, 0]
+            ab[1, :] = 1.0 - theta * dt * b[:, 0]
+            ab[2, :-1] = - theta * dt * a[1:, 0]
+
+            V_new[1:-1] = solve_banded((1, 1), ab, rhs)
+
+            return V_new
+
+        # initial condition: payoff averaged over the cell of each node, so that strikes
+        # between nodes (e.g. discontinuities of digital payoffs) do not spoil convergence
+        dS = S_grid[1] - S_grid[0]
+        offsets = (np.arange(PAYOFF_AVERAGING_POINTS) + 0.5) / PAYOFF_AVERAGING_POINTS - 0.5
+        V = payoff((S_grid[:, None] + offsets * dS).ravel()).reshape(n_S + 1, PAYOFF_AVERAGING_POINTS, -1).mean(axis=1)
+        V[[0, -1]] = boundaries(0.0)
+
+        # backward sweep in calendar time, that is forward in time-to-maturity
+        layers = {}
+
+        for n in range(len(tau_grid) - 1):
+
+            tau_old, tau_new = tau_grid[n], tau_grid[n+1]
+            dt = tau_new - tau_old
+
+            # Rannacher smoothing: two fully-implicit half-steps
+            if n < self.get_rannacher_steps():
+                V = theta_step(V, 0.5 * dt, 1.0, tau_old + 0.5 * dt)
+                V = theta_step(V, 0.5 * dt, 1.0, tau_new)
+            else:
+                V = theta_step(V, dt, 0.5, tau_new)
+
+            layers[tau_new] = V
+
+        # interpolation at requested underlying values (expired scenarios excluded)
+        splines = {tau: CubicSpline(S_grid, layers[tau], axis=0) for tau in taus if tau > 0}
+
+        metrics = ["price", "delta", "gamma", "theta"]
+        surface = {m: 0.0 for m in metrics}
+
+        for k, leg in enumerate(legs):
+
+            S, tau = leg["params"]["S"], np.maximum(leg["params"]["tau"], 0.0)
+            values = {m: np.empty_like(S) for m in metrics}
+
+            for tau_value in np.unique(tau):
+
+                is_tau = tau == tau_value
+                S_tau = S[is_tau]
+
+                # expired scenarios: payoff and its derivatives, evaluated directly 
+                # (a spline through the payoff would smooth out its kinks and jumps)
+                if tau_value == 0.0:
+                    h = PAYOFF_BUMP * np.maximum(S_tau, 1.0)
+                    V_up, V, V_down = [payoff(x)[:, k] for x in [S_tau + h, S_tau, S_tau - h]]
+                    values["price"][is_tau] = V
+                    values["delta"][is_tau] = (V_up - V_down) / (2.0 * h)
+                    values["gamma"][is_tau] = (V_up - 2.0 * V + V_down) / (h * h)
+                    continue
+
+                spline = splines[tau_value]
+                values["price"][is_tau] = spline(S_tau)[:, k]
+                values["delta"][is_tau] = spline(S_tau, 1)[:, k]
+                values["gamma"][is_tau] = spline(S_tau, 2)[:, k]
+
+            # theta from the PDE: dV/dt = - dV/dtau
+            values["theta"] = - (0.5 * sigma**2 * S**2 * values["gamma"] + r * S * values["delta"] - r * values["price"]) * theta_factor
+
+            # portfolio metrics are the sum position * instrument_metrics
+            for m in metrics:
+                surface[m] = surface[m] + leg["position"] * values[m].reshape(leg["shape"])
+
+        # labelling output as pd.DataFrame, if necessary
+        return attach_labels(surface, ind_output, col_output)
+
+    def price(self, **kwargs):
+        """Finite-differences value. Can be called as self.opt.price() method."""
+        return self.surface(**kwargs)["price"]
+
+    def delta(self, **kwargs):
+        """Finite-differences delta. Can be called as self.opt.price() method."""
+        return self.surface(**kwargs)["delta"]
+
+    def gamma(self, **kwargs):
+        """Finite-differences gamma. Can be called as self.opt.price() method."""
+        return self.surface(**kwargs)["gamma"]
+
+    def theta(self, **kwargs):
+        """Finite-differences theta, rescaled as .surface(). Can be called as self.opt.price() method."""
+        return self.surface(**kwargs)["theta"]
@@ -0,0 +1,314 @@
+"""
+Created by: Gabriele Pompa (gabriele.pompa@gmail.com)
+
+File: qmc.py
+
+Created on Tue Jul 14 2020 - Version: 1.0
+
+Description:
+
+This file contains the definition of the SobolSequence class, generating
+(scrambled) Sobol low-discrepancy points, and of the BrownianBridge class,
+building Brownian paths from normal variates so that the first coordinates
+of a low-discrepancy point drive the coarse features of the path.
+"""
+
+# ----------------------- standard imports ---------------------------------- #
+# for NumPy arrays
+import numpy as np
+
+# for the inverse of the standard normal cdf (a NumPy ufunc)
+from scipy.special import ndtri
+
+# ----------------------- sub-modules imports ------------------------------- #
+
+from utils.utils import *
+
+#-----------------------------------------------------------------------------#
+
+# primitive polynomials and initial direction numbers (Joe and Kuo, 2008) of
+# dimensions 2, 3, ... as (degree s, coefficients a, initial numbers m_1, ..., m_s)
+# Dimension 1 is the Van der Corput sequence in base 2.
+SOBOL_DIRECTION_NUMBERS = [
+    (1, 0, [1]),
+    (2, 1, [1, 3]),
+    (3, 1, [1, 3, 1]),
+    (3, 2, [1, 1, 1]),
+    (4, 1, [1, 1, 3, 3]),
+    (4, 4, [1, 3, 5, 13]),
+    (5, 2, [1, 1, 5, 5, 17]),
+    (5, 4, [1, 1, 5, 5, 5]),
+    (5, 7, [1, 1, 7, 11, 19]),
+    (5, 11, [1, 1, 5, 1, 1]),
+    (5, 13, [1, 1, 1, 3, 11]),
+    (5, 14, [1, 3, 5, 5, 31]),
+    (6, 1, [1, 3, 3, 9, 7, 49]),
+    (6, 13, [1, 1, 1, 15, 21, 21]),
+    (6, 16, [1, 3, 1, 13, 27, 49]),
+    (6, 19, [1, 1, 1, 15, 7, 5]),
+    (6, 22, [1, 3, 1, 15, 13, 25]),
+    (6, 25, [1, 1, 5, 5, 19, 61]),
+    (7, 1, [1, 3, 7, 11, 23, 15, 103]),
+    (7, 4, [1, 3, 7, 13, 13, 15, 69]),
+    (7, 7, [1, 1, 3, 13, 7, 35, 63]),
+    (7, 8, [1, 3, 5, 9, 1, 25, 53]),
+    (7, 14, [1, 3, 1, 13, 9, 35, 107]),
+    (7, 19, [1, 3, 1, 5, 27, 61, 31]),
+    (7, 21, [1, 1, 5, 11, 19, 41, 61]),
+    (7, 28, [1, 3, 5, 3, 3, 13, 69]),
+    (7, 31, [1, 1, 7, 13, 1, 19, 1]),
+    (7, 32, [1, 3, 7, 5, 13, 19, 59]),
+    (7, 37, [1, 1, 3, 9, 25, 29, 41]),
+    (7, 41, [1, 3, 5, 13, 23, 1, 55]),
+    (7, 42, [1, 3, 7, 3, 13, 59, 17])]
+
+# number of bits of Sobol points
+SOBOL_BITS = 32
+
+#-----------------------------------------------------------------------------#
+
+def sobol_direction_numbers(dimension):
+    """
+    Returns the (dimension, SOBOL_BITS) array of direction numbers of the Sobol
+    sequence, as unsigned integers whose most significant bit is the first
+    binary digit.
+    """
+
+    if dimension > len(SOBOL_DIRECTION_NUMBERS) + 1:
+        raise ValueError("Sobol sequence available up to dimension {}. Requested: {}"\
+                         .format(len(SOBOL_DIRECTION_NUMBERS) + 1, dimension))
+
+    V = np.zeros((dimension, SOBOL_BITS), dtype=np.uint64)
+
+    # first dimension: Van der Corput sequence
+    V[0] = [1 << (SOBOL_BITS - 1 - k) for k in range(SOBOL_BITS)]
+
+    for d in range(1, dimension):
+
+        s, a, m = SOBOL_DIRECTION_NUMBERS[d - 1]
+        v = [m[k] << (SOBOL_BITS - 1 - k) for k in range(s)]
+
+        # recurrence from the coefficients of the primitive polynomial
+        for k in range(s, SOBOL_BITS):
+            v_k = v[k - s] ^ (v[k - s] >> s)
+            for i in range(1, s):
+                if (a >> (s - 1 - i)) & 1:
+                    v_k ^= v[k - i]
+            v.append(v_k)
+
+        V[d] = v
+
+    return V
+
+def bit_parity(x):
+    """Parity (popcount modulo 2) of the bits of an array of unsigned integers."""
+
+    x = x.copy()
+    for shift in [32, 16, 8, 4, 2, 1]:
+        x ^= x >> np.uint64(shift)
+
+    return x & np.uint64(1)
+
+#-----------------------------------------------------------------------------#
+
+class SobolSequence:
+    """
+    SobolSequence class: generator of points of the Sobol low-discrepancy sequence
+    in the unit hypercube.
+
+    If scramble is True, the sequence is randomized by a random linear matrix scrambling
+    followed by a random digital shift (Matousek, 1998): each randomization is still
+    a low-discrepancy sequence, but its points are uniformly distributed, so that
+    independent randomizations give unbiased estimates and an error estimate
+    (randomized Quasi-Monte Carlo).
+
+    Points are generated in Gray-code order: for any m, the first 2^m points are
+    the same set of the first 2^m points of the sequence in natural order.
+
+    Attributes:
+    -----------
+        dimension (int):       dimension of points. Up to 32;
+        scramble (bool):       Optional. If True, the sequence is randomized. Default: True;
+        seed (int):            Optional. Seed of the randomization (or a stream, as returned
+                               by spawn_streams() function). Default: None.
+
+    Public Methods:
+    --------
+
+        get_dimension: int
+
+        points: np.ndarray
+            Returns the points of indexes start, start+1, ..., stop-1 as a (stop-start, dimension) array.
+
+        normals: np.ndarray
+            Returns the standard normal variates (inverse normal cdf) of points.
+
+    Instantiation and Usage examples:
+    --------
+
+        - example_options_quasi_monte_carlo.py
+
+        - SobolSequence(4, seed=42).points(0, 1024) returns 1024 points in [0,1)^4.
+    """
+
+    def __init__(self, dimension, scramble=True, seed=None):
+
+        self.__dimension = dimension
+        V = sobol_direction_numbers(dimension)
+        shift = np.zeros(dimension, dtype=np.uint64)
+
+        if scramble:
+
+            rng = random_generator(seed)
+
+            # random lower-triangular binary matrices with unit diagonal, one per dimension:
+            # row i is the mask of input digits summed into output digit i (MSB first)
+            bits = np.uint64(1) << np.arange(SOBOL_BITS - 1, -1, -1, dtype=np.uint64)
+            random_bits = rng.uniform(size=(dimension, SOBOL_BITS, SOBOL_BITS)) < 0.5
+            lower = np.tril(random_bits, k=-1) | np.eye(SOBOL_BITS, dtype=bool)
+            L = (lower * bits).sum(axis=2, dtype=np.uint64)
+
+            # scrambled direction numbers: output digit i is the parity of L[i] & v
+            V = (bit_parity(L[:, None, :] & V[:, :, None]) * bits).sum(axis=2, dtype=np.uint64)
+
+            # random digital shift
+            shift = ((rng.uniform(size=(dimension, SOBOL_BITS)) < 0.5) * bits).sum(axis=1, dtype=np.uint64)
+
+        self.__V = V
+        self.__shift = shift
+
+    def get_dimension(self):
+        return self.__dimension
+
+    def points(self, start, stop):
+        """
+        Points of indexes start, ..., stop-1 (in Gray-code order), as a (stop-start, dimension)
+        array of floats in (0,1).
+        """
+
+        V = self.__V
+
+        # first point: XOR of the direction numbers selected by the bits of the Gray code of start
+        gray = start ^ (start >> 1)
+        first = self.__shift.copy()
+        for k in range(SOBOL_BITS):
+            if (gray >> k) & 1:
+                first ^= V[:, k]
+
+        # then, each point differs from the previous one by the direction number
+        # of the lowest zero bit of the previous index
+        index = np.arange(start + 1, stop, dtype=np.int64)
+        lowest_bit = np.log2(index & -index).astype(int)
+        increments = np.concatenate([first[None, :], V[:, lowest_bit].T])
+
+        X = np.bitwise_xor.accumulate(increments, axis=0)
+
+        # mapped in the open interval (0,1), at the center of the elementary interval
+        return (X.astype(float) + 0.5) / 2.0 ** SOBOL_BITS
+
+    def normals(self, start, stop):
+        """Standard normal variates of points of indexes start, ..., stop-1."""
+        return ndtri(self.points(start, stop))
+
+#-----------------------------------------------------------------------------#
+
+class BrownianBridge:
+    """
+    BrownianBridge class: builds standard Brownian motion paths on the time grid
+    1/n_steps, 2/n_steps, ..., 1 from independent standard normal variates. The
+    first variate is used for the terminal value, the following ones to fill
+    mid-points of the largest intervals (bisection), so that most of the variance
+    of the path is driven by the first variates.
+
+    Attributes:
+    -----------
+        n_steps (int):    number of time steps.
+
+    Public Methods:
+    --------
+
+        get_n_steps: int
+
+        transform: np.ndarray
+            Returns the paths of the Brownian motion from an (n_paths, n_steps) array of normal variates.
+
+    Instantiation and Usage examples:
+    --------
+
+        - example_options_quasi_monte_carlo.py
+
+        - BrownianBridge(4).transform(Z) returns W(0.25), W(0.5), W(0.75), W(1.0) for each row of Z.
+    """
+
+    def __init__(self, n_steps):
+
+        self.__n_steps = n_steps
+
+        t = np.arange(1, n_steps + 1) / n_steps
+
+        # construction order: index of the point, of its left and right neighbors
+        self.__bridge_index = np.zeros(n_steps, dtype=int)
+        self.__left_index = np.zeros(n_steps, dtype=int)
+        self.__right_index = np.zeros(n_steps, dtype=int)
+        self.__left_weight = np.zeros(n_steps)
+        self.__right_weight = np.zeros(n_steps)
+        self.__std_dev = np.zeros(n_steps)
+
+        self.__bridge_index[0] = n_steps - 1
+        self.__std_dev[0] = np.sqrt(t[-1])
+
+        # 1 if the point has already been built
+        built = np.zeros(n_steps, dtype=bool)
+        built[-1] = True
+
+        j = 0
+        for i in range(1, n_steps):
+
+            # first interval not yet built: [j, k)
+            while built[j]:
+                j += 1
+            k = j
+            while not built[k]:
+                k += 1
+
+            # its mid-point
+            l = j + ((k - 1 - j) >> 1)
+            built[l] = True
+
+            # left point at time t[j-1] (or 0, if j == 0), right point at time t[k]
+            t_left = t[j-1] if j > 0 else 0.0
+
+            self.__bridge_index[i] = l
+            self.__left_index[i] = j
+            self.__right_index[i] = k
+            self.__left_weight[i] = (t[k] - t[l]) / (t[k] - t_left)
+            self.__right_weight[i] = (t[l] - t_left) / (t[k] - t_left)
+            self.__std_dev[i] = np.sqrt((t[l] - t_left) * (t[k] - t[l]) / (t[k] - t_left))
+
+            j = k + 1
+            if j >= n_steps:
+                j = 0
+
+    def get_n_steps(self):
+        return self.__n_steps
+
+    def transform(self, Z):
+        """
+        Brownian motion paths, as an (n_paths, n_steps) array, from an
+        (n_paths, n_steps) array of independent standard normal variates.
+        """
+
+        W = np.empty_like(Z)
+        W[:, -1] = self.__std_dev[0] * Z[:, 0]
+
+        for i in range(1, self.get_n_steps()):
+
+            j, k, l = self.__left_index[i], self.__right_index[i], self.__bridge_index[i]
+
+            W[:, l] = self.__right_weight[i] * W[:, k] + self.__std_dev[i] * Z[:, i]
+
+            # W(0) = 0 contributes nothing
+            if j > 0:
+                W[:, l] += self.__left_weight[i] * W[:, j-1]
+
+        return W
@@ -29,6 +29,10 @@ import matplotlib.dates as mpl_dates
 # to identify iterable data-structures
 from collections.abc import Iterable
 
+# ----------------------- sub-modules imports ------------------------------- #
+
+from utils.dates import parse_date_string, is_datetime64_array, to_datetime64
+
 #-----------------------------------------------------------------------------#
 
 def scalarize(x):
@@ -50,9 +54,15 @@ def iterable_to_numpy_array(x, sort=True, sort_func=None, reverse_order=False):
     
     If sort is True (default), returns a sorted array. Optionally uses a custom 
     function sort_funct to sort the iterable (default: ascending order).
+    
+    np.ndarray, pd.Index and pd.Series of numeric or datetime64 data-type are 
+    homogeneous by construction: they are sorted natively, without iterating 
+    over their elements in Python (see native_to_numpy_array() function).
     """
     
-    if is_iterable_not_string(x) and test_same_type(x):
+    if has_native_dtype(x) and (sort_func is None or x.dtype.kind == "M"):
+        return native_to_numpy_array(x, sort=sort, reverse_order=reverse_order)
+    elif is_iterable_not_string(x) and test_same_type(x):
         if not isinstance(x, np.ndarray):
             x = np.array([xi for xi in x])
         return np.array(sorted(x, key=sort_func, reverse=reverse_order)) if sort else x
@@ -61,6 +71,59 @@ def iterable_to_numpy_array(x, sort=True, sort_func=None, reverse_order=False):
     
 #-----------------------------------------------------------------------------#
 
+def has_native_dtype(x):
+    """
+    Utility function to test whether x is a np.ndarray, pd.Index or pd.Series 
+    of boolean, numeric or datetime64 data-type.
+    """
+    return isinstance(x, (np.ndarray, pd.Index, pd.Series)) and x.dtype.kind in "biufM"
+
+#-----------------------------------------------------------------------------#
+
+def native_to_numpy_array(x, sort=True, reverse_order=False):
+    """
+    Utility function to create a np.ndarray from a np.ndarray, pd.Index or pd.Series x 
+    of boolean, numeric or datetime64 data-type (see has_native_dtype() function), 
+    as iterable_to_numpy_array() function does, but natively:
+        
+        - if sort is True (default), 1-dim x is sorted in ascending (descending, 
+          if reverse_order is True) order with np.sort, in O(n log n). An O(n) 
+          monotonicity check comes first: already sorted arrays are not sorted again 
+          and np.ndarrays are returned as they are;
+        
+        - pd.DatetimeIndex and datetime64 pd.Series are sorted as such, and returned 
+          as np.ndarray of pd.Timestamp, that is of their elements (as Iterables).
+          datetime64 np.ndarrays keep their data-type.
+    """
+    
+    # pd.DatetimeIndex and datetime64 pd.Series
+    if x.dtype.kind == "M" and not isinstance(x, np.ndarray):
+        
+        x = pd.DatetimeIndex(x)
+        
+        if sort and not (x.is_monotonic_decreasing if reverse_order else x.is_monotonic_increasing):
+            x = x.sort_values(ascending=not reverse_order)
+            
+        return x.astype(object).to_numpy()
+    
+    # other pd.Index and pd.Series
+    x = np.asarray(x)
+    
+    if (not sort) or (x.ndim != 1):
+        return x
+    
+    # monotonicity check
+    if reverse_order:
+        if np.all(x[:-1] >= x[1:]):
+            return x
+        return np.sort(x)[::-1]
+    else:
+        if np.all(x[:-1] <= x[1:]):
+            return x
+        return np.sort(x)
+
+#-----------------------------------------------------------------------------#
+
 def homogenize(x, *args, **kwargs):
     """
     Utility function to homogenize variable x, calling:
@@ -79,6 +142,86 @@ def homogenize(x, *args, **kwargs):
 
 #-----------------------------------------------------------------------------#
 
+# library-wide floating-point data-type of pricing parameters
+# (None: parameters are used as given, that is in double precision)
+_float_dtype = None
+
+def resolve_float_dtype(dtype):
+    """
+    Utility function to validate a floating-point data-type: 'float32'
+    (np.float32) or 'float64' (np.float64) are returned as np.dtype,
+    None is returned as it is. Any other data-type raises an error.
+    """
+
+    if dtype is None:
+        return None
+
+    dtype = np.dtype(dtype)
+    if dtype not in [np.dtype(np.float32), np.dtype(np.float64)]:
+        raise ValueError("Floating-point data-type must be either 'float32' or 'float64'. Given: {}".format(dtype))
+
+    return dtype
+
+def set_float_dtype(dtype):
+    """
+    Sets the library-wide floating-point data-type of pricing parameters.
+
+    With dtype='float32', parameters coordinated by .process_pricing_parameters()
+    methods (and therefore pricing kernels and their outputs) are in single
+    precision, halving memory and bandwidth on large grids of scenarios.
+    With dtype=None (default) or 'float64' double precision is used.
+
+    The policy can be overridden in a single call using the "dtype" keyboard
+    parameter of pricing methods (e.g. option.price(S=S_vector, dtype='float32')).
+
+    Accuracy of single precision w.r.t. double precision (see example_options_float32.py,
+    on a grid of 10^6 underlying values and valuation dates): errors of prices and
+    greeks, relative to the largest value of each metrics on the grid, are of order
+    1e-6 - 1e-5 (float32 resolution is ~6e-8). Relative errors of single values can
+    be much larger where values are close to zero (e.g. deep out-of-the-money options).
+    Double precision should be preferred when differences of close values are
+    taken (e.g. finite-differences greeks or implied volatilities).
+    """
+
+    global _float_dtype
+    _float_dtype = resolve_float_dtype(dtype)
+
+def get_float_dtype():
+    """
+    Returns the library-wide floating-point data-type of pricing parameters
+    (None if parameters are used as given).
+    """
+    return _float_dtype
+
+def float_dtype(dtype=None):
+    """
+    Returns the floating-point data-type of a single call: dtype, if not None,
+    the library-wide one (see set_float_dtype()) otherwise.
+    """
+    return get_float_dtype() if dtype is None else resolve_float_dtype(dtype)
+
+def cast_to_float(x, dtype):
+    """
+    Utility function to cast the scalar/np.ndarray x to the floating-point
+    data-type dtype. If dtype is None, x is returned as it is.
+    """
+
+    if dtype is None:
+        return x
+    elif isinstance(x, np.ndarray):
+        return x.astype(dtype, copy=False)
+    else:
+        return dtype.type(x)
+
+def norm_pdf(x):
+    """
+    Standard normal probability density function. Unlike scipy.stats.norm.pdf,
+    the floating-point data-type of x is preserved.
+    """
+    return np.exp(-0.5 * x ** 2) / np.sqrt(2.0 * np.pi)
+
+#-----------------------------------------------------------------------------#
+
 def coordinate(x, y, *args, x_name="x", y_name="y", others_scalar={}, others_vector={}, np_output=True, **kwargs):
     """
     Utility function to coordinate two main parameters x and y, each other and
@@ -157,14 +300,16 @@ def coordinate_y_with_x(x, y, np_output):
     flag np_output:
         
         - If np_output is True, x is expected to be a np.ndarray and y will be returned 
-          as a np.ndarray x-shaped filled with y value(s).
+          as a np.ndarray x-shaped filled with y value(s). This is a read-only view 
+          of y broadcast to the shape of x (see np.broadcast_to documentation): 
+          no memory is allocated for a scalar y.
           
         - If np_output is False, x is expected to be a pd.DataFrame and y will be returned 
           as a pd.DataFrame identical to x filled with y value(s).
     """    
     if np_output:
         if isinstance(x, np.ndarray):
-            y_coord_x = y + np.zeros_like(x)
+            y_coord_x = np.broadcast_to(np.asarray(y, dtype=np.result_type(y, x)), x.shape)
         else:
             raise TypeError(r"Inconsistent type of \n x={} \n parameter in input: \n type(x)={} (np.ndarray expected)".format(x, type(x)))
     else:
@@ -198,7 +343,7 @@ def coordinate_x_and_y_as_ndarray(x, y):
     as NumPy Arrays. The following cases are considered:
         
         1) if x is array of lenght n; y is array of length m, then:
-            x, y ---> (m, n) shaped arrays creating a mesh-grid
+            x, y ---> (m, n) shaped arrays, as a mesh-grid
             (see np.meshgrid documentation)
             
         2) if x is array of length n; y is scalar, then:
@@ -209,13 +354,21 @@ def coordinate_x_and_y_as_ndarray(x, y):
         
         4) if both x and y are scalar, then:
             y, x ---> array of length 1 made of their own values
+    
+    In cases 1-3, coordinated arrays are read-only views of x and y broadcast 
+    to the common shape (see np.broadcast_to documentation): no memory is 
+    allocated for repeated values, only the outputs of computations are.
     """
         
     if is_iterable(x) and is_iterable(y):
         # case 1
         
-        # creating a mesh-grid combining x and y
-        x, y = np.meshgrid(x, y)
+        # mesh-grid shape
+        shape = (len(y), len(x))
+        
+        # x spans the columns, y spans the rows
+        x = np.broadcast_to(x, shape)
+        y = np.broadcast_to(np.asarray(y)[:, np.newaxis], shape)
         
     elif is_iterable(x) and (not is_iterable(y)):
         # case 2
@@ -224,7 +377,7 @@ def coordinate_x_and_y_as_ndarray(x, y):
         n = len(x)
         
         # make y look like x
-        y = np.repeat(y, repeats=n)
+        y = np.broadcast_to(y, (n,))
         
     elif (not is_iterable(x)) and is_iterable(y):
         # case 3
@@ -233,7 +386,7 @@ def coordinate_x_and_y_as_ndarray(x, y):
         m = len(y)
 
         # make x look like y
-        x = np.repeat(x, repeats=m)
+        x = np.broadcast_to(x, (m,))
         
     else:
         # case 4 
@@ -344,6 +497,96 @@ def coordinate_x_and_y_as_df(x, y, col_labels, ind_labels, **kwargs):
     
 #-----------------------------------------------------------------------------#
 
+def coordinate_labels(col_labels, ind_labels, x_name="x", y_name="y", **kwargs):
+    """
+    Utility function returning the index and the columns labelling the pd.DataFrames
+    of coordinate_x_and_y_as_df() function, without building any pd.DataFrame.
+    Scalar/Iterables col_labels and ind_labels are used to set the columns and indexes,
+    x_name and y_name the names of the column and index axis, respectively.
+
+    Parameters coordinated as np.ndarrays can then be reshaped to
+    (len(index), len(columns)) and labelled at the end of computations
+    (see attach_labels() function).
+    """
+
+    # set labels for columns and indexes
+    cols = col_labels if is_iterable_not_string(col_labels) else np.array([col_labels])
+    inds = ind_labels if is_iterable_not_string(ind_labels) else np.array([ind_labels])
+
+    return pd.Index(inds, name=y_name), pd.Index(cols, name=x_name)
+
+#-----------------------------------------------------------------------------#
+
+def attach_labels(x, index=None, columns=None):
+    """
+    Utility function labelling the 2-dim np.ndarray x (or each np.ndarray of
+    a dictionary x) as a pd.DataFrame with the given index and columns,
+    without copying its data. If index and columns are None, x is returned as is.
+    """
+
+    if index is None and columns is None:
+        return x
+
+    if isinstance(x, dict):
+        return {k: attach_labels(x[k], index=index, columns=columns) for k in x}
+
+    return pd.DataFrame(data=x, index=index, columns=columns, copy=False)
+
+#-----------------------------------------------------------------------------#
+
+def pricing_legs(FinancialObject, **kwargs):
+    """
+    Utility function returning the legs valued by pricers (lattice, PDE, Monte Carlo,
+    numeric and automatic differentiation) of a FinancialObject: the single instrument
+    itself, with position 1.0, or the netted constituents of a Portfolio.
+
+    Pricing parameters of each leg are processed by its .process_pricing_parameters()
+    method, with the keyboard parameters kwargs, and broadcast together. Their
+    floating-point data-type is the one of processed parameters (that is, the
+    library-wide one, see set_float_dtype(), or the "dtype" keyboard parameter),
+    promoted to double precision only if they are not floating-point.
+
+    Returns a tuple (legs, index, columns), where legs is a list of dictionaries with keys:
+
+        - 'position': the position of the leg;
+        - 'instrument': the instrument of the leg;
+        - 'shape': the shape of its pricing parameters;
+        - 'params': a dictionary of pricing parameters 'S', 'K', 'tau', 'sigma' and 'r',
+          as np.ndarrays of the same shape;
+
+    and index and columns are the output labels of the last leg (None, if np_output 
+    is True), to be attached by attach_labels() function.
+    """
+
+    # (position, instrument) pairs: a single instrument or the portfolio constituents
+    if hasattr(FinancialObject, "get_netted_composition"):
+        FinancialObject.check_parameters(**kwargs)
+        instruments = [(inst["position"], inst["instrument"]) for inst in FinancialObject.get_netted_composition()]
+    else:
+        instruments = [(1.0, FinancialObject)]
+
+    legs = []
+    index, columns = None, None
+
+    for position, instrument in instruments:
+
+        # process input parameters
+        param_dict = instrument.process_pricing_parameters(**kwargs)
+        index, columns = param_dict["index"], param_dict["columns"]
+
+        params = [param_dict[p] for p in ["S", "K", "tau", "sigma", "r"]]
+        dtype = np.result_type(*params, 1.0)
+        params = np.broadcast_arrays(*[np.asarray(p, dtype=dtype) for p in params])
+
+        legs.append({"position": position,
+                     "instrument": instrument,
+                     "shape": params[0].shape,
+                     "params": dict(zip(["S", "K", "tau", "sigma", "r"], params))})
+
+    return legs, index, columns
+
+#-----------------------------------------------------------------------------#
+
 def test_dim(iterable_obj, dim=1):
     """
     Utility function to test whether an iterable_obj is of dimension dim,
@@ -365,6 +608,11 @@ def test_same_type(iterable_obj):
     Utility function to test whether all elements of an iterable_obj are of the 
     same type. If not it raises a TypeError.
     """
+    # np.ndarray, pd.Index and pd.Series of native data-type are homogeneous
+    # by construction: no need to check their elements
+    if has_native_dtype(iterable_obj):
+        return True
+    
     # by set definition, the set of types of the elements in iterable_obj
     # includes all and only the different types of the elements in iterable_obj.
     # If its length is 1, then all the elements of iterable_obj are of the 
@@ -392,15 +640,24 @@ def test_valid_format(date_string, date_format="%d-%m-%Y"):
     If not, it raises a ValueError.
     
     If date_string in input is neither an Iterable, nor a String, it raises a TypeError.
+    
+    Strings are parsed once (see parse_date_string() function in dates.py). 
+    Iterables of datetime64 data-type are valid by construction, otherwise 
+    each distinct element is tested once.
     """
     
     try:    
         if isinstance(date_string, str):
             # 1-dim case
-            dt.datetime.strptime(date_string, date_format)
+            parse_date_string(date_string, date_format)
         elif is_iterable_not_string(date_string):
             # Multi-dim case
-            pd.to_datetime(date_string, format=date_format, errors='raise')
+            if not is_datetime64_array(date_string):
+                for d in np.unique(np.asarray(date_string)):
+                    if isinstance(d, str):
+                        parse_date_string(d, date_format)
+                    elif not isinstance(d, (dt.datetime, np.datetime64)):
+                        raise ValueError()
         else:
             # neither an Iterable, nor a String: raise TypeError
             raise TypeError("Type {} of date_string {} not recognized".format(type(date_string), date_string))    
@@ -425,6 +682,8 @@ def datetime_obj_to_date_string(date):
         
             from pd.DatetimeIndex --> to pd.Index of 'dd-mm-YYYY' String
             from Iterable --> to List of 'dd-mm-YYYY' String
+            
+    np.datetime64 objects and arrays are converted as pd.Timestamp and pd.DatetimeIndex, respectively.
     """
     
     if isinstance(date, dt.datetime) or isinstance(date, pd.DatetimeIndex):
@@ -432,6 +691,10 @@ def datetime_obj_to_date_string(date):
         # datetime objects of datetime (1-dim) and DatetimeIndex (Multi-dim) objects of Pandas 
         # so there is no need to differentiate between the two case when calling it
         return date.strftime("%d-%m-%Y")
+    elif isinstance(date, np.datetime64):
+        return pd.Timestamp(date).strftime("%d-%m-%Y")
+    elif is_datetime64_array(date):
+        return list(pd.DatetimeIndex(date).strftime("%d-%m-%Y"))
     elif is_iterable_not_string(date):
         # all other kind of iterables (Lists, np.ndarray, etc..) are mapped to Lists
         return [d.strftime("%d-%m-%Y") for d in date]
@@ -450,15 +713,17 @@ def date_string_to_datetime_obj(date_string):
         Multi-dim case:
             from (non-String) Iterable objects of elements conform to 'dd-mm-YYYY' date format --> to pd.DatetimeIndex
             
-    The 'dd-mm-YYYY' date format is controlled throught test_valid_format() utility function.
+    Each String is parsed once, controlling the 'dd-mm-YYYY' date format: parsed 
+    Strings are cached (see parse_date_string() function in dates.py) and Iterables 
+    are converted through their np.datetime64 representation (see to_datetime64()).
     """
     
-    if isinstance(date_string, str) and test_valid_format(date_string):
+    if isinstance(date_string, str):
         # 1-dim case
-        return dt.datetime.strptime(date_string, "%d-%m-%Y")
-    elif is_iterable_not_string(date_string) and test_valid_format(date_string):
+        return parse_date_string(date_string)
+    elif is_iterable_not_string(date_string):
         # Multi-dim case
-        return pd.DatetimeIndex(date_string)     
+        return pd.DatetimeIndex(to_datetime64(date_string))
     else: 
         return date_string
                                                          
@@ -512,14 +777,17 @@ def is_date(x):
     """
     Utility function to check if input is/contains date-like data.
     The error due to invalid (non 'dd-mm-YYYY') date Strings is controlled thanks to test_valid_format() function.
+    np.datetime64 objects and arrays are date-like too.
     """
     
-    if is_iterable_not_string(x) and test_same_type(x):
+    if is_datetime64_array(x):
+        return True
+    elif is_iterable_not_string(x) and test_same_type(x):
         # since all elements are of the same type, 
         # it's enought to check the first element
-        return isinstance(x[0], dt.datetime) or (isinstance(x[0], str) and test_valid_format(x[0]))
+        return isinstance(x[0], (dt.datetime, np.datetime64)) or (isinstance(x[0], str) and test_valid_format(x[0]))
     else:
-        return isinstance(x, dt.datetime) or (isinstance(x, str) and test_valid_format(x))
+        return isinstance(x, (dt.datetime, np.datetime64)) or (isinstance(x, str) and test_valid_format(x))
 
 #-----------------------------------------------------------------------------#
 
@@ -644,3 +912,36 @@ def plot(x, f, **kwargs):
     # show the plot
     fig.tight_layout()
     plt.show()
+
+#-----------------------------------------------------------------------------#
+
+def spawn_streams(seed, n_streams):
+    """
+    Returns a list of n_streams seeds of statistically independent random streams.
+
+    If available (NumPy >= 1.17), they are np.random.SeedSequence objects spawned
+    from a root SeedSequence(seed). Otherwise, stream i is seeded as a
+    np.random.RandomState by the pair [seed, i].
+    """
+
+    # unpredictable root entropy, if no seed is given
+    if seed is None:
+        seed = np.random.randint(2**31)
+
+    if hasattr(np.random, "SeedSequence"):
+        return np.random.SeedSequence(seed).spawn(n_streams)
+    else:
+        return [np.array([seed, i], dtype=np.uint32) for i in range(n_streams)]
+
+#-----------------------------------------------------------------------------#
+
+def random_generator(stream):
+    """
+    Returns a random number generator from a stream seed, as returned by
+    spawn_streams() function.
+    """
+
+    if hasattr(np.random, "SeedSequence"):
+        return np.random.default_rng(stream)
+    else:
+        return np.random.RandomState(stream)